@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import heapq
 import threading
 import time
 from functools import lru_cache
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Tuple
 
 from core.config import get_settings
 
@@ -15,6 +16,9 @@ class TTLCache:
         self.default_ttl = max(default_ttl, 0)
         self.max_size = max(max_size, 0)
         self._data: Dict[str, Tuple[Any, float]] = {}
+        # Min-heap of (expires_at, key). Entries go stale when a key is reset or
+        # deleted; they are skipped lazily when popped.
+        self._heap: List[Tuple[float, str]] = []
         self._lock = threading.Lock()
 
     def _expired(self, expires_at: float) -> bool:
@@ -40,8 +44,11 @@ class TTLCache:
         expires_at = time.time() + ttl_value
         with self._lock:
             self._data[key] = (value, expires_at)
+            heapq.heappush(self._heap, (expires_at, key))
             if self.max_size > 0 and len(self._data) > self.max_size:
                 self._evict_oldest()
+            elif len(self._heap) > 2 * len(self._data) + 64:
+                self._rebuild_heap()
 
     def delete(self, key: str) -> None:
         with self._lock:
@@ -50,24 +57,42 @@ class TTLCache:
     def clear(self) -> None:
         with self._lock:
             self._data.clear()
+            self._heap.clear()
 
     def cleanup(self) -> None:
         """Eagerly remove expired entries to keep the cache small."""
 
         now = time.time()
         with self._lock:
-            expired_keys = [k for k, (_, expiry) in self._data.items() if expiry <= now]
-            for key in expired_keys:
-                self._data.pop(key, None)
+            self._sync_heap()
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                _, key = heapq.heappop(heap)
+                entry = self._data.get(key)
+                if entry is not None and entry[1] <= now:
+                    self._data.pop(key, None)
 
     def _evict_oldest(self) -> None:
         """Evict the oldest entries when max_size is exceeded. Must be called with lock held."""
         if self.max_size <= 0 or len(self._data) <= self.max_size:
             return
-        sorted_keys = sorted(self._data, key=lambda k: self._data[k][1])
-        evict_count = len(self._data) - self.max_size
-        for key in sorted_keys[:evict_count]:
-            self._data.pop(key, None)
+        self._sync_heap()
+        heap = self._heap
+        while heap and len(self._data) > self.max_size:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._data.get(key)
+            if entry is not None and entry[1] == expires_at:
+                self._data.pop(key, None)
+
+    def _sync_heap(self) -> None:
+        """Rebuild the heap if entries were added to ``_data`` without it. Must be called with lock held."""
+        if len(self._heap) < len(self._data):
+            self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        """Drop stale heap entries. Must be called with lock held."""
+        self._heap = [(expiry, key) for key, (_, expiry) in self._data.items()]
+        heapq.heapify(self._heap)
 
     def __len__(self) -> int:
         with self._lock:
@@ -161,6 +161,8 @@ class Settings:
     max_universe_size: int = field(default_factory=lambda: _get_int("MAX_UNIVERSE_SIZE", 50))
     universe_candidate_limit: int = field(default_factory=lambda: _get_int("UNIVERSE_CANDIDATE_LIMIT", 0))
     universe_liquidity_top_n: int = field(default_factory=lambda: _get_int("UNIVERSE_LIQUIDITY_TOP_N", 300))
+    # Threads for universe daily-bar loads; market-cap lookups always run serially.
+    universe_filter_workers: int = field(default_factory=lambda: _get_int("UNIVERSE_FILTER_WORKERS", 16))
     cache_ttl: int = field(default_factory=lambda: _get_int("CACHE_TTL", 900))
     intraday_stale_seconds: int = field(default_factory=lambda: _get_int("INTRADAY_STALE_SECONDS", 900))
     daily_stale_seconds: int = field(default_factory=lambda: _get_int("DAILY_STALE_SECONDS", 432000))
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Sized for the universe scan's worker threads hitting one provider host at a time.
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+
+
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """Process-wide keep-alive session shared by the market data providers.
+
+    Only failed connects are retried; read timeouts and HTTP status codes are
+    left to the providers' own rate-limit handling.
+    """
+
+    session = requests.Session()
+    retry = Retry(total=2, connect=2, read=0, status=0, other=0, backoff_factor=0.2)
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -5,15 +5,17 @@ from typing import Dict, List, Optional
 from collections import defaultdict
 import time
 
-import requests
-
 from core.config import get_settings
+from core.http_session import get_session
 from core.logger import get_logger
 
 logger = get_logger(__name__)
 LOG_SAMPLE_LIMIT = 5
 _warn_counts: dict[str, int] = defaultdict(int)
 RATE_LIMIT_COOLDOWN = 60
+MULTI_BARS_PAGE_LIMIT = 10000
+# Symbols per multi-symbol bars request, keeping the query string short.
+MULTI_BARS_SYMBOL_CHUNK = 100
 
 
 def _warn_sample(reason: str, message: str) -> None:
@@ -75,7 +77,7 @@ class AlpacaProvider:
         url = f"{self.base_url}/stocks/{symbol.upper()}/trades/latest"
         params = {"feed": self.data_feed} if self.data_feed else None
         try:
-            response = requests.get(url, headers=self._headers(), params=params, timeout=10)
+            response = get_session().get(url, headers=self._headers(), params=params, timeout=10)
             if response.status_code == 429:
                 self._set_rate_limit(RATE_LIMIT_COOLDOWN, "http 429")
                 return None
@@ -89,6 +91,37 @@ class AlpacaProvider:
             logger.warning("Alpaca price fetch failed for %s: %s", symbol, exc)
             return None
 
+    def get_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Latest trade prices for several symbols in one request (symbol -> price)."""
+
+        if not self.api_key or not self.api_secret or not symbols:
+            return {}
+        if self._rate_limited():
+            return {}
+        url = f"{self.base_url}/stocks/trades/latest"
+        params = {"symbols": ",".join(dict.fromkeys(sym.upper() for sym in symbols))}
+        if self.data_feed:
+            params["feed"] = self.data_feed
+        try:
+            response = get_session().get(url, headers=self._headers(), params=params, timeout=10)
+            if response.status_code == 429:
+                self._set_rate_limit(RATE_LIMIT_COOLDOWN, "http 429")
+                return {}
+            response.raise_for_status()
+            trades = response.json().get("trades") or {}
+        except Exception as exc:  # pragma: no cover - network guard
+            logger.warning("Alpaca batch price fetch failed: %s", exc)
+            return {}
+        prices: Dict[str, float] = {}
+        for sym, trade in trades.items():
+            try:
+                price = float(trade.get("p", 0.0))
+            except (AttributeError, TypeError, ValueError):
+                continue
+            if price > 0:
+                prices[sym.upper()] = price
+        return prices
+
     def get_aggregates(self, symbol: str, timespan: str = "1day", limit: int = 60) -> List[Dict[str, float]]:
         if not self.api_key or not self.api_secret:
             return []
@@ -100,7 +133,7 @@ class AlpacaProvider:
         if self.data_feed:
             params["feed"] = self.data_feed
         try:
-            response = requests.get(url, headers=self._headers(), params=params, timeout=10)
+            response = get_session().get(url, headers=self._headers(), params=params, timeout=10)
             if response.status_code == 429:
                 self._set_rate_limit(RATE_LIMIT_COOLDOWN, "http 429")
                 return []
@@ -129,3 +162,70 @@ class AlpacaProvider:
         """Convenience wrapper for 1-minute bars."""
 
         return self.get_aggregates(symbol, timespan="1min", limit=limit)
+
+    def get_intraday_1m_multi(self, symbols: List[str], limit: int = 60) -> Dict[str, List[Dict[str, float]]]:
+        """1-minute bars for several symbols via the multi-symbol bars endpoint (symbol -> bars)."""
+
+        return self._get_bars_multi(symbols, "1Min", limit)
+
+    def get_daily_bars_multi(self, symbols: List[str], limit: int = 60) -> Dict[str, List[Dict[str, float]]]:
+        """Daily bars for several symbols via the multi-symbol bars endpoint (symbol -> bars)."""
+
+        return self._get_bars_multi(symbols, "1Day", limit)
+
+    def _get_bars_multi(self, symbols: List[str], timeframe: str, limit: int) -> Dict[str, List[Dict[str, float]]]:
+        """Symbols are requested in chunks; a failed chunk stops the run but keeps earlier chunks."""
+
+        if not self.api_key or not self.api_secret or not symbols:
+            return {}
+        if self._rate_limited():
+            return {}
+        wanted = list(dict.fromkeys(sym.upper() for sym in symbols))
+        results: Dict[str, List[Dict[str, float]]] = {}
+        for start in range(0, len(wanted), MULTI_BARS_SYMBOL_CHUNK):
+            chunk = self._fetch_bars_chunk(wanted[start : start + MULTI_BARS_SYMBOL_CHUNK], timeframe, limit)
+            if chunk is None:
+                break
+            results.update(chunk)
+        return results
+
+    def _fetch_bars_chunk(
+        self, symbols: List[str], timeframe: str, limit: int
+    ) -> Optional[Dict[str, List[Dict[str, float]]]]:
+        """One chunk of the multi-symbol bars endpoint, or None on failure.
+
+        The endpoint's limit counts bars across all symbols, so pages are followed
+        and each symbol keeps at most ``limit`` bars, as the per-symbol call would.
+        """
+
+        url = f"{self.base_url}/stocks/bars"
+        params = {
+            "symbols": ",".join(symbols),
+            "timeframe": timeframe,
+            "limit": min(limit * len(symbols), MULTI_BARS_PAGE_LIMIT),
+            "adjustment": "split",
+        }
+        if self.data_feed:
+            params["feed"] = self.data_feed
+        results: Dict[str, List[Dict[str, float]]] = defaultdict(list)
+        try:
+            while True:
+                response = get_session().get(url, headers=self._headers(), params=params, timeout=10)
+                if response.status_code == 429:
+                    self._set_rate_limit(RATE_LIMIT_COOLDOWN, "http 429")
+                    return None
+                response.raise_for_status()
+                payload = response.json()
+                for sym, bars in (payload.get("bars") or {}).items():
+                    bucket = results[sym.upper()]
+                    for item in bars or []:
+                        if len(bucket) < limit:
+                            bucket.append(self._normalize_bar(item))
+                token = payload.get("next_page_token")
+                if not token:
+                    break
+                params["page_token"] = token
+        except Exception as exc:  # pragma: no cover - network guard
+            _warn_sample("multi_bars_failed", f"Alpaca multi-symbol bars failed: {exc}")
+            return None
+        return dict(results)
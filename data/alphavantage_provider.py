@@ -6,9 +6,8 @@ from collections import defaultdict
 import logging
 import time
 
-import requests
-
 from core.config import get_settings
+from core.http_session import get_session
 from core.logger import get_logger
 from core.cache import get_cache
 
@@ -151,7 +150,7 @@ class AlphaVantageProvider:
             return cached if cached is not None else None
         params = {"function": "GLOBAL_QUOTE", "symbol": symbol.upper(), "apikey": self.api_key}
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
+            response = get_session().get(self.BASE_URL, params=params, timeout=10)
             if response.status_code == 429:
                 self._set_rate_limit(RATE_LIMIT_COOLDOWN, "http 429")
                 return cached if cached is not None else None
@@ -182,7 +181,7 @@ class AlphaVantageProvider:
             return cached
         params = {"function": "TIME_SERIES_DAILY_ADJUSTED", "symbol": symbol.upper(), "apikey": self.api_key}
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
+            response = get_session().get(self.BASE_URL, params=params, timeout=10)
             if response.status_code == 429:
                 self._set_rate_limit(RATE_LIMIT_COOLDOWN, "http 429")
                 return cached
@@ -237,7 +236,7 @@ class AlphaVantageProvider:
             "outputsize": "compact",
         }
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
+            response = get_session().get(self.BASE_URL, params=params, timeout=10)
             if response.status_code == 429:
                 self._set_rate_limit(RATE_LIMIT_COOLDOWN, "http 429")
                 return cached
@@ -287,7 +286,7 @@ class AlphaVantageProvider:
             return cached if cached is not None else 0.0
         params = {"function": "OVERVIEW", "symbol": symbol.upper(), "apikey": self.api_key}
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
+            response = get_session().get(self.BASE_URL, params=params, timeout=10)
             if response.status_code == 429:
                 self._set_rate_limit(RATE_LIMIT_COOLDOWN, "http 429")
                 return cached if cached is not None else 0.0
@@ -321,7 +320,7 @@ class AlphaVantageProvider:
         cached = self.cache.get(cache_key) or {}
         params = {"function": "BATCH_STOCK_QUOTES", "symbols": joined, "apikey": self.api_key}
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
+            response = get_session().get(self.BASE_URL, params=params, timeout=10)
             if response.status_code == 429:
                 self._set_rate_limit(RATE_LIMIT_COOLDOWN, "http 429")
                 return cached
@@ -6,10 +6,9 @@ import logging
 import time
 from typing import Dict, List, Optional
 
-import requests
-
 from core.cache import get_cache
 from core.config import get_settings
+from core.http_session import get_session
 from core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -179,7 +178,7 @@ class MarketstackProvider:
             return cached
         params = {"access_key": self.api_key, "symbols": symbol.upper(), "limit": limit, "sort": "DESC"}
         try:
-            response = requests.get(f"{self.BASE_URL}/eod", params=params, timeout=10)
+            response = get_session().get(f"{self.BASE_URL}/eod", params=params, timeout=10)
             if response.status_code == 429:
                 self._set_rate_limit(RATE_LIMIT_COOLDOWN, "http 429")
                 return cached
@@ -1,15 +1,27 @@
 import json
 import logging
+import os
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict, field, fields
 from pathlib import Path
 from typing import Dict, Iterable, Optional
 
 from core.config import get_settings
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - installs predating the orjson requirement
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 STATE_PATH = get_settings().portfolio_state_path
 
+# While writes are deferred, load_state/save_state work on this in-memory copy.
+_deferred_state: Optional["PortfolioState"] = None
+_deferring = False
+_dirty = False
+
 
 @dataclass
 class PortfolioState:
@@ -29,12 +41,38 @@ class PortfolioState:
         return asdict(self)
 
 
+def _loads(raw: bytes):
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # Older files may hold NaN/Infinity tokens that only stdlib json accepts.
+            pass
+    return json.loads(raw)
+
+
+def _dumps(payload: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, indent=2).encode()
+
+
 def load_state() -> PortfolioState:
-    if not STATE_PATH.exists():
+    global _deferred_state
+    if _deferring:
+        if _deferred_state is None:
+            _deferred_state = _read_state()
+        return _deferred_state
+    return _read_state()
+
+
+def _read_state() -> PortfolioState:
+    try:
+        raw = STATE_PATH.read_bytes()
+    except FileNotFoundError:
         return PortfolioState()
     try:
-        with open(STATE_PATH, "r") as f:
-            data = json.load(f)
+        data = _loads(raw)
         if not isinstance(data, dict):
             return PortfolioState()
         allowed = {item.name for item in fields(PortfolioState)}
@@ -49,9 +87,53 @@ def load_state() -> PortfolioState:
 
 
 def save_state(state: PortfolioState):
-    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(STATE_PATH, "w") as f:
-        json.dump(state.to_dict(), f, indent=2)
+    global _deferred_state, _dirty
+    if _deferring:
+        _deferred_state = state
+        _dirty = True
+        return
+    _write_state(state)
+
+
+def _write_state(state: PortfolioState) -> None:
+    tmp_path = STATE_PATH.with_name(STATE_PATH.name + ".tmp")
+    payload = _dumps(state.to_dict())
+    try:
+        tmp_path.write_bytes(payload)
+    except FileNotFoundError:
+        # The directory normally exists from settings load; create it only when missing.
+        STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(payload)
+    os.replace(tmp_path, STATE_PATH)
+
+
+def flush_state() -> None:
+    """Write the deferred state if any save_state call changed it."""
+
+    global _dirty
+    if _dirty and _deferred_state is not None:
+        _write_state(_deferred_state)
+    _dirty = False
+
+
+@contextmanager
+def deferred_state_writes():
+    """Coalesce every save_state call inside the block into one write on exit."""
+
+    global _deferring, _deferred_state, _dirty
+    if _deferring:
+        yield
+        return
+    _deferring = True
+    try:
+        yield
+    finally:
+        try:
+            flush_state()
+        finally:
+            _deferring = False
+            _deferred_state = None
+            _dirty = False
 
 
 def get_entry_timestamp(symbol: str) -> Optional[float]:
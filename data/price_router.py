@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import math
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Sequence
 
+import numpy as np
 import pandas as pd
 
 from core.config import get_settings
@@ -17,11 +19,22 @@ from core.cache import get_cache
 
 logger = get_logger(__name__)
 settings = get_settings()
+# Concurrent per-symbol daily fetches for symbols a batch endpoint did not return.
+DAILY_FALLBACK_WORKERS = 8
+# Columns produced by PriceRouter.bars_to_columns, in array order.
+BAR_FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
 cache = get_cache()
 _providers_cache: Sequence[object] | None = None
 _alpaca_daily_fallback_warned = False
 
 
+def _as_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
 def _has_external_daily_provider() -> bool:
     return bool(settings.twelvedata_api_key or settings.alphavantage_api_key or settings.marketstack_api_key)
 
@@ -198,6 +211,44 @@ class PriceRouter:
                 last_error = exc
         raise RuntimeError(f"All providers failed to return price for {symbol}") from last_error
 
+    def get_prices(self, symbols: Sequence[str]) -> Dict[str, float]:
+        """
+        Return latest prices for ``symbols`` in provider priority order.
+        Providers with a multi-symbol endpoint are queried once for all outstanding symbols;
+        others fall back to per-symbol lookups. Symbols no provider could price are omitted.
+        """
+
+        prices: Dict[str, float] = {}
+        remaining = list(dict.fromkeys(sym for sym in symbols if sym))
+        for provider in self.providers:
+            if not remaining:
+                break
+            provider_name = provider.__class__.__name__
+            batch = getattr(provider, "get_prices", None) or getattr(provider, "get_batch_quotes", None)
+            if callable(batch):
+                try:
+                    fetched = batch(remaining) or {}
+                except Exception as exc:  # pragma: no cover - network guard
+                    logger.warning("%s batch price lookup failed: %s", provider_name, exc)
+                    continue
+                for symbol in remaining:
+                    price = fetched.get(symbol.upper())
+                    if price is not None:
+                        prices[symbol] = price
+                        self._set_last_provider(symbol, "price", provider_name)
+            else:
+                for symbol in remaining:
+                    try:
+                        price = provider.get_price(symbol)  # type: ignore[attr-defined]
+                    except Exception as exc:  # pragma: no cover - network guard
+                        logger.warning("%s price lookup failed for %s: %s", provider_name, symbol, exc)
+                        continue
+                    if price is not None:
+                        prices[symbol] = price
+                        self._set_last_provider(symbol, "price", provider_name)
+            remaining = [symbol for symbol in remaining if symbol not in prices]
+        return prices
+
     def get_aggregates(self, symbol: str, window: int = 60, *, allow_stale: bool = False) -> List[Dict[str, float]]:
         """
         Return 5-minute bars covering the last ``window`` minutes.
@@ -275,6 +326,44 @@ class PriceRouter:
             return records
         raise RuntimeError(f"All providers failed to return aggregates for {symbol}") from last_error
 
+    def get_aggregates_batch(self, symbols: Sequence[str], window: int = 60) -> Dict[str, List[Dict[str, float]]]:
+        """
+        Fresh 5-minute bars for several symbols, from cache or one multi-symbol Alpaca request.
+        Symbols without fresh bars are omitted; callers fall back to get_aggregates for those.
+        """
+
+        bars_needed = max(int(math.ceil(window / 5)), 1)
+        results: Dict[str, List[Dict[str, float]]] = {}
+        remaining: list[str] = []
+        for sym in dict.fromkeys(sym for sym in symbols if sym):
+            cached = cache.get(f"intraday_bars:{sym.upper()}:{bars_needed}")
+            cached_age = self._bars_age_seconds(cached) if cached else None
+            if cached and cached_age is not None and cached_age <= settings.intraday_stale_seconds:
+                self._set_last_provider(sym, "intraday", "cache")
+                results[sym] = cached
+            else:
+                remaining.append(sym)
+        provider = next((p for p in self.providers if isinstance(p, AlpacaProvider)), None)
+        if not remaining or provider is None or self._provider_rate_limited(provider):
+            return results
+        try:
+            batch = provider.get_intraday_1m_multi(remaining, limit=window)
+        except Exception as exc:  # pragma: no cover - network guard
+            logger.warning("AlpacaProvider batch aggregates failed: %s", exc)
+            return results
+        for sym in remaining:
+            frame = resample_to_5m(batch.get(sym.upper()) or [])
+            if frame.empty:
+                continue
+            age = self._bars_age_seconds(frame)
+            if age is not None and age > settings.intraday_stale_seconds:
+                continue
+            records = frame.to_dict("records")
+            cache.set(f"intraday_bars:{sym.upper()}:{bars_needed}", records, settings.cache_ttl)
+            self._set_last_provider(sym, "intraday", "AlpacaProvider")
+            results[sym] = records
+        return results
+
     def get_daily_aggregates(self, symbol: str, limit: int = 60) -> List[Dict[str, float]]:
         """
         Return up to ``limit`` daily bars.
@@ -388,8 +477,12 @@ class PriceRouter:
                 skip_batch = True
         if remaining and not skip_batch:
             for provider in self.providers:
+                if not remaining:
+                    break
                 if hasattr(provider, "get_daily_bars_multi"):
                     provider_name = provider.__class__.__name__
+                    if isinstance(provider, AlpacaProvider) and not allow_alpaca_daily:
+                        continue
                     if self._provider_rate_limited(provider):
                         continue
                     try:
@@ -410,14 +503,41 @@ class PriceRouter:
                             self._set_last_provider(sym, "daily", provider_name)
                     except Exception as exc:  # pragma: no cover - network guard
                         logger.warning("%s batch daily bars failed: %s", provider_name, exc)
+                    # Later providers only fetch what earlier batches did not return.
+                    remaining = [sym for sym in remaining if sym not in results]
                 # no else; fall back to per-symbol below
 
-        for sym in symbols:
-            if sym in results:
-                continue
-            results[sym] = self.get_daily_aggregates(sym, limit=limit)
+        # Each fallback is an independent blocking HTTP call, so they run overlapped.
+        missing = [sym for sym in dict.fromkeys(symbols) if sym not in results]
+        if missing:
+            logger.info("Daily bars: %s symbols not returned by batch endpoints; fetching individually", len(missing))
+            workers = min(DAILY_FALLBACK_WORKERS, len(missing))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="daily-bars") as executor:
+                fetched = executor.map(lambda sym: self.get_daily_aggregates(sym, limit=limit), missing)
+                results.update(zip(missing, fetched))
         return results
 
+    def get_daily_bars_batch_columns(self, symbols: Sequence[str], limit: int = 60) -> Dict[str, Dict[str, np.ndarray]]:
+        """``get_daily_bars_batch`` with each symbol's bars as chronological column arrays."""
+
+        return {sym: self.bars_to_columns(bars) for sym, bars in self.get_daily_bars_batch(symbols, limit=limit).items()}
+
+    @staticmethod
+    def bars_to_columns(bars: List[Dict[str, float]] | None) -> Dict[str, np.ndarray]:
+        """float64 arrays keyed by BAR_FIELDS, sorted by timestamp; missing or bad values become NaN."""
+
+        rows = [tuple(row.get(field) for field in BAR_FIELDS) for row in bars or ()]
+        try:
+            values = np.array(rows, dtype=np.float64).reshape(len(rows), len(BAR_FIELDS))
+        except (TypeError, ValueError):
+            values = np.array([[_as_float(value) for value in row] for row in rows], dtype=np.float64).reshape(
+                len(rows), len(BAR_FIELDS)
+            )
+        timestamps = values[:, 0]
+        if len(timestamps) > 1 and not (timestamps[1:] >= timestamps[:-1]).all():
+            values = values[np.argsort(timestamps, kind="stable")]
+        return {field: values[:, idx] for idx, field in enumerate(BAR_FIELDS)}
+
     @staticmethod
     def aggregates_to_dataframe(bars: List[Dict[str, float]]) -> pd.DataFrame:
         frame = pd.DataFrame(bars)
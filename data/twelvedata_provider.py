@@ -6,9 +6,8 @@ from collections import defaultdict
 import logging
 import time
 
-import requests
-
 from core.config import get_settings
+from core.http_session import get_session
 from core.logger import get_logger
 from core.cache import get_cache
 
@@ -168,7 +167,7 @@ class TwelveDataProvider:
             return cached if cached is not None else None
         params = {"symbol": symbol.upper(), "apikey": self.api_key, "interval": "1min", "outputsize": 1}
         try:
-            response = requests.get(f"{self.BASE_URL}/time_series", params=params, timeout=10)
+            response = get_session().get(f"{self.BASE_URL}/time_series", params=params, timeout=10)
             if response.status_code == 429:
                 self._set_rate_limit(RATE_LIMIT_COOLDOWN, "http 429")
                 return cached if cached is not None else None
@@ -204,7 +203,7 @@ class TwelveDataProvider:
             "outputsize": limit,
         }
         try:
-            response = requests.get(f"{self.BASE_URL}/time_series", params=params, timeout=10)
+            response = get_session().get(f"{self.BASE_URL}/time_series", params=params, timeout=10)
             if response.status_code == 429:
                 self._set_rate_limit(RATE_LIMIT_COOLDOWN, "http 429")
                 return cached
@@ -257,7 +256,7 @@ class TwelveDataProvider:
             "outputsize": limit,
         }
         try:
-            response = requests.get(f"{self.BASE_URL}/time_series", params=params, timeout=10)
+            response = get_session().get(f"{self.BASE_URL}/time_series", params=params, timeout=10)
             if response.status_code == 429:
                 self._set_rate_limit(RATE_LIMIT_COOLDOWN, "http 429")
                 return cached
@@ -309,7 +308,7 @@ class TwelveDataProvider:
             return cached if cached is not None else 0.0
         params = {"symbol": symbol.upper(), "apikey": self.api_key}
         try:
-            response = requests.get(f"{self.BASE_URL}/profile", params=params, timeout=10)
+            response = get_session().get(f"{self.BASE_URL}/profile", params=params, timeout=10)
             if response.status_code == 429:
                 self._set_rate_limit(RATE_LIMIT_COOLDOWN, "http 429")
                 return cached if cached is not None else 0.0
@@ -355,7 +354,7 @@ class TwelveDataProvider:
         joined = ",".join(symbols)
         params = {"symbol": joined, "interval": "1day", "apikey": self.api_key, "outputsize": limit}
         try:
-            response = requests.get(f"{self.BASE_URL}/time_series", params=params, timeout=10)
+            response = get_session().get(f"{self.BASE_URL}/time_series", params=params, timeout=10)
             if response.status_code == 429:
                 self._set_rate_limit(RATE_LIMIT_COOLDOWN, "http 429")
                 return results
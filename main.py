@@ -1,7 +1,7 @@
 import logging
 import math
 import time
-from datetime import datetime, time as dt_time, timezone
+from datetime import datetime, time as dt_time
 
 import pytz
 
@@ -19,6 +19,8 @@ from trader.execution_adapter import (
 from trader import risk_model
 from data.price_router import PriceRouter
 from strategy.crash_detector import get_crash_state
+from trader.fill_stream import start_fill_stream
+from trader.order_executor import start_keepalive
 from trader.pnl_tracker import update_daily_pnl
 from data.portfolio_state import sync_entry_timestamps, sync_entry_metadata
 from types import SimpleNamespace
@@ -50,6 +52,8 @@ def market_open_now() -> bool:
 
 
 def microcap_cycle():
+    start_fill_stream()
+    start_keepalive()
     while True:
         start = time.time()
         try:
@@ -184,11 +188,24 @@ def microcap_cycle():
             reconcile_pending_entries()
             # Exit checks for existing positions
             open_positions = list_positions()
+            risk_model.prune_trailing_state(pos.symbol for pos in open_positions)
             entry_ts_map = sync_entry_timestamps(
                 [pos.symbol for pos in open_positions],
                 default_timestamp=None,
             )
             entry_meta_map = sync_entry_metadata([pos.symbol for pos in open_positions])
+            # One multi-symbol bars request for every position the intraday exit checks need.
+            intraday_symbols = [
+                pos.symbol
+                for pos in open_positions
+                if (entry_meta_map.get(pos.symbol.upper()) or {}).get("data_source") != "daily"
+            ]
+            try:
+                bars_by_symbol = price_router.get_aggregates_batch(intraday_symbols, window=risk_model.EXIT_BARS_WINDOW)
+            except Exception as exc:  # pragma: no cover - network guard
+                logger.warning("Batch exit bars fetch failed: %s", exc)
+                bars_by_symbol = {}
+            scan_now_ts = time.time()
             for pos in open_positions:
                 symbol_key = pos.symbol.upper()
                 try:
@@ -208,7 +225,9 @@ def microcap_cycle():
                     "max_hold_minutes": metadata.get("max_hold_minutes"),
                     "data_source": metadata.get("data_source"),
                 }
-                if risk_model.should_exit(position_payload, crash_mode=crash):
+                if risk_model.should_exit(
+                    position_payload, crash_mode=crash, bars=bars_by_symbol.get(pos.symbol), now_ts=scan_now_ts
+                ):
                     entry_ts = entry_ts_map.get(symbol_key)
                     exit_reason = "technical_exit"
                     if not current_price or not entry_price:
@@ -224,12 +243,13 @@ def microcap_cycle():
                             exit_reason = "stop_loss"
                         elif entry_ts is not None:
                             try:
-                                elapsed = (datetime.now(timezone.utc).timestamp() - float(entry_ts)) / 60
+                                elapsed = (scan_now_ts - float(entry_ts)) / 60
                                 if elapsed >= max_minutes:
                                     exit_reason = "time_stop"
                             except (TypeError, ValueError):
                                 exit_reason = "technical_exit"
                     close_position(pos.symbol, reason=exit_reason)
+                    risk_model.discard_trailing_state(pos.symbol)
 
             logger.info("=== Cycle Complete ===")
             # After finishing a cycle:
@@ -7,19 +7,22 @@ from ta.momentum import RSIIndicator
 from strategy.technicals import compute_atr, compute_macd_hist, atr_bands
 
 
-def compute_reversal_signal(df: pd.DataFrame) -> float:
+def compute_reversal_signal(df: pd.DataFrame, *, close: pd.Series | None = None) -> float:
     """
     Return a reversal score between -1 (bearish) and +1 (bullish).
     Conditions:
     - RSI < 38 or RSI > 72
     - MACD histogram crosses zero (directional)
     - Price touches ±1.5 ATR band
+
+    ``close`` may be passed when the caller already cast the close column to float.
     """
 
     if df is None or df.empty or len(df) < 25:
         return 0.0
 
-    close = df["close"].astype(float)
+    if close is None:
+        close = df["close"].astype(float)
     rsi = RSIIndicator(close, window=14).rsi()
     if rsi.empty:
         return 0.0
@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Dict, List
+from collections import OrderedDict
+from heapq import nlargest
+from typing import Dict, List, Tuple
+
+import numpy as np
 
 from core.config import get_settings
 from data.price_router import PriceRouter
 from strategy.momentum import compute_momentum_scores
-from strategy.regime import compute_daily_regime
-from strategy.technicals import passes_entry_filter, compute_atr
+from strategy.regime import RegimeInfo, compute_daily_regime
+from strategy.technicals import passes_entry_filter, compute_atr_np
 from strategy.ml_classifier import generate_predictions
 from strategy.reversal import compute_reversal_signal
 from strategy.sentiment_engine import get_symbol_sentiment
@@ -21,6 +25,35 @@ logger = logging.getLogger(__name__)
 price_router = PriceRouter()
 settings = get_settings()
 
+_SIGNAL_LOG_FIELDS = (
+    "score",
+    "prob",
+    "sentiment",
+    "momentum_score",
+    "reversal_score",
+    "regime_score",
+    "regime",
+    "atr_pct",
+    "daily_atr_pct",
+    "vol_ratio",
+    "score_threshold",
+    "ml_threshold_trend",
+    "ml_threshold_reversal",
+    "provider_intraday",
+    "provider_daily",
+    "stop_loss_pct",
+    "take_profit_pct",
+    "reason",
+)
+_CRASH_SIGNAL_CAP = 3
+# (base stop-loss %, base take-profit %, max stop-loss %, max take-profit %) by crash mode
+_SL_TP_PARAMS = {
+    True: (settings.crash_stop_loss_pct, settings.crash_take_profit_pct, 0.05, 0.12),
+    False: (STOP_LOSS_PCT, TAKE_PROFIT_PCT, 0.08, 0.20),
+}
+_REGIME_CACHE_MAX = 2048
+_regime_cache: "OrderedDict[Tuple[str, float, int, object], RegimeInfo]" = OrderedDict()
+
 
 def _intraday_health(context) -> tuple[bool, float | None]:
     if context is None:
@@ -34,49 +67,65 @@ def _intraday_health(context) -> tuple[bool, float | None]:
     return True, None
 
 
-def _load_daily_bars(symbols: List[str]) -> Dict[str, List[Dict[str, float]]]:
+def _load_daily_bars(symbols: List[str], limit: int = 90) -> Dict[str, List[Dict[str, float]]]:
     if not symbols:
         return {}
     if hasattr(price_router, "get_daily_bars_batch"):
-        return price_router.get_daily_bars_batch(symbols, limit=90)
+        return price_router.get_daily_bars_batch(symbols, limit=limit)
     daily_map: Dict[str, List[Dict[str, float]]] = {}
     for sym in symbols:
         try:
-            daily_map[sym] = price_router.get_daily_aggregates(sym, limit=90)
+            daily_map[sym] = price_router.get_daily_aggregates(sym, limit=limit)
         except Exception as exc:
             logger.warning("Daily bars unavailable for %s: %s", sym, exc)
             continue
     return daily_map
 
 
+def _daily_regime(symbol: str, bars: List[Dict[str, float]]) -> RegimeInfo | None:
+    """Daily regime for ``symbol``, memoized on the latest daily bar so intraday passes reuse it."""
+
+    if not bars:
+        return None
+    last_bar = bars[-1] if isinstance(bars[-1], dict) else {}
+    last_ts = last_bar.get("timestamp")
+    key = None
+    if last_ts is not None:
+        # The close is part of the key because a provider may revise the current day's bar in place.
+        key = (symbol, float(last_ts), len(bars), last_bar.get("close"))
+        cached = _regime_cache.get(key)
+        if cached is not None:
+            _regime_cache.move_to_end(key)
+            return cached
+    df_daily = PriceRouter.aggregates_to_dataframe(bars)
+    if df_daily is None or df_daily.empty:
+        return None
+    regime = compute_daily_regime(df_daily)
+    if key is not None:
+        _regime_cache[key] = regime
+        if len(_regime_cache) > _REGIME_CACHE_MAX:
+            _regime_cache.popitem(last=False)
+    return regime
+
+
+def _signal_score(signal: Dict[str, float | str]) -> float:
+    # Reversal signals carry no "score"; they rank behind scored entries.
+    return float(signal.get("score", 0.0))
+
+
 def _log_signal(signal: Dict[str, float | str]) -> None:
     symbol = signal.get("symbol") if isinstance(signal, dict) else None
     if not symbol:
         return
-    payload = {
-        "event": "signal",
-        "symbol": symbol,
-        "signal_type": signal.get("type"),
-        "score": signal.get("score"),
-        "prob": signal.get("prob"),
-        "sentiment": signal.get("sentiment"),
-        "momentum_score": signal.get("momentum_score"),
-        "reversal_score": signal.get("reversal_score"),
-        "regime_score": signal.get("regime_score"),
-        "regime": signal.get("regime"),
-        "atr_pct": signal.get("atr_pct"),
-        "daily_atr_pct": signal.get("daily_atr_pct"),
-        "vol_ratio": signal.get("vol_ratio"),
-        "score_threshold": signal.get("score_threshold"),
-        "ml_threshold_trend": signal.get("ml_threshold_trend"),
-        "ml_threshold_reversal": signal.get("ml_threshold_reversal"),
-        "provider_intraday": signal.get("provider_intraday"),
-        "provider_daily": signal.get("provider_daily"),
-        "stop_loss_pct": signal.get("stop_loss_pct"),
-        "take_profit_pct": signal.get("take_profit_pct"),
-        "reason": signal.get("reason"),
-    }
-    log_trade({k: v for k, v in payload.items() if v is not None})
+    payload: Dict[str, object] = {"event": "signal", "symbol": symbol}
+    signal_type = signal.get("type")
+    if signal_type is not None:
+        payload["signal_type"] = signal_type
+    for key in _SIGNAL_LOG_FIELDS:
+        value = signal.get(key)
+        if value is not None:
+            payload[key] = value
+    log_trade(payload)
 
 
 def route_signals(universe: List[str], crash_mode: bool = False, context=None) -> List[Dict[str, float | str]]:
@@ -111,24 +160,12 @@ def route_signals(universe: List[str], crash_mode: bool = False, context=None) -
     if orb_symbols:
         symbols_for_daily.extend(orb_symbols)
     if symbols_for_daily:
-        symbols = list(dict.fromkeys(symbols_for_daily))
-        if hasattr(price_router, "get_daily_bars_batch"):
-            daily_bars_map = price_router.get_daily_bars_batch(symbols, limit=60)
-        else:
-            for sym in symbols:
-                if not hasattr(price_router, "get_daily_aggregates"):
-                    break
-                try:
-                    daily_bars_map[sym] = price_router.get_daily_aggregates(sym, limit=60)
-                except Exception as exc:
-                    logger.warning("Daily bars unavailable for %s: %s", sym, exc)
-                    continue
+        daily_bars_map = _load_daily_bars(list(dict.fromkeys(symbols_for_daily)), limit=60)
     daily_regime_map = {}
     for sym, bars in (daily_bars_map or {}).items():
-        df_daily = PriceRouter.aggregates_to_dataframe(bars)
-        if df_daily is None or df_daily.empty:
-            continue
-        daily_regime_map[sym] = compute_daily_regime(df_daily)
+        regime = _daily_regime(sym, bars)
+        if regime is not None:
+            daily_regime_map[sym] = regime
 
     regime_gate_min = float(settings.regime_gate_min_score or 0.0)
     filtered_orb_signals: List[Dict[str, float | str]] = []
@@ -154,6 +191,11 @@ def route_signals(universe: List[str], crash_mode: bool = False, context=None) -
     momentum_rank = {sym: idx for idx, (sym, _) in enumerate(momentum)}
     max_rank = max(len(momentum_rank), 1)
     rate_limited: set[str] = set()
+    ml_threshold_trend = float(settings.ml_trend_threshold or 0.20)
+    ml_threshold_reversal = float(settings.ml_reversal_threshold or 0.26)
+    reverse_prob_cutoff = max(ml_threshold_reversal, 0.30 if crash_mode else ml_threshold_reversal)
+    base_sl_pct, base_tp_pct, max_sl_pct, max_tp_pct = _SL_TP_PARAMS[bool(crash_mode)]
+    pnl_penalty = context.pnl_penalty if hasattr(context, "pnl_penalty") else 0.0
 
     for symbol, prob, features in ml_preds:
         if symbol in skip_symbols:
@@ -163,8 +205,6 @@ def route_signals(universe: List[str], crash_mode: bool = False, context=None) -
         time.sleep(0.05)  # stagger provider requests slightly for large universes (reduce API bursts)
         rank_idx = momentum_rank.get(symbol)
         rank_component = 1.0 - (rank_idx / max_rank) if rank_idx is not None else 0.0
-        ml_threshold_trend = float(settings.ml_trend_threshold or 0.20)
-        ml_threshold_reversal = float(settings.ml_reversal_threshold or 0.26)
         momentum_score = momentum_map.get(symbol, 0.0)
         vol_ratio = float(features.get("vol_ratio", 1.0) or 1.0)
         ml_pass = prob >= ml_threshold_trend
@@ -193,6 +233,7 @@ def route_signals(universe: List[str], crash_mode: bool = False, context=None) -
             continue
 
         close = df["close"].astype(float)
+        close_arr = close.to_numpy()
         provider_lookup = getattr(price_router, "last_provider", None)
         if callable(provider_lookup):
             intraday_provider = provider_lookup(symbol, "intraday")
@@ -204,25 +245,30 @@ def route_signals(universe: List[str], crash_mode: bool = False, context=None) -
         vol_ok = vol_ratio > 0.20
 
         # volatility ratio via ATR relative to its recent average
-        atr_series = compute_atr(df, window=14)
-        atr_current = float(atr_series.iloc[-1]) if len(atr_series) else 0.0
-        atr_avg = float(atr_series.rolling(window=30, min_periods=5).mean().iloc[-1]) if len(atr_series) else 0.0
+        atr_values = compute_atr_np(
+            df["high"].to_numpy(dtype=np.float64),
+            df["low"].to_numpy(dtype=np.float64),
+            close_arr,
+            window=14,
+        )
+        atr_current = float(atr_values[-1]) if len(atr_values) else 0.0
+        atr_avg = 0.0
+        if len(atr_values):
+            # last value of a 30-bar rolling mean with min_periods=5
+            atr_recent = atr_values[-30:]
+            atr_recent = atr_recent[~np.isnan(atr_recent)]
+            atr_avg = float(atr_recent.mean()) if len(atr_recent) >= 5 else float("nan")
         volatility_ratio = (atr_current / atr_avg) if atr_avg else 1.0
 
-        entry_price = float(close.iloc[-1]) if len(close) else 0.0
+        entry_price = float(close_arr[-1]) if len(close_arr) else 0.0
         atr_pct_intraday = (atr_current / entry_price) if entry_price > 0 and atr_current > 0 else 0.0
-        base_sl_pct = settings.crash_stop_loss_pct if crash_mode else STOP_LOSS_PCT
-        base_tp_pct = settings.crash_take_profit_pct if crash_mode else TAKE_PROFIT_PCT
-        max_sl_pct = 0.05 if crash_mode else 0.08
-        max_tp_pct = 0.12 if crash_mode else 0.20
         if atr_pct_intraday > 0:
             stop_loss_pct = max(base_sl_pct, min(atr_pct_intraday * settings.atr_multiplier, max_sl_pct))
         else:
             stop_loss_pct = base_sl_pct
         take_profit_pct = max(base_tp_pct, min(stop_loss_pct * 1.8, max_tp_pct))
 
-        reversal_score = compute_reversal_signal(df)
-        reverse_prob_cutoff = max(ml_threshold_reversal, 0.30 if crash_mode else ml_threshold_reversal)
+        reversal_score = compute_reversal_signal(df, close=close)
         reversal_allowed = (
             -0.10 <= momentum_score <= 0.10
             and volatility_ratio > 1.05
@@ -237,7 +283,7 @@ def route_signals(universe: List[str], crash_mode: bool = False, context=None) -
 
         momentum_base = (
             ml_pass
-            and passes_entry_filter(df, crash_mode=crash_mode)
+            and passes_entry_filter(df, crash_mode=crash_mode, close=close)
             and vol_ok
             and short_slope > 0
             and mid_slope > -0.005
@@ -247,7 +293,7 @@ def route_signals(universe: List[str], crash_mode: bool = False, context=None) -
             not ml_pass
             and momentum_score > 0.02
             and vol_ratio > 1.3
-            and passes_entry_filter(df, crash_mode=crash_mode)
+            and passes_entry_filter(df, crash_mode=crash_mode, close=close)
             and short_slope > 0
             and mid_slope > 0
         )
@@ -263,8 +309,7 @@ def route_signals(universe: List[str], crash_mode: bool = False, context=None) -
                 sentiment = (sentiment_raw + 1.0) / 2.0  # map [-1,1] to [0,1]
         raw_score = raw_score_base + 0.15 * sentiment
 
-        # P&L penalty/boost injected from main
-        pnl_penalty = context.pnl_penalty if hasattr(context, "pnl_penalty") else 0.0
+        # P&L penalty/boost injected from main (read once above the loop)
         final_score = raw_score - pnl_penalty
         momentum_signal = (momentum_base and final_score > score_threshold) or momentum_override
 
@@ -379,14 +424,20 @@ def route_signals(universe: List[str], crash_mode: bool = False, context=None) -
                 }
             )
             _log_signal(signals[-1])
-        if crash_mode and len(signals) >= 3:
-            logger.info("Crash mode signal cap reached (3); skipping remaining symbols")
+        if crash_mode and len(signals) >= _CRASH_SIGNAL_CAP:
+            logger.info("Crash mode signal cap reached (%s); skipping remaining symbols", _CRASH_SIGNAL_CAP)
             break
-    signals.sort(key=lambda item: float(item.get("score", 0.0)), reverse=True)
+    if crash_mode:
+        signals = nlargest(_CRASH_SIGNAL_CAP, signals, key=_signal_score)
+    else:
+        signals.sort(key=_signal_score, reverse=True)
     if signals:
         return signals
 
-    daily_bars_map = daily_bars_map or _load_daily_bars(universe)
+    # Only fetch what the ML/ORB pass did not already load.
+    missing = [sym for sym in universe if sym not in daily_bars_map]
+    if missing:
+        daily_bars_map = {**daily_bars_map, **_load_daily_bars(missing)}
     sentiment_lookup = get_symbol_sentiment if settings.use_sentiment else None
     swing_signals = generate_swing_signals(universe, daily_bars_map, sentiment_lookup=sentiment_lookup)
     for sig in swing_signals:
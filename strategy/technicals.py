@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 from ta.momentum import RSIIndicator
 from ta.trend import MACD, SMAIndicator
@@ -20,17 +21,35 @@ def compute_vwap(df: pd.DataFrame) -> pd.Series:
     return dollar_volume / cumulative_volume
 
 
-def passes_entry_filter(df: pd.DataFrame, crash_mode: bool = False) -> bool:
+def _vwap_last(close: np.ndarray, volume: np.ndarray) -> float:
+    """Session VWAP at the last bar; same value as ``compute_vwap(df).iloc[-1]``.
+
+    Like the pandas cumsums, NaN bars earlier in the session are skipped, while
+    a NaN on the last bar itself leaves the VWAP undefined.
+    """
+
+    dollar_volume = close * volume
+    if not len(volume) or np.isnan(volume[-1]) or np.isnan(dollar_volume[-1]):
+        return float("nan")
+    total_volume = float(np.nansum(volume))
+    if total_volume == 0:
+        return float("nan")
+    return float(np.nansum(dollar_volume) / total_volume)
+
+
+def passes_entry_filter(df: pd.DataFrame, crash_mode: bool = False, *, close: pd.Series | None = None) -> bool:
+    """Momentum entry check; pass ``close`` when the caller already has it as floats."""
+
     if crash_mode:
         return True
     if df is None or df.empty or len(df) < 20:
         return False
 
-    close = df["close"].astype(float)
+    if close is None:
+        close = df["close"].astype(float)
     rsi = RSIIndicator(close, window=14).rsi().iloc[-1]
     macd = MACD(close).macd().iloc[-1]
-    macd_signal = MACD(close).macd_signal().iloc[-1]
-    vwap = compute_vwap(df).iloc[-1]
+    vwap = _vwap_last(close.to_numpy(), df["volume"].to_numpy(dtype=np.float64))
 
     # Momentum: less aggressive thresholds
     if not (ENTRY_RSI_MIN < rsi < ENTRY_RSI_MAX):
@@ -52,7 +71,7 @@ def passes_exit_filter(ohlcv_df: pd.DataFrame) -> bool:
     sma20 = SMAIndicator(close, window=20).sma_indicator().iloc[-1]
     macd_hist = _macd_hist(close).iloc[-1]
     price = close.iloc[-1]
-    vwap = compute_vwap(ohlcv_df).iloc[-1]
+    vwap = _vwap_last(close.to_numpy(), ohlcv_df["volume"].to_numpy(dtype=np.float64))
     signals = 0
     if rsi > EXIT_RSI_MIN:
         signals += 1
@@ -94,6 +113,23 @@ def compute_atr(df: pd.DataFrame, window: int = 14) -> pd.Series:
     return tr.rolling(window=window, min_periods=window).mean()
 
 
+def compute_atr_np(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> np.ndarray:
+    """NumPy ``compute_atr``: same simple-average ATR, without building pandas objects."""
+
+    n = len(close)
+    atr = np.full(n, np.nan)
+    if n == 0 or window <= 0:
+        return atr
+    prev_close = np.empty(n)
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    # fmax skips NaN like DataFrame.max(axis=1), so the first bar falls back to high - low.
+    tr = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+    if n >= window:
+        atr[window - 1 :] = np.lib.stride_tricks.sliding_window_view(tr, window).mean(axis=1)
+    return atr
+
+
 def atr_bands(df: pd.DataFrame, multiplier: float = 1.5, window: int = 14):
     """Return mid, upper, lower ATR bands and ATR series."""
 
@@ -3,10 +3,14 @@
 import sys
 from unittest.mock import MagicMock
 
+_TA_SUBMODULES = ("momentum", "trend", "volatility", "volume", "others", "utils")
+
 # If the 'ta' library is not installed (e.g., in CI without native deps),
 # provide a mock so tests that don't directly use it can still run.
+# Every ta submodule is registered up front so new imports never fall
+# through to a real (failing) import.
 if "ta" not in sys.modules:
     ta_mock = MagicMock()
     sys.modules["ta"] = ta_mock
-    sys.modules["ta.momentum"] = ta_mock.momentum
-    sys.modules["ta.trend"] = ta_mock.trend
+    for _sub in _TA_SUBMODULES:
+        sys.modules[f"ta.{_sub}"] = getattr(ta_mock, _sub)
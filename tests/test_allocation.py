@@ -0,0 +1,112 @@
+"""Tests for trader.allocation."""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from trader.allocation import _daily_budget, _greedy_shares, _size_signals, allocate_positions
+
+
+def _router(prices):
+    router = MagicMock()
+    router.get_prices.side_effect = lambda symbols: {s: prices[s] for s in symbols if s in prices}
+    return router
+
+
+class TestSizeSignals:
+    def test_normal_mode_adjustments(self):
+        sizes = _size_signals(
+            np.array([1.0, 1.0, 1.0, 0.5]),
+            np.array([1.0, 2.0, 0.5, 1.0]),
+            np.array([False, False, False, True]),
+            np.array([1.0, 1.0, 1.0, 1.0]),
+            1000.0,
+            False,
+        )
+        # strength scaling, high-vol halving, low-vol reset to base, reversal 0.6x
+        assert np.allclose(sizes, [1400.0, 700.0, 1000.0, 1100.0 * 0.6])
+
+    def test_size_multiplier_is_clamped(self):
+        sizes = _size_signals(
+            np.array([0.0, 0.0]),
+            np.array([1.0, 1.0]),
+            np.array([False, False]),
+            np.array([0.01, 10.0]),
+            1000.0,
+            True,
+        )
+        assert np.allclose(sizes, [700.0 * 0.2, 700.0 * 1.5])
+
+
+class TestGreedyShares:
+    def test_uncapped_walk(self):
+        shares = _greedy_shares(np.array([100.0, 50.0, 80.0]), np.array([10.0, 0.0, 30.0]), 1000.0, None)
+        assert shares.tolist() == [10, 0, 2]
+
+    def test_position_cap_zeroes_the_rest(self):
+        shares = _greedy_shares(np.full(4, 10.0), np.ones(4), 1000.0, 2)
+        assert shares.tolist() == [10, 10, 0, 0]
+
+    def test_budget_cap_needs_loop(self):
+        assert _greedy_shares(np.array([600.0, 600.0]), np.array([1.0, 1.0]), 1000.0, None) is None
+
+
+class TestDailyBudget:
+    def test_cache_clear_rereads_env(self, monkeypatch):
+        monkeypatch.setenv("DAILY_BUDGET_USD", "2500")
+        _daily_budget.cache_clear()
+        try:
+            assert _daily_budget() == 2500.0
+            monkeypatch.setenv("DAILY_BUDGET_USD", "4000")
+            assert _daily_budget() == 2500.0
+            _daily_budget.cache_clear()
+            assert _daily_budget() == 4000.0
+        finally:
+            _daily_budget.cache_clear()
+
+
+class TestAllocatePositions:
+    def test_empty_signals(self):
+        assert allocate_positions([]) == {}
+
+    def test_allocates_whole_shares_within_budget(self):
+        signals = [
+            {"symbol": "AAA", "score": 1.0, "vol_ratio": 1.0},
+            {"symbol": "BBB", "score": 0.5, "vol_ratio": 1.0},
+        ]
+        router = _router({"AAA": 10.0, "BBB": 20.0})
+        with patch("trader.allocation._get_price_router", return_value=router), patch(
+            "trader.allocation._daily_budget", return_value=3000.0
+        ):
+            allocations = allocate_positions(signals)
+        # base 1000: AAA sized 1400 -> 140 shares, BBB sized 1100 -> 55 shares
+        assert allocations == {"AAA": 140, "BBB": 55}
+
+    def test_skips_symbols_without_price(self):
+        signals = [{"symbol": "AAA", "score": 1.0}, {"symbol": "BBB", "score": 1.0}]
+        router = _router({"BBB": 10.0})
+        with patch("trader.allocation._get_price_router", return_value=router), patch(
+            "trader.allocation._daily_budget", return_value=3000.0
+        ):
+            allocations = allocate_positions(signals)
+        assert list(allocations) == ["BBB"]
+
+    def test_crash_mode_caps_positions(self):
+        signals = [{"symbol": f"S{i}", "score": 0.1, "vol_ratio": 1.0} for i in range(5)]
+        router = _router({f"S{i}": 1.0 for i in range(5)})
+        with patch("trader.allocation._get_price_router", return_value=router), patch(
+            "trader.allocation._daily_budget", return_value=100_000.0
+        ):
+            allocations = allocate_positions(signals, crash_mode=True)
+        assert len(allocations) == 3
+
+    def test_stops_when_budget_below_remaining_prices(self):
+        signals = [{"symbol": sym, "score": 1.0, "vol_ratio": 1.0} for sym in ("AAA", "BBB", "CCC", "DDD")]
+        router = _router({"AAA": 1.0, "BBB": 1.0, "CCC": 3.0, "DDD": 5000.0})
+        with patch("trader.allocation._get_price_router", return_value=router), patch(
+            "trader.allocation._daily_budget", return_value=3000.0
+        ), patch("trader.allocation.logger") as mock_logger:
+            allocations = allocate_positions(signals)
+        # CCC is capped by the 200 left over, which then cannot buy DDD
+        assert allocations == {"AAA": 1400, "BBB": 1400, "CCC": 66}
+        assert any("below every remaining price" in str(call) for call in mock_logger.info.call_args_list)
@@ -0,0 +1,64 @@
+"""Tests for trader.broker_cache."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from trader import broker_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    broker_cache.invalidate()
+    yield
+    broker_cache.invalidate()
+
+
+class TestGetPositionsRaw:
+    def test_reads_raw_payload_without_models(self):
+        client = MagicMock()
+        client.get.return_value = [{"symbol": "AAA", "qty": "5", "current_price": "10.5", "asset_id": "x"}]
+        positions = broker_cache.get_positions_raw(client)
+        client.get.assert_called_once_with("/positions")
+        client.get_all_positions.assert_not_called()
+        assert positions[0].symbol == "AAA"
+        assert positions[0].qty == 5.0
+        assert positions[0].current_price == 10.5
+        assert positions[0].held_for_orders is None
+
+    def test_falls_back_to_model_endpoint(self):
+        client = MagicMock()
+        client.get.return_value = None
+        client.get_all_positions.return_value = [SimpleNamespace(symbol="AAA", qty="2", unrealized_pl="-1.5")]
+        positions = broker_cache.get_positions_raw(client)
+        assert [pos.symbol for pos in positions] == ["AAA"]
+        assert isinstance(positions[0], broker_cache.PositionLite)
+        assert positions[0].qty == 2.0 and positions[0].unrealized_pl == -1.5
+        assert positions[0].avg_entry_price is None
+
+    def test_bad_numeric_fields_become_none(self):
+        client = MagicMock()
+        client.get.return_value = [{"symbol": "AAA", "qty": "abc", "unrealized_pl": ""}]
+        position = broker_cache.get_positions_raw(client)[0]
+        assert position.qty is None and position.unrealized_pl is None
+
+
+class TestCachedSnapshots:
+    def test_account_fetched_once_until_invalidated(self):
+        client = MagicMock()
+        client.get_account.return_value = SimpleNamespace(equity="1")
+        broker_cache.get_account_cached(client)
+        broker_cache.get_account_cached(client)
+        assert client.get_account.call_count == 1
+        broker_cache.invalidate()
+        broker_cache.get_account_cached(client)
+        assert client.get_account.call_count == 2
+
+    def test_positions_shared_across_callers(self):
+        client = MagicMock()
+        client.get.return_value = [{"symbol": "AAA"}]
+        first = broker_cache.get_positions_cached(client)
+        second = broker_cache.get_positions_cached(client)
+        assert first is second
+        client.get.assert_called_once()
@@ -82,3 +82,24 @@ class TestTTLCache:
             mock_time.time.return_value = time.time() + 5
             assert cache.get("short") is None
             assert cache.get("long") == "val"
+
+    def test_cleanup_keeps_key_reset_with_longer_ttl(self):
+        cache = TTLCache(default_ttl=60)
+        cache.set("key1", "old", ttl=1)
+        cache.set("key1", "new", ttl=3600)
+        cache.set("short", "val", ttl=1)
+        with patch("core.cache.time") as mock_time:
+            mock_time.time.return_value = time.time() + 5
+            cache.cleanup()
+        assert cache.get("key1") == "new"
+        assert "short" not in cache._data
+
+    def test_max_size_skips_stale_heap_entries(self):
+        cache = TTLCache(default_ttl=60, max_size=2)
+        cache.set("a", 1, ttl=10)
+        cache.set("b", 2, ttl=20)
+        cache.set("a", 3, ttl=100)  # "a" now outlives "b"
+        cache.set("c", 4, ttl=50)
+        assert cache.get("a") == 3
+        assert cache.get("b") is None
+        assert cache.get("c") == 4
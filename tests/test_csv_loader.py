@@ -0,0 +1,22 @@
+"""Tests for universe.csv_loader."""
+
+from universe.csv_loader import load_universe_from_csv
+
+
+class TestLoadUniverseFromCsv:
+    def test_reads_only_symbols_upper_cased(self, tmp_path):
+        path = tmp_path / "universe.csv"
+        path.write_text("symbol,name\naapl,Apple\n,Blank\nmsft,Microsoft\n")
+        df = load_universe_from_csv(path)
+        assert list(df.columns) == ["symbol"]
+        assert df["symbol"].tolist() == ["AAPL", "MSFT"]
+
+    def test_missing_symbol_column(self, tmp_path):
+        path = tmp_path / "universe.csv"
+        path.write_text("ticker\nAAPL\n")
+        df = load_universe_from_csv(path)
+        assert df.empty
+        assert list(df.columns) == ["symbol"]
+
+    def test_missing_file(self, tmp_path):
+        assert load_universe_from_csv(tmp_path / "absent.csv").empty
@@ -0,0 +1,224 @@
+"""Tests for trader.execution_adapter."""
+
+import time
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from alpaca.common.exceptions import APIError
+from alpaca.trading.enums import OrderStatus
+
+from trader import execution_adapter
+from trader.execution_adapter import execute_signals
+
+
+@pytest.fixture(autouse=True)
+def _fresh_broker_snapshot():
+    execution_adapter._invalidate_broker_snapshot()
+    yield
+    execution_adapter._invalidate_broker_snapshot()
+
+
+def _client(positions=(), buying_power="100000"):
+    client = MagicMock()
+    client.get_all_positions.return_value = [SimpleNamespace(symbol=sym) for sym in positions]
+    client.get_account.return_value = SimpleNamespace(equity="100000", buying_power=buying_power)
+    client.submit_order.return_value = SimpleNamespace(id="order-1", status="filled", filled_at=None)
+    return client
+
+
+def _buy(symbol, qty=None):
+    signal = {"symbol": symbol, "action": "BUY", "entry_price": 10.0}
+    if qty is not None:
+        signal["requested_qty"] = qty
+    return signal
+
+
+class TestExecuteSignals:
+    def _run(self, client, signals, *, dry_run=False):
+        fake_settings = SimpleNamespace(
+            dry_run=dry_run,
+            max_risk_pct=0.01,
+            crash_max_positions=3,
+            execution_halt_cooldown_seconds=0,
+        )
+        with patch.object(execution_adapter, "trading_client", client), patch.object(
+            execution_adapter, "settings", fake_settings
+        ), patch.object(execution_adapter, "_halt_new_entries", False), patch.object(
+            execution_adapter, "log_trade"
+        ), patch.object(execution_adapter, "set_entry_timestamp"), patch.object(
+            execution_adapter, "set_entry_metadata"
+        ):
+            return execute_signals(signals)
+
+    def test_fetches_positions_once_per_batch(self):
+        client = _client()
+        results = self._run(client, [_buy("AAA"), _buy("BBB"), _buy("CCC")], dry_run=True)
+        assert [r["reason"] for r in results] == ["dry_run"] * 3
+        assert client.get_all_positions.call_count == 1
+        assert client.get_account.call_count == 1
+
+    def test_submitted_symbol_counts_as_open(self):
+        client = _client()
+        results = self._run(client, [_buy("AAA"), _buy("AAA")])
+        assert results[0]["submitted"] is True
+        assert results[1]["reason"] == "position_exists"
+        assert client.get_all_positions.call_count == 1
+
+    def test_existing_position_skipped(self):
+        client = _client(positions=["AAA"])
+        results = self._run(client, [_buy("AAA")])
+        assert results[0]["reason"] == "position_exists"
+        client.submit_order.assert_not_called()
+
+    def test_non_finite_entry_price_rejected(self):
+        client = _client()
+        results = self._run(client, [{"symbol": "AAA", "action": "BUY", "entry_price": float("nan")}])
+        assert results[0]["reason"] == "invalid_entry_price"
+
+    def test_batch_submits_every_order_with_one_snapshot(self):
+        client = _client()
+        results = self._run(client, [_buy("AAA"), _buy("BBB"), _buy("CCC")])
+        assert [r["symbol"] for r in results] == ["AAA", "BBB", "CCC"]
+        assert all(r["submitted"] for r in results)
+        assert client.submit_order.call_count == 3
+        assert client.get_account.call_count == 1
+
+    def test_missing_entry_prices_fetched_in_one_batch(self):
+        client = _client()
+        router = MagicMock()
+        router.get_prices.return_value = {"AAA": 10.0}
+        signals = [{"symbol": "AAA", "action": "BUY"}, {"symbol": "BBB", "action": "BUY"}]
+        with patch.object(execution_adapter, "_get_price_router", return_value=router):
+            results = self._run(client, signals)
+        router.get_prices.assert_called_once_with(["AAA", "BBB"])
+        router.get_price.assert_not_called()
+        assert results[0]["submitted"] is True
+        assert results[1]["reason"].startswith("price_unavailable")
+
+    def test_batch_reserves_buying_power(self):
+        client = _client(buying_power="1500")
+        results = self._run(client, [_buy("AAA", qty=100), _buy("BBB", qty=100)])
+        assert results[0]["submitted"] is True
+        assert results[1]["reason"] == "buying_power_insufficient"
+        assert client.submit_order.call_count == 1
+
+    def test_snapshot_reused_across_batches_until_submit(self):
+        client = _client()
+        self._run(client, [_buy("AAA")], dry_run=True)
+        self._run(client, [_buy("BBB")], dry_run=True)
+        assert client.get_all_positions.call_count == 1
+        self._run(client, [_buy("CCC")])
+        self._run(client, [_buy("DDD")])
+        assert client.get_all_positions.call_count == 2
+
+
+class TestReconcilePendingEntries:
+    def _pending(self, symbol):
+        return {"symbol": symbol, "submitted_at": time.time(), "expected_price": 10.0, "entry_metadata": {}}
+
+    def test_bulk_lookup_resolves_and_backs_off(self):
+        filled_id, open_id = uuid.uuid4(), uuid.uuid4()
+        client = MagicMock()
+        client.get_orders.return_value = [
+            SimpleNamespace(id=str(filled_id), status="filled", filled_at=None, filled_avg_price="10.0"),
+            SimpleNamespace(id=str(open_id), status="new", filled_at=None, filled_avg_price=None),
+        ]
+        pending = {filled_id: self._pending("AAA"), open_id: self._pending("BBB")}
+        with patch.object(execution_adapter, "trading_client", client), patch.object(
+            execution_adapter, "_pending_entries", execution_adapter._PendingEntries(pending)
+        ), patch.object(execution_adapter, "log_trade"), patch.object(
+            execution_adapter, "set_entry_timestamp"
+        ) as set_ts:
+            execution_adapter.reconcile_pending_entries()
+            assert execution_adapter._pending_entries.keys() == (open_id,)
+            set_ts.assert_called_once()
+            client.get_order_by_id.assert_not_called()
+            # Not due again until the poll interval passes.
+            execution_adapter.reconcile_pending_entries()
+            assert client.get_orders.call_count == 1
+            payload = execution_adapter._pending_entries.get(open_id)
+            first_interval = payload["poll_interval"]
+            payload["next_poll_at"] = 0.0
+            execution_adapter.reconcile_pending_entries()
+            assert payload["poll_interval"] == first_interval * 2
+
+    def test_ttl_uses_monotonic_submit_time(self):
+        order_id = uuid.uuid4()
+        stale = dict(self._pending("AAA"), submitted_mono=time.monotonic() - 2 * 3600)
+        client = MagicMock()
+        with patch.object(execution_adapter, "trading_client", client), patch.object(
+            execution_adapter, "_pending_entries", execution_adapter._PendingEntries({order_id: stale})
+        ):
+            execution_adapter.reconcile_pending_entries()
+            assert len(execution_adapter._pending_entries) == 0
+        client.get_orders.assert_not_called()
+
+    def test_streamed_fill_resolves_without_polling(self):
+        order_id = uuid.uuid4()
+        client = MagicMock()
+        streamed = SimpleNamespace(id=str(order_id), status=OrderStatus.FILLED, filled_at=None, filled_avg_price=None)
+        with patch.object(execution_adapter, "trading_client", client), patch.object(
+            execution_adapter, "_pending_entries", execution_adapter._PendingEntries({order_id: self._pending("AAA")})
+        ), patch.object(execution_adapter, "drain_order_updates", return_value=[streamed]), patch.object(
+            execution_adapter, "set_entry_timestamp"
+        ) as set_ts:
+            execution_adapter.reconcile_pending_entries()
+            assert len(execution_adapter._pending_entries) == 0
+        set_ts.assert_called_once()
+        client.get_orders.assert_not_called()
+
+
+class TestSubmitOrdersBulk:
+    def test_outcomes_keep_request_order(self):
+        client = MagicMock()
+        client.submit_order.side_effect = lambda order: SimpleNamespace(id=order)
+        with patch.object(execution_adapter, "trading_client", client):
+            outcomes = execution_adapter._submit_orders_bulk(["a", "b", "c"])
+        assert [submitted.id for submitted, _ in outcomes] == ["a", "b", "c"]
+        assert all(exc is None for _, exc in outcomes)
+
+
+class TestClosePosition:
+    def _close(self, client, symbol="AAA"):
+        with patch.object(execution_adapter, "trading_client", client), patch.object(
+            execution_adapter, "settings", SimpleNamespace(dry_run=False, execution_halt_cooldown_seconds=0)
+        ), patch.object(execution_adapter, "log_trade"), patch.object(
+            execution_adapter, "clear_entry_timestamp"
+        ), patch.object(execution_adapter, "clear_entry_metadata"):
+            return execution_adapter.close_position(symbol)
+
+    def test_looks_up_only_the_symbol(self):
+        client = MagicMock()
+        client.get_open_position.return_value = SimpleNamespace(
+            qty="5", held_for_orders="0", avg_entry_price="10", current_price="11"
+        )
+        result = self._close(client)
+        assert result["submitted"] is True
+        client.get_open_position.assert_called_once_with("AAA")
+        client.get_all_positions.assert_not_called()
+
+    def test_missing_position_is_not_an_error(self):
+        client = MagicMock()
+        not_found = SimpleNamespace(response=SimpleNamespace(status_code=404))
+        client.get_open_position.side_effect = APIError('{"code": 40410000, "message": "position does not exist"}', not_found)
+        with patch.object(execution_adapter, "_halt_new_entries", False):
+            result = self._close(client)
+            assert execution_adapter._halt_new_entries is False
+        assert result["reason"] == "no_position"
+        client.close_position.assert_not_called()
+
+
+class TestCoerceTimestamp:
+    def test_iso_strings(self):
+        expected = datetime(2024, 1, 2, 15, 30, tzinfo=timezone.utc).timestamp()
+        assert execution_adapter._coerce_timestamp("2024-01-02T15:30:00Z") == expected
+        assert execution_adapter._coerce_timestamp("2024-01-02T15:30:00+00:00") == expected
+        assert execution_adapter._coerce_timestamp("2024-01-02T15:30:00") == expected
+
+    def test_invalid_values(self):
+        assert execution_adapter._coerce_timestamp("") is None
+        assert execution_adapter._coerce_timestamp("not a date") is None
+        assert execution_adapter._coerce_timestamp(object()) is None
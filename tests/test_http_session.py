@@ -0,0 +1,15 @@
+"""Tests for core.http_session."""
+
+from core.http_session import POOL_MAXSIZE, get_session
+
+
+class TestGetSession:
+    def test_session_is_shared(self):
+        assert get_session() is get_session()
+
+    def test_https_adapter_pools_and_retries_connects_only(self):
+        adapter = get_session().get_adapter("https://api.example.com")
+        assert adapter._pool_maxsize == POOL_MAXSIZE
+        assert adapter.max_retries.connect == 2
+        assert adapter.max_retries.read == 0
+        assert adapter.max_retries.status == 0
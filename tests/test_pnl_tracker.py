@@ -2,8 +2,21 @@
 
 from unittest.mock import MagicMock, patch
 from types import SimpleNamespace
+from datetime import datetime, timezone
+
+import pytest
 
 from data.portfolio_state import PortfolioState
+from trader import broker_cache
+
+
+@pytest.fixture(autouse=True)
+def _reset_save_debounce(monkeypatch):
+    monkeypatch.setattr("trader.pnl_tracker._last_saved_at", 0.0)
+    monkeypatch.setattr("trader.pnl_tracker._last_saved_key", None)
+    broker_cache.invalidate()
+    yield
+    broker_cache.invalidate()
 
 
 class TestUpdateDailyPnl:
@@ -76,3 +89,48 @@ class TestUpdateDailyPnl:
         # Should not crash; baseline should be set to equity
         assert result is not None
         assert result.equity == 50_000.0
+
+    @patch("trader.pnl_tracker.save_state")
+    @patch("trader.pnl_tracker.load_state")
+    def test_unrealized_is_open_position_pnl(self, mock_load, mock_save):
+        from trader.pnl_tracker import update_daily_pnl
+
+        today = datetime.now(timezone.utc).date().isoformat()
+        mock_load.return_value = PortfolioState(day_start_equity=100_000.0, day_start_date=today)
+        client = MagicMock()
+        # The day's equity move (+1000) includes closed trades; unrealized must not.
+        client.get_account.return_value = SimpleNamespace(equity="101000", last_equity="100000")
+        client.get_all_positions.return_value = [SimpleNamespace(unrealized_pl="250"), SimpleNamespace(unrealized_pl="-50")]
+
+        result = update_daily_pnl(client)
+
+        assert result.unrealized_pnl == 200.0
+        assert result.unrealized_pct == pytest.approx(200.0 / 100_000.0)
+        persisted = mock_save.call_args.args[0]
+        assert persisted.unrealized_pnl == 200.0
+
+    @patch("trader.pnl_tracker.save_state")
+    @patch("trader.pnl_tracker.load_state")
+    def test_unchanged_equity_skips_save(self, mock_load, mock_save):
+        from trader.pnl_tracker import update_daily_pnl
+
+        today = datetime.now(timezone.utc).date().isoformat()
+        mock_load.side_effect = lambda: PortfolioState(day_start_equity=100_000.0, day_start_date=today)
+        client = MagicMock()
+        client.get_account.return_value = SimpleNamespace(equity="101000", last_equity="100000", realized_pl="0")
+        client.get_all_positions.return_value = []
+
+        update_daily_pnl(client)
+        update_daily_pnl(client)
+        assert mock_save.call_count == 1
+
+        client.get_account.return_value = SimpleNamespace(equity="101050", last_equity="100000", realized_pl="0")
+        broker_cache.invalidate()
+        update_daily_pnl(client)
+        assert mock_save.call_count == 2
+
+        # Realized P&L moving at flat equity still counts as a change.
+        client.get_account.return_value = SimpleNamespace(equity="101050", last_equity="100000", realized_pl="25")
+        broker_cache.invalidate()
+        update_daily_pnl(client)
+        assert mock_save.call_count == 3
@@ -5,7 +5,15 @@ import tempfile
 from pathlib import Path
 from unittest.mock import patch
 
-from data.portfolio_state import PortfolioState, load_state, save_state
+from data import portfolio_state
+from data.portfolio_state import (
+    PortfolioState,
+    deferred_state_writes,
+    get_entry_timestamp,
+    load_state,
+    save_state,
+    set_entry_timestamp,
+)
 
 
 class TestPortfolioState:
@@ -48,6 +56,25 @@ class TestLoadSaveState:
         finally:
             path.unlink(missing_ok=True)
 
+    def test_orjson_and_stdlib_files_are_interchangeable(self, tmp_path):
+        path = tmp_path / "state.json"
+        state = PortfolioState(equity=1_234.5, entry_timestamps={"AAPL": 1700000000.0})
+        assert portfolio_state.orjson is not None
+        with patch("data.portfolio_state.STATE_PATH", path):
+            save_state(state)
+            fast = path.read_bytes()
+            with patch.object(portfolio_state, "orjson", None):
+                assert load_state() == state
+                save_state(state)
+            assert json.loads(path.read_bytes()) == json.loads(fast)
+            assert load_state() == state
+
+    def test_save_creates_missing_directory(self, tmp_path):
+        path = tmp_path / "nested" / "state.json"
+        with patch("data.portfolio_state.STATE_PATH", path):
+            save_state(PortfolioState(equity=1.0))
+            assert load_state().equity == 1.0
+
     def test_load_corrupted_json_returns_default(self):
         with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
             f.write("{invalid json")
@@ -73,3 +100,39 @@ class TestLoadSaveState:
                 assert state.equity == 0.0
         finally:
             path.unlink(missing_ok=True)
+
+    def test_load_legacy_nan_values(self):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            f.write('{"equity": 10.0, "entry_metadata": {"AAPL": {"stop_loss_pct": NaN}}}')
+            path = Path(f.name)
+
+        try:
+            with patch("data.portfolio_state.STATE_PATH", path):
+                state = load_state()
+                assert state.equity == 10.0
+                assert "AAPL" in state.entry_metadata
+        finally:
+            path.unlink(missing_ok=True)
+
+
+class TestDeferredStateWrites:
+    def test_writes_once_on_exit(self, tmp_path):
+        path = tmp_path / "state.json"
+        with patch("data.portfolio_state.STATE_PATH", path), patch.object(
+            portfolio_state, "_write_state", wraps=portfolio_state._write_state
+        ) as write:
+            with deferred_state_writes():
+                set_entry_timestamp("aapl", 1.0)
+                set_entry_timestamp("msft", 2.0)
+                assert not path.exists()
+                assert get_entry_timestamp("AAPL") == 1.0
+            assert write.call_count == 1
+            assert load_state().entry_timestamps == {"AAPL": 1.0, "MSFT": 2.0}
+        assert not path.with_name(path.name + ".tmp").exists()
+
+    def test_no_write_without_changes(self, tmp_path):
+        path = tmp_path / "state.json"
+        with patch("data.portfolio_state.STATE_PATH", path):
+            with deferred_state_writes():
+                load_state()
+            assert not path.exists()
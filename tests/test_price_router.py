@@ -0,0 +1,81 @@
+"""Tests for data.price_router batch helpers."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import numpy as np
+
+from data.price_router import PriceRouter
+
+
+class TestDailyBarsBatchFallback:
+    def test_fallback_fetches_overlap_and_keep_symbols(self):
+        router = PriceRouter()
+        router.providers = []
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def fetch(symbol, limit=60):
+            with lock:
+                active.append(symbol)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(symbol)
+            return [{"timestamp": 1.0, "close": 1.0, "symbol": symbol}]
+
+        symbols = ["AAA", "BBB", "CCC", "DDD", "AAA"]
+        with patch.object(router, "get_daily_aggregates", side_effect=fetch) as get_daily, patch(
+            "data.price_router.cache.get", return_value=None
+        ):
+            results = router.get_daily_bars_batch(symbols)
+
+        assert list(results) == ["AAA", "BBB", "CCC", "DDD"]
+        assert all(bars[0]["symbol"] == sym for sym, bars in results.items())
+        assert get_daily.call_count == 4
+        assert max(peak) > 1
+
+
+class TestBarsToColumns:
+    def test_sorts_and_coerces(self):
+        columns = PriceRouter.bars_to_columns(
+            [{"timestamp": 2.0, "close": "bad"}, {"timestamp": 1.0, "close": 3, "volume": None}]
+        )
+        assert columns["timestamp"].tolist() == [1.0, 2.0]
+        assert columns["close"][0] == 3.0 and np.isnan(columns["close"][1])
+        assert np.isnan(columns["volume"]).all()
+
+    def test_empty(self):
+        assert len(PriceRouter.bars_to_columns([])["close"]) == 0
+
+
+class TestAlpacaMultiBars:
+    def test_symbols_are_requested_in_chunks(self):
+        from unittest.mock import MagicMock
+
+        from data import alpaca_provider
+
+        provider = alpaca_provider.AlpacaProvider()
+        provider.api_key = provider.api_secret = "key"
+        requested = []
+
+        def fake_get(url, headers=None, params=None, timeout=None):
+            symbols = params["symbols"].split(",")
+            requested.append(symbols)
+            response = MagicMock(status_code=200)
+            response.json.return_value = {
+                "bars": {sym: [{"t": "2024-01-02T00:00:00Z", "o": 1, "h": 1, "l": 1, "c": 1, "v": 10}] for sym in symbols}
+            }
+            return response
+
+        session = MagicMock()
+        session.get.side_effect = fake_get
+        with patch.object(alpaca_provider, "get_session", return_value=session), patch.object(
+            alpaca_provider, "MULTI_BARS_SYMBOL_CHUNK", 2
+        ), patch.object(provider, "_rate_limited", return_value=False):
+            results = provider.get_daily_bars_multi(["aaa", "BBB", "CCC", "AAA"], limit=5)
+
+        assert requested == [["AAA", "BBB"], ["CCC"]]
+        assert sorted(results) == ["AAA", "BBB", "CCC"]
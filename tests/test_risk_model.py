@@ -3,13 +3,26 @@
 from unittest.mock import patch
 from datetime import datetime, timezone
 
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategy.technicals import compute_atr
+from trader import risk_model
 from trader.risk_model import (
+    bracket_multipliers,
+    compute_brackets,
     stop_loss_price,
     take_profit_price,
     daily_loss_exceeded,
     can_open_position,
+    should_exit,
+    max_position_notional,
+    risk_limits,
     _coerce_pct,
     _coerce_minutes,
+    _coerce_entry_ts,
+    _trailing_stop_from_bars,
 )
 
 
@@ -83,6 +96,207 @@ class TestCanOpenPosition:
         ) is False
 
 
+class TestRiskLimits:
+    def test_matches_per_signal_helpers(self):
+        for crash in (False, True):
+            limits = risk_limits(50_000.0, crash_mode=crash)
+            assert limits.crash_mode is crash
+            assert limits.max_notional == max_position_notional(50_000.0, crash_mode=crash)
+
+    def test_crash_mode_halves_risk(self):
+        assert risk_limits(None, crash_mode=True).risk_scale == 0.5
+        assert risk_limits(None, crash_mode=False).risk_scale == 1.0
+
+
+class TestShouldExitPrefetchedBars:
+    def test_uses_injected_bars_without_fetching(self):
+        now = datetime.now(timezone.utc).timestamp()
+        position = {"symbol": "AAA", "current_price": 10.0, "entry_price": 10.0, "entry_timestamp": now}
+        with patch("trader.risk_model._get_price_router") as router, patch(
+            "trader.risk_model.passes_exit_filter", return_value=False
+        ):
+            assert should_exit(position, bars=[]) is False
+        router.assert_not_called()
+
+    def test_fetches_bars_when_not_injected(self):
+        now = datetime.now(timezone.utc).timestamp()
+        position = {"symbol": "AAA", "current_price": 10.0, "entry_price": 10.0, "entry_timestamp": now}
+        with patch("trader.risk_model._get_price_router") as router:
+            router.return_value.get_aggregates.return_value = []
+            assert should_exit(position) is False
+        router.return_value.get_aggregates.assert_called_once_with("AAA", window=120)
+
+
+class TestShouldExitNowTs:
+    def test_time_stop_uses_supplied_clock(self):
+        position = {"symbol": "AAA", "current_price": 10.0, "entry_price": 10.0, "entry_timestamp": 1_000.0}
+        with patch("trader.risk_model.passes_exit_filter", return_value=False):
+            assert should_exit(position, bars=[], now_ts=1_000.0 + 60) is False
+            assert should_exit(position, bars=[], now_ts=1_000.0 + 10 * 86400) is True
+
+
+class TestPositionView:
+    def test_dict_overrides_are_read(self):
+        position = {
+            "symbol": "AAA",
+            "current_price": 10.3,
+            "entry_price": 10.0,
+            "entry_timestamp": 1_000.0,
+            "take_profit_pct": 0.04,
+        }
+        view = risk_model._position_view(position)
+        assert view.symbol == "AAA"
+        assert view.take_profit_pct == 0.04
+        # A 3% gain clears the default take-profit but not the per-position 4%.
+        with patch("trader.risk_model.passes_exit_filter", return_value=False):
+            assert should_exit(position, bars=[], now_ts=1_000.0 + 60) is False
+
+    def test_attribute_position_uses_defaults(self):
+        class Position:
+            symbol = "AAA"
+            current_price = 10.0
+            entry_price = 10.0
+            entry_timestamp = 1_000.0
+            take_profit_pct = 0.5
+
+        view = risk_model._position_view(Position())
+        assert view.symbol == "AAA"
+        assert view.take_profit_pct is None
+        with patch("trader.risk_model.passes_exit_filter", return_value=False):
+            assert should_exit(Position(), bars=[], now_ts=1_000.0 + 60) is False
+
+
+class TestReloadSettings:
+    def test_refreshes_hoisted_exit_defaults(self):
+        original = risk_model.settings.crash_max_hold_minutes
+        try:
+            with patch.object(risk_model.settings, "crash_max_hold_minutes", 5):
+                risk_model.reload_settings()
+                assert risk_model._EXIT_MAX_MINUTES[1] == 5
+        finally:
+            risk_model.reload_settings()
+        assert risk_model._EXIT_MAX_MINUTES[1] == original
+
+
+class TestForceExitOnError:
+    def setup_method(self):
+        risk_model._exit_error_counts.clear()
+
+    def test_second_error_forces_exit(self):
+        with patch("trader.risk_model.time.monotonic", side_effect=[100.0, 110.0]):
+            assert risk_model._should_force_exit_on_error("AAA") is False
+            assert risk_model._should_force_exit_on_error("AAA") is True
+        assert "AAA" not in risk_model._exit_error_counts
+
+    def test_count_resets_after_quiet_period(self):
+        reset = risk_model._EXIT_ERROR_RESET_SECONDS
+        with patch("trader.risk_model.time.monotonic", side_effect=[100.0, 100.0 + reset + 1]):
+            assert risk_model._should_force_exit_on_error("AAA") is False
+            assert risk_model._should_force_exit_on_error("AAA") is False
+
+    def test_missing_symbol_always_exits(self):
+        assert risk_model._should_force_exit_on_error(None) is True
+
+
+class TestCoerceEntryTs:
+    def test_float_passthrough(self):
+        assert _coerce_entry_ts({"entry_timestamp": 123.5}) == 123.5
+
+    def test_iso_open_date_leaves_position_unchanged(self):
+        position = {"open_date": "2026-02-16T14:30:00Z", "entered_at": "2026-02-16T14:30:00"}
+        snapshot = dict(position)
+        expected = datetime(2026, 2, 16, 14, 30, tzinfo=timezone.utc).timestamp()
+        assert _coerce_entry_ts(position) == expected
+        assert _coerce_entry_ts({"entry_timestamp": "1700000000"}) == 1_700_000_000.0
+        assert _coerce_entry_ts({"entered_at": datetime(2026, 2, 16, 14, 30)}) == expected
+        assert position == snapshot
+
+    def test_missing_is_none(self):
+        assert _coerce_entry_ts({}) is None
+
+    def test_fixed_width_fast_path_matches_fromisoformat(self):
+        for text in ("2026-02-16T14:30:05Z", "1999-12-31T23:59:59Z"):
+            expected = datetime.fromisoformat(text.replace("Z", "+00:00")).timestamp()
+            assert risk_model._parse_alpaca_iso(text) == expected
+            assert _coerce_entry_ts({"entered_at": text}) == expected
+
+    def test_fractional_seconds_use_general_parser(self):
+        position = {"open_date": "2026-02-16T14:30:05.250Z"}
+        assert _coerce_entry_ts(position) == datetime(2026, 2, 16, 14, 30, 5, 250000, tzinfo=timezone.utc).timestamp()
+
+    def test_garbage_raises(self):
+        with pytest.raises(ValueError):
+            _coerce_entry_ts({"entry_timestamp": "not-a-time"})
+
+
+def _bars_frame(n=30, start=1_000.0, base=10.0):
+    rows = []
+    for i in range(n):
+        price = base + i * 0.05
+        rows.append(
+            {"timestamp": start + 300 * i, "open": price, "high": price + 0.1, "low": price - 0.1, "close": price, "volume": 1}
+        )
+    return pd.DataFrame(rows)
+
+
+class TestTrailingStopCache:
+    def test_unchanged_bars_reuse_atr(self):
+        frame = _bars_frame()
+        with patch("trader.risk_model._trail_inputs_cache", {}), patch(
+            "trader.risk_model.compute_atr_np", wraps=risk_model.compute_atr_np
+        ) as atr:
+            first = _trailing_stop_from_bars(frame, 10.0, 1_000.0, False, symbol="AAA")
+            second = _trailing_stop_from_bars(frame, 10.0, 1_000.0, False, symbol="AAA")
+            assert first == second and first is not None
+            assert atr.call_count == 1
+            updated = frame.copy()
+            updated.loc[updated.index[-1], "high"] += 1.0
+            _trailing_stop_from_bars(updated, 10.0, 1_000.0, False, symbol="AAA")
+            assert atr.call_count == 2
+
+    def test_reentry_does_not_reuse_previous_trade(self):
+        frame = _bars_frame()
+        with patch("trader.risk_model._trail_inputs_cache", {}) as cache, patch(
+            "trader.risk_model.compute_atr_np", wraps=risk_model.compute_atr_np
+        ) as atr:
+            _trailing_stop_from_bars(frame, 10.0, 1_000.0, False, symbol="AAA")
+            # Same bars and entry time, new entry price: the previous trade's inputs are not reused.
+            reentered = _trailing_stop_from_bars(frame, 11.0, 1_000.0, False, symbol="AAA")
+            assert atr.call_count == 2
+            assert cache["AAA"][0][5] == 11.0
+        with patch("trader.risk_model._trail_inputs_cache", {}):
+            fresh = _trailing_stop_from_bars(frame, 11.0, 1_000.0, False, symbol="AAA")
+        assert reentered == fresh
+
+    def test_closed_symbols_are_dropped(self):
+        frame = _bars_frame()
+        with patch("trader.risk_model._trail_inputs_cache", {}) as cache:
+            for symbol in ("AAA", "BBB", "CCC"):
+                _trailing_stop_from_bars(frame, 10.0, 1_000.0, False, symbol=symbol)
+            risk_model.discard_trailing_state("AAA")
+            assert set(cache) == {"BBB", "CCC"}
+            risk_model.prune_trailing_state(["CCC", "DDD"])
+            assert set(cache) == {"CCC"}
+
+
+class TestTrailingStopNumpy:
+    def test_matches_pandas_reference(self):
+        frame = _bars_frame(n=40)
+        stop = _trailing_stop_from_bars(frame, 10.0, 1_000.0 + 300 * 5, False)
+        kept = frame[frame["timestamp"] >= 1_000.0 + 300 * 5]
+        atr = float(compute_atr(kept, window=14).iloc[-1])
+        distance = min(max(atr * risk_model.settings.atr_multiplier * 0.6, 10.0 * 0.007), 10.0 * 0.08)
+        assert stop == pytest.approx(float(kept["high"].max()) - distance)
+
+    def test_datetime_timestamps_compare_to_epoch_entry(self):
+        frame = _bars_frame(n=40)
+        as_datetimes = frame.assign(timestamp=pd.to_datetime(frame["timestamp"], unit="s", utc=True))
+        entry_ts = 1_000.0 + 300 * 5
+        assert _trailing_stop_from_bars(as_datetimes, 10.0, entry_ts, False) == _trailing_stop_from_bars(
+            frame, 10.0, entry_ts, False
+        )
+
+
 class TestCoercePct:
     def test_valid_pct(self):
         assert _coerce_pct(0.5, 0.1) == 0.5
@@ -112,3 +326,24 @@ class TestCoerceMinutes:
 
     def test_float_truncated(self):
         assert _coerce_minutes(45.9, 90) == 45
+
+
+class TestBracketMultipliers:
+    def test_matches_price_helpers(self):
+        for crash in (False, True):
+            sl_mult, tp_mult = bracket_multipliers(crash)
+            assert round(123.45 * sl_mult, 2) == stop_loss_price(123.45, crash_mode=crash)
+            assert round(123.45 * tp_mult, 2) == take_profit_price(123.45, crash_mode=crash)
+
+
+class TestComputeBrackets:
+    def test_pcts_and_defaults(self):
+        stops, targets = compute_brackets(
+            np.array([100.0, 100.0]), np.array([0.02, np.nan]), np.array([np.nan, 0.05]), crash_mode=False
+        )
+        assert stops.tolist() == [98.0, stop_loss_price(100.0)]
+        assert targets.tolist() == [take_profit_price(100.0), 105.0]
+
+    def test_out_of_range_pct_uses_default(self):
+        stops, _ = compute_brackets(np.array([50.0]), np.array([1.5]), np.array([np.nan]), crash_mode=True)
+        assert stops.tolist() == [stop_loss_price(50.0, crash_mode=True)]
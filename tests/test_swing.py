@@ -0,0 +1,67 @@
+"""Tests for strategy.swing."""
+
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from strategy import swing
+from strategy.swing import generate_swing_signals
+
+
+class _SMA:
+    def __init__(self, close: pd.Series, window: int):
+        self._values = close.rolling(window).mean()
+
+    def sma_indicator(self) -> pd.Series:
+        return self._values
+
+
+class _RSI:
+    def __init__(self, close: pd.Series, window: int):
+        self._close = close
+
+    def rsi(self) -> pd.Series:
+        return pd.Series(50.0, index=self._close.index)
+
+
+@pytest.fixture(autouse=True)
+def _indicators():
+    # conftest may stand in a MagicMock for ``ta``; use plain pandas indicators.
+    with patch.object(swing, "SMAIndicator", _SMA), patch.object(swing, "RSIIndicator", _RSI):
+        yield
+
+
+def _trending_bars(count: int = 60, growth: float = 0.04) -> list[dict]:
+    bars = []
+    close = 10.0
+    for idx in range(count):
+        close *= 1.0 + growth
+        bars.append(
+            {"timestamp": float(idx), "open": close, "high": close * 1.01, "low": close * 0.99, "close": close, "volume": 1e6}
+        )
+    return bars
+
+
+class TestGenerateSwingSignals:
+    def test_sentiment_lookups_stop_at_max_signals(self):
+        symbols = [f"S{idx}" for idx in range(10)]
+        bars = {symbol: _trending_bars() for symbol in symbols}
+        bars["SHORT"] = _trending_bars(count=10)
+        calls = []
+
+        def lookup(symbol):
+            calls.append(symbol)
+            return 0.0
+
+        signals = generate_swing_signals(["SHORT", *symbols], bars, sentiment_lookup=lookup, max_signals=3)
+
+        assert [signal["symbol"] for signal in signals] == ["S0", "S1", "S2"]
+        assert all(signal["reason"] == "swing_trend" for signal in signals)
+        # Short histories are dropped before sentiment; the scan stops at the cap.
+        assert calls == ["S0", "S1", "S2"]
+
+    def test_no_candidates(self):
+        calls = []
+        assert generate_swing_signals(["AAA"], {}, sentiment_lookup=calls.append) == []
+        assert calls == []
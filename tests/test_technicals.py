@@ -0,0 +1,32 @@
+"""Tests for strategy.technicals."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategy.technicals import _vwap_last, compute_vwap
+
+
+class TestVwapLast:
+    @pytest.mark.parametrize(
+        "close, volume",
+        [
+            ([10.0, 11.0, 12.0, 13.0], [100.0, np.nan, 300.0, 400.0]),
+            ([10.0, np.nan, 12.0, 13.0], [100.0, 200.0, 300.0, 400.0]),
+            ([10.0, 11.0, 12.0, 13.0], [100.0, 200.0, 300.0, 400.0]),
+        ],
+    )
+    def test_matches_compute_vwap_with_nan_bars(self, close, volume):
+        expected = compute_vwap(pd.DataFrame({"close": close, "volume": volume})).iloc[-1]
+        result = _vwap_last(np.array(close), np.array(volume))
+        assert np.isfinite(result)
+        assert result == pytest.approx(float(expected))
+
+    def test_nan_volume_mid_session_is_skipped(self):
+        result = _vwap_last(np.array([10.0, 20.0, 30.0]), np.array([1.0, np.nan, 1.0]))
+        assert result == pytest.approx(20.0)
+
+    def test_undefined_cases_are_nan(self):
+        assert np.isnan(_vwap_last(np.array([10.0, 11.0]), np.array([100.0, np.nan])))
+        assert np.isnan(_vwap_last(np.array([10.0, 11.0]), np.array([0.0, 0.0])))
+        assert np.isnan(_vwap_last(np.array([]), np.array([])))
@@ -0,0 +1,56 @@
+"""Tests for trader.trade_logger."""
+
+import json
+from unittest.mock import patch
+
+from trader import trade_logger
+from trader.trade_logger import close_trade_log, flush_trade_log, log_trade
+
+
+class TestLogTrade:
+    def test_events_are_appended_in_order(self, tmp_path):
+        path = tmp_path / "trade_log.jsonl"
+        with patch.object(trade_logger, "LOG_PATH", path):
+            for idx in range(5):
+                log_trade({"symbol": "AAPL", "seq": idx})
+            flush_trade_log()
+
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [row["seq"] for row in rows] == list(range(5))
+        assert all("timestamp" in row for row in rows)
+
+    def test_unserializable_event_does_not_drop_batch(self, tmp_path):
+        path = tmp_path / "trade_log.jsonl"
+        with patch.object(trade_logger, "LOG_PATH", path):
+            log_trade({"symbol": "AAPL", "bad": object()})
+            log_trade({"symbol": "MSFT"})
+            flush_trade_log()
+
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [row["symbol"] for row in rows] == ["MSFT"]
+
+    def test_handle_stays_open_across_batches(self, tmp_path):
+        path = tmp_path / "trade_log.jsonl"
+        with patch.object(trade_logger, "LOG_PATH", path):
+            log_trade({"symbol": "AAPL"})
+            flush_trade_log()
+            handle = trade_logger._handle
+            log_trade({"symbol": "MSFT"})
+            flush_trade_log()
+            assert trade_logger._handle is handle
+            close_trade_log()
+        assert trade_logger._handle is None
+        assert len(path.read_text().splitlines()) == 2
+
+
+class TestDumpsLine:
+    def test_stdlib_fallback_matches_orjson(self):
+        payload = {"symbol": "AAPL", "qty": 3, "price": 10.5}
+        # orjson is a declared requirement, so the fast path is the one deployments run.
+        assert trade_logger.orjson is not None
+        fast = trade_logger._dumps_line(payload)
+        assert fast == trade_logger.orjson.dumps(payload) + b"\n"
+        with patch.object(trade_logger, "orjson", None):
+            slow = trade_logger._dumps_line(payload)
+        assert fast.endswith(b"\n") and slow.endswith(b"\n")
+        assert json.loads(fast) == json.loads(slow) == payload
@@ -0,0 +1,278 @@
+"""Tests for the universe_builder disk cache."""
+
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.price_router import PriceRouter
+from strategy.technicals import compute_atr
+from universe import universe_builder
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    path = tmp_path / ".cache" / "universe.json"
+    with patch.object(universe_builder, "UNIVERSE_CACHE_PATH", path), patch.object(
+        universe_builder, "_universe_today", None
+    ):
+        yield path
+
+
+class TestFilterSymbols:
+    def test_keeps_valid_tickers_in_order(self):
+        symbols = ["AAPL", "brk.b", "BF-B", "BAD SYM", "", None, "X\n", "SPY"]
+        assert universe_builder._filter_symbols(symbols) == ["AAPL", "brk.b", "BF-B", "SPY"]
+
+    def test_repeat_lists_are_memoized(self):
+        universe_builder._valid_symbols.cache_clear()
+        universe_builder._filter_symbols(["AAPL", "MSFT"])
+        universe_builder._filter_symbols(["AAPL", "MSFT"])
+        assert universe_builder._valid_symbols.cache_info().hits == 1
+
+
+class TestLiquidityPrefilter:
+    def test_scores_skip_invalid_sessions(self):
+        bars = _daily_bars(count=6)
+        bars[5] = dict(bars[5], volume=0)
+        bars[4] = dict(bars[4], close=None)
+        bars[3] = dict(bars[3], close=20.0)
+        bars.reverse()
+        columns = PriceRouter.bars_to_columns(bars)
+        prices, volume = universe_builder._bars_matrix([columns], 6)
+        close = prices[:, :, 0]
+        valid = (close > 0) & (volume > 0)
+        # Sessions 4 and 5 are dropped, leaving closes 10, 10, 20 as the last three.
+        means = universe_builder._trailing_valid_mean(close * volume, valid, 3)
+        assert means[0] == pytest.approx(40_000_000.0 / 3)
+        assert np.isnan(universe_builder._trailing_valid_mean(close * volume, valid, 5)[0])
+
+    def test_keeps_top_symbols_in_candidate_order(self):
+        bars = {
+            "LOW": PriceRouter.bars_to_columns(_daily_bars(volume=1_000.0)),
+            "HIGH": PriceRouter.bars_to_columns(_daily_bars(volume=3_000.0)),
+            "MID": PriceRouter.bars_to_columns(_daily_bars(volume=2_000.0)),
+            "NONE": PriceRouter.bars_to_columns(_daily_bars(count=2)),
+        }
+        with patch.object(universe_builder.settings, "min_volume_history_days", 3):
+            kept = universe_builder._liquidity_prefilter(["LOW", "HIGH", "MID", "NONE", "MISSING"], bars, 2)
+        assert kept == ["HIGH", "MID"]
+
+
+class TestCsvUniverse:
+    def test_unchanged_file_is_parsed_once(self, tmp_path):
+        path = tmp_path / "universe.csv"
+        path.write_text("symbol\naapl\nmsft\n")
+        universe_builder._csv_universe_cached.cache_clear()
+        loader = universe_builder.load_universe_from_csv
+        with patch.object(universe_builder, "load_universe_from_csv", wraps=loader) as load:
+            assert universe_builder._csv_universe(path) == ["AAPL", "MSFT"]
+            assert universe_builder._csv_universe(str(path)) == ["AAPL", "MSFT"]
+            assert load.call_count == 1
+            path.write_text("symbol\nspy\n")
+            os.utime(path, ns=(path.stat().st_mtime_ns + 10**9,) * 2)
+            assert universe_builder._csv_universe(path) == ["SPY"]
+            assert load.call_count == 2
+
+    def test_missing_file_returns_empty(self, tmp_path):
+        assert universe_builder._csv_universe(tmp_path / "absent.csv") == []
+
+
+class TestUniverseCache:
+    def test_build_result_is_reused(self, cache_path):
+        with patch.object(universe_builder.settings, "universe_fallback_only", False), patch.object(
+            universe_builder, "_load_candidates", return_value=["AAPL", "MSFT"]
+        ), patch.object(universe_builder, "_build_universe_from_candidates", return_value=["AAPL"]) as build:
+            assert universe_builder.get_universe() == ["AAPL"]
+            assert universe_builder.get_universe() == ["AAPL"]
+        assert build.call_count == 1
+        assert cache_path.exists()
+
+    def test_same_day_calls_skip_candidate_load(self, cache_path):
+        with patch.object(universe_builder.settings, "universe_fallback_only", False), patch.object(
+            universe_builder, "_load_candidates", return_value=["AAPL", "MSFT"]
+        ) as load, patch.object(universe_builder, "_build_universe_from_candidates", return_value=["AAPL"]):
+            first = universe_builder.get_universe()
+            first.append("MUTATED")
+            assert universe_builder.get_universe() == ["AAPL"]
+            assert load.call_count == 1
+            universe_builder.invalidate_universe_cache()
+            assert not cache_path.exists()
+            assert universe_builder.get_universe() == ["AAPL"]
+            assert load.call_count == 2
+
+    def test_expired_cache_is_ignored(self, cache_path):
+        key = universe_builder._universe_cache_key(["AAPL"])
+        universe_builder._write_universe_cache(key, ["AAPL"], "2026-03-02")
+        stale = time.time() - universe_builder.UNIVERSE_CACHE_TTL_SECONDS - 1
+        os.utime(cache_path, (stale, stale))
+        assert universe_builder._read_universe_cache(key, "2026-03-02") is None
+
+    def test_candidate_change_invalidates(self, cache_path):
+        universe_builder._write_universe_cache(universe_builder._universe_cache_key(["AAPL"]), ["AAPL"], "2026-03-02")
+        assert universe_builder._read_universe_cache(universe_builder._universe_cache_key(["AAPL"]), "2026-03-02") == [
+            "AAPL"
+        ]
+        assert universe_builder._read_universe_cache(universe_builder._universe_cache_key(["MSFT"]), "2026-03-02") is None
+
+    def test_previous_day_cache_is_rebuilt(self, cache_path):
+        candidates = ["AAPL", "MSFT"]
+        # Written yesterday afternoon: inside the TTL, but from another trading date.
+        universe_builder._write_universe_cache(universe_builder._universe_cache_key(candidates), ["MSFT"], "2000-01-01")
+        with patch.object(universe_builder.settings, "universe_fallback_only", False), patch.object(
+            universe_builder, "_load_candidates", return_value=candidates
+        ), patch.object(universe_builder, "_build_universe_from_candidates", return_value=["AAPL"]) as build:
+            assert universe_builder.get_universe() == ["AAPL"]
+        assert build.call_count == 1
+
+    def test_corrupt_cache_is_ignored(self, cache_path):
+        cache_path.parent.mkdir(parents=True)
+        cache_path.write_text("{not json")
+        assert universe_builder._read_universe_cache("key", "2026-03-02") is None
+
+
+def _daily_bars(count=20, close=10.0, volume=1_000_000.0, spread=0.3):
+    return [
+        {"timestamp": 1_700_000_000 + day * 86400, "close": close, "high": close + spread, "low": close - spread, "volume": volume}
+        for day in range(count)
+    ]
+
+
+@pytest.fixture
+def screen_settings():
+    with patch.object(universe_builder.settings, "min_volume_history_days", 3), patch.object(
+        universe_builder.settings, "min_dollar_volume", 1_000_000.0
+    ), patch.object(universe_builder.settings, "min_price", 2.0), patch.object(
+        universe_builder.settings, "max_price", 80.0
+    ), patch.object(universe_builder.settings, "allow_partial_atr", True):
+        yield
+
+
+class TestBuildUniverseFromCandidates:
+    def test_parallel_filter_keeps_candidate_order(self, screen_settings):
+        symbols = [f"S{idx}" for idx in range(40)]
+        bars = {symbol: _daily_bars() for symbol in symbols}
+
+        with patch.object(universe_builder.settings, "universe_liquidity_top_n", 0), patch.object(
+            universe_builder.settings, "max_universe_size", 100
+        ), patch.object(universe_builder.settings, "universe_filter_workers", 8), patch.object(
+            universe_builder.settings, "allow_partial_fundamentals", True
+        ), patch.object(
+            universe_builder._get_price_router(), "get_daily_bars_batch", return_value=bars
+        ), patch.object(universe_builder, "_get_market_cap", return_value=None):
+            result = universe_builder._build_universe_from_candidates(symbols)
+
+        assert result == symbols
+        assert universe_builder._skip_counts[universe_builder._SKIP_REASON_INDEX["skip_missing_fundamentals"]] == len(symbols)
+
+    def test_market_cap_lookups_are_serial(self, screen_settings):
+        symbols = [f"S{idx}" for idx in range(12)]
+        bars = {symbol: _daily_bars() for symbol in symbols}
+        lookups = []
+
+        def market_cap(symbol):
+            lookups.append((symbol, threading.current_thread()))
+            return None
+
+        with patch.object(universe_builder.settings, "universe_liquidity_top_n", 0), patch.object(
+            universe_builder.settings, "max_universe_size", 100
+        ), patch.object(universe_builder.settings, "universe_filter_workers", 8), patch.object(
+            universe_builder.settings, "allow_partial_fundamentals", True
+        ), patch.object(
+            universe_builder._get_price_router(), "get_daily_bars_batch", return_value=bars
+        ), patch.object(universe_builder, "_get_market_cap", side_effect=market_cap):
+            universe_builder._build_universe_from_candidates(symbols)
+
+        assert [symbol for symbol, _ in lookups] == symbols
+        assert {thread for _, thread in lookups} == {threading.current_thread()}
+
+
+class TestScreenDailyBars:
+    def test_passing_symbol_reports_average_dollar_volume(self, screen_settings):
+        # A missing volume inside the lookback is skipped, not averaged as zero.
+        bars = _daily_bars()
+        bars[-1] = dict(bars[-1], volume=None)
+        result = universe_builder._screen_daily_bars(["AAA"], [PriceRouter.bars_to_columns(bars)])
+        assert result == [("AAA", pytest.approx(10_000_000.0))]
+
+    def test_first_failing_screen_is_logged(self, screen_settings):
+        symbols = ["THIN", "CHEAP", "CALM", "NEW", "OK"]
+        bars = [
+            _daily_bars(volume=10.0),
+            _daily_bars(close=1.0, volume=5_000_000.0, spread=0.03),
+            _daily_bars(spread=0.01),
+            _daily_bars(count=5),
+            _daily_bars(),
+        ]
+        with patch.object(universe_builder, "_log_skip") as log_skip:
+            result = universe_builder._screen_daily_bars(symbols, [PriceRouter.bars_to_columns(rows) for rows in bars])
+        assert [symbol for symbol, _ in result] == ["NEW", "OK"]
+        reasons = {call.args[0]: call.args[1] for call in log_skip.call_args_list}
+        assert reasons == {
+            "THIN": "skip_volume_history",
+            "CHEAP": "skip_price_range",
+            "CALM": "skip_atr",
+            "NEW": "skip_atr",
+        }
+
+    def test_missing_atr_rejected_when_not_partial(self, screen_settings):
+        with patch.object(universe_builder.settings, "allow_partial_atr", False):
+            bars = PriceRouter.bars_to_columns(_daily_bars(count=5))
+            assert universe_builder._screen_daily_bars(["NEW"], [bars]) == []
+
+    def test_atr_matches_compute_atr(self):
+        bars = _daily_bars()
+        for idx, row in enumerate(bars):
+            row["high"] += 0.05 * (idx % 4)
+            row["close"] += 0.1 * (idx % 3)
+        frame = pd.DataFrame(bars)
+        expected = float(compute_atr(frame, window=14).iloc[-1]) / frame["close"].iloc[-1]
+        with patch.object(universe_builder, "_log_skip") as log_skip, patch.object(
+            universe_builder, "ATR_PCT_RANGE", (1.0, 2.0)
+        ):
+            universe_builder._screen_daily_bars(["AAA"], [PriceRouter.bars_to_columns(bars)])
+        assert log_skip.call_args.args[2] == f"ATR% {expected:.4f} outside range [1.0, 2.0]"
+
+
+@pytest.fixture
+def market_cap_cache(tmp_path):
+    path = tmp_path / ".cache" / "market_caps.json"
+    with patch.object(universe_builder, "MARKET_CAP_CACHE_PATH", path), patch.object(
+        universe_builder, "_market_caps", None
+    ), patch.object(universe_builder, "_market_caps_dirty", False):
+        yield path
+
+
+class TestMarketCapCache:
+    def test_lookup_is_persisted_and_reused(self, market_cap_cache):
+        provider = MagicMock()
+        provider.get_market_cap.return_value = 1_000_000.0
+        with patch.object(universe_builder, "_market_cap_providers", return_value=(provider,)):
+            assert universe_builder._get_market_cap("AAA") == 1_000_000.0
+            universe_builder._save_market_caps()
+            # A fresh process reloads the value from disk without a provider call.
+            universe_builder._market_caps = None
+            assert universe_builder._get_market_cap("AAA") == 1_000_000.0
+        provider.get_market_cap.assert_called_once_with("AAA")
+        assert market_cap_cache.exists()
+
+    def test_expired_entry_is_refetched(self, market_cap_cache):
+        provider = MagicMock()
+        provider.get_market_cap.return_value = 2_000_000.0
+        stale = time.time() - universe_builder.MARKET_CAP_CACHE_TTL_SECONDS - 1
+        universe_builder._market_caps = {"AAA": (1.0, stale)}
+        with patch.object(universe_builder, "_market_cap_providers", return_value=(provider,)):
+            assert universe_builder._get_market_cap("AAA") == 2_000_000.0
+        provider.get_market_cap.assert_called_once_with("AAA")
+
+    def test_missing_value_is_not_cached(self, market_cap_cache):
+        provider = MagicMock()
+        provider.get_market_cap.return_value = 0.0
+        with patch.object(universe_builder, "_market_cap_providers", return_value=(provider,)):
+            assert universe_builder._get_market_cap("AAA") is None
+            universe_builder._save_market_caps()
+        assert not market_cap_cache.exists()
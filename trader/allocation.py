@@ -1,12 +1,36 @@
 import logging
 import math
 import os
+from functools import lru_cache
+from operator import itemgetter, methodcaller
+
+import numpy as np
 
 from data.price_router import PriceRouter
 
 logger = logging.getLogger(__name__)
-price_router = PriceRouter()
-DAILY_BUDGET = float(os.getenv("DAILY_BUDGET_USD", 10000))
+CRASH_MAX_POSITIONS = 3
+_get_symbol = itemgetter("symbol")
+_get_type = methodcaller("get", "type")
+
+# Per-mode sizing constants:
+# (strength base, strength slope, high vol_ratio, high-vol multiplier, low vol_ratio, low-vol boost, reversal multiplier)
+_SIZING_PARAMS = {
+    True: (0.7, 0.4, 1.8, 0.6, 0.8, 1.2, 0.75),
+    False: (0.8, 0.6, 1.5, 0.5, 0.7, 1.3, 0.6),
+}
+
+
+@lru_cache(maxsize=1)
+def _get_price_router() -> PriceRouter:
+    return PriceRouter()
+
+
+@lru_cache(maxsize=1)
+def _daily_budget() -> float:
+    """DAILY_BUDGET_USD, read once; call ``_daily_budget.cache_clear()`` to re-read."""
+
+    return float(os.getenv("DAILY_BUDGET_USD", "10000"))
 
 
 def _signal_strength(signal) -> float:
@@ -26,87 +50,208 @@ def _signal_strength(signal) -> float:
     return 0.0
 
 
+def _signal_symbols(final_signals) -> tuple[list, list]:
+    """(symbols, signal types), read without per-signal type checks for all-dict input."""
+
+    try:
+        return list(map(_get_symbol, final_signals)), list(map(_get_type, final_signals))
+    except (TypeError, AttributeError):
+        # Bare symbols, or a mix of symbols and signal dicts.
+        symbols = [signal["symbol"] if isinstance(signal, dict) else signal for signal in final_signals]
+        signal_types = [signal.get("type") if isinstance(signal, dict) else "momentum" for signal in final_signals]
+        return symbols, signal_types
+
+
+def _signal_features(signal) -> tuple[float, float, bool, float]:
+    """(strength, vol_ratio, is_reversal, size_multiplier) for one signal."""
+
+    if not isinstance(signal, dict):
+        return 0.0, 1.0, False, 1.0
+    vol_ratio = float(signal.get("vol_ratio", 1.0))
+    try:
+        size_multiplier = float(signal.get("size_multiplier", 1.0))
+    except (TypeError, ValueError):
+        size_multiplier = 1.0
+    if not math.isfinite(size_multiplier) or size_multiplier <= 0:
+        size_multiplier = 1.0
+    return _signal_strength(signal), vol_ratio, signal.get("type") == "reversal", size_multiplier
+
+
+def _size_signals(
+    strengths: np.ndarray,
+    vol_ratios: np.ndarray,
+    is_reversal: np.ndarray,
+    size_multipliers: np.ndarray,
+    base_allocation: float,
+    crash_mode: bool,
+) -> np.ndarray:
+    """Target notional per signal before the remaining-budget cap."""
+
+    strength_base, strength_slope, high_vol, high_vol_mult, low_vol, low_vol_boost, reversal_mult = _SIZING_PARAMS[
+        bool(crash_mode)
+    ]
+    # vol_ratio bucket: 0 = normal, 1 = high (scale down), 2 = low (reset to the capped base size)
+    vol_bucket = (vol_ratios > high_vol).astype(np.intp) + 2 * (vol_ratios < low_vol)
+    vol_scale = np.array([1.0, high_vol_mult, 0.0])
+    vol_offset = np.array([0.0, 0.0, min(base_allocation, base_allocation * low_vol_boost)])
+    type_scale = np.array([1.0, reversal_mult])
+
+    sizes = base_allocation * (strength_base + strength_slope * strengths)
+    sizes = sizes * vol_scale[vol_bucket] + vol_offset[vol_bucket]
+    sizes = sizes * type_scale[is_reversal.astype(np.intp)]
+    return sizes * np.clip(size_multipliers, 0.2, 1.5)
+
+
+def _greedy_shares(
+    sizes: np.ndarray, price_arr: np.ndarray, budget: float, max_positions: int | None
+) -> np.ndarray | None:
+    """Shares per signal from the sequential budget walk, or None if it needs the loop.
+
+    Exact as long as no allocated signal's target size is capped by the
+    remaining budget: ``np.subtract.accumulate`` subtracts the notionals in
+    order, so the running budget matches ``budget_remaining -= notional`` bit
+    for bit. Signals past the loop's stopping point (budget exhausted or
+    position cap reached) get zero shares. ``price_arr`` holds 0 for signals
+    without a usable price.
+    """
+
+    valid = price_arr > 0
+    ratio = np.divide(sizes, price_arr, out=np.zeros_like(sizes), where=valid)
+    # sizes and prices are non-negative here, so truncation equals floor
+    shares = np.trunc(ratio).astype(np.int64)
+    notionals = shares * price_arr
+    remaining = np.subtract.accumulate(np.concatenate(([budget], notionals)))
+    before, after = remaining[:-1], remaining[1:]
+
+    allocated = shares > 0
+    end = len(shares)
+    exhausted = np.flatnonzero(allocated & (after <= 0))
+    if len(exhausted):
+        end = int(exhausted[0]) + 1
+    if max_positions is not None:
+        full = np.flatnonzero(np.cumsum(allocated) >= max_positions)
+        if len(full):
+            end = min(end, int(full[0]) + 1)
+    capped = np.flatnonzero(allocated[:end] & ((sizes[:end] > before[:end]) | (notionals[:end] > before[:end])))
+    if len(capped):
+        return None
+    shares[end:] = 0
+    return shares
+
+
 def allocate_positions(final_signals, crash_mode: bool = False):
     if not final_signals:
         logger.warning("No signals to allocate capital")
         return {}
 
+    daily_budget = _daily_budget()
     if crash_mode:
-        max_positions = 3
-        budget_remaining = DAILY_BUDGET * 0.80
-        base_allocation = budget_remaining / max_positions
+        budget_remaining = daily_budget * 0.80
+        base_allocation = budget_remaining / CRASH_MAX_POSITIONS
     else:
-        budget_remaining = DAILY_BUDGET
-        base_allocation = DAILY_BUDGET / 3
+        budget_remaining = daily_budget
+        base_allocation = daily_budget / 3
+    price_router = _get_price_router()
+
+    symbols, signal_types = _signal_symbols(final_signals)
+    strengths, vol_ratios, is_reversal, size_multipliers = zip(*map(_signal_features, final_signals))
+    sizes = _size_signals(
+        np.asarray(strengths, dtype=np.float64),
+        np.asarray(vol_ratios, dtype=np.float64),
+        np.asarray(is_reversal, dtype=bool),
+        np.asarray(size_multipliers, dtype=np.float64),
+        base_allocation,
+        crash_mode,
+    )
+    try:
+        prices = price_router.get_prices(symbols)
+    except Exception as exc:  # pragma: no cover - network guard
+        logger.warning("Batch price lookup failed; falling back to per-symbol prices: %s", exc)
+        prices = None
 
     allocations = {}
-    for signal in final_signals:
-        if crash_mode and len(allocations) >= 3:
+    set_allocation = allocations.__setitem__
+    log_info = logger.isEnabledFor(logging.INFO)
+
+    cheapest_after = None
+    if prices is not None:
+        price_arr = np.array([prices.get(symbol) or 0.0 for symbol in symbols], dtype=np.float64)
+        price_arr[~(price_arr > 0)] = 0.0
+        planned = None
+        # Repeated symbols overwrite each other in the loop; leave those to it.
+        if len(set(symbols)) == len(symbols):
+            max_positions = CRASH_MAX_POSITIONS if crash_mode else None
+            planned = _greedy_shares(sizes, price_arr, budget_remaining, max_positions)
+        if planned is not None:
+            for symbol in symbols:
+                if prices.get(symbol) is None:
+                    logger.warning("Price unavailable for %s", symbol)
+            for idx in np.flatnonzero(planned):
+                symbol = symbols[idx]
+                shares = int(planned[idx])
+                price = prices[symbol]
+                set_allocation(symbol, shares)
+                if log_info:
+                    logger.info(
+                        "Allocating %s shares of %s (type=%s, price %.2f, budget %.2f, vol_ratio %.2f)",
+                        shares,
+                        symbol,
+                        signal_types[idx],
+                        price,
+                        shares * price,
+                        vol_ratios[idx],
+                    )
+            return allocations
+        # cheapest_after[i]: lowest known price among signals i onward, used to stop
+        # once the remaining budget cannot buy a single share of anything left.
+        cheapest_after = np.minimum.accumulate(np.where(price_arr > 0, price_arr, np.inf)[::-1])[::-1]
+
+    for idx, symbol in enumerate(symbols):
+        if crash_mode and len(allocations) >= CRASH_MAX_POSITIONS:
             logger.info("Crash mode: max positions reached")
             break
-        symbol = signal["symbol"] if isinstance(signal, dict) else signal
-        signal_type = signal.get("type") if isinstance(signal, dict) else "momentum"
-        vol_ratio = float(signal.get("vol_ratio", 1.0) if isinstance(signal, dict) else 1.0)
-        size_multiplier = 1.0
-        if isinstance(signal, dict):
+        if prices is not None:
+            price = prices.get(symbol)
+            if price is None:
+                logger.warning("Price unavailable for %s", symbol)
+                continue
+        else:
             try:
-                size_multiplier = float(signal.get("size_multiplier", 1.0))
-            except (TypeError, ValueError):
-                size_multiplier = 1.0
-        if not math.isfinite(size_multiplier) or size_multiplier <= 0:
-            size_multiplier = 1.0
+                price = price_router.get_price(symbol)
+            except Exception as exc:  # pragma: no cover - network guard
+                logger.warning("Price unavailable for %s: %s", symbol, exc)
+                continue
 
-        try:
-            price = price_router.get_price(symbol)
-        except Exception as exc:  # pragma: no cover - network guard
-            logger.warning("Price unavailable for %s: %s", symbol, exc)
-            continue
-
-        size = base_allocation
-        strength = _signal_strength(signal)
-        if crash_mode:
-            size *= 0.7 + (0.4 * strength)
-        else:
-            size *= 0.8 + (0.6 * strength)
-        if crash_mode:
-            if vol_ratio > 1.8:
-                size *= 0.6
-            elif vol_ratio < 0.8:
-                size = min(base_allocation, base_allocation * 1.2)
-            if signal_type == "reversal":
-                size *= 0.75
-        else:
-            if vol_ratio > 1.5:
-                size *= 0.5
-            elif vol_ratio < 0.7:
-                size = min(base_allocation, base_allocation * 1.3)
-            if signal_type == "reversal":
-                size *= 0.6
-        size *= min(max(size_multiplier, 0.2), 1.5)
-
-        size = min(size, budget_remaining)
-        shares = math.floor(size / price) if price > 0 else 0
+        size = min(float(sizes[idx]), budget_remaining)
+        # size and price are non-negative here, so truncation equals floor
+        shares = int(size / price) if price > 0 else 0
         if shares <= 0:
-            logger.info("Capital %.2f insufficient for %s (price %.2f)", size, symbol, price)
+            if log_info:
+                logger.info("Capital %.2f insufficient for %s (price %.2f)", size, symbol, price)
             continue
         notional = shares * price
         if notional > budget_remaining:
-            logger.info("Skipping %s: notional %.2f exceeds remaining budget %.2f", symbol, notional, budget_remaining)
+            if log_info:
+                logger.info("Skipping %s: notional %.2f exceeds remaining budget %.2f", symbol, notional, budget_remaining)
             continue
 
-        allocations[symbol] = shares
+        set_allocation(symbol, shares)
         budget_remaining -= notional
-        logger.info(
-            "Allocating %s shares of %s (type=%s, price %.2f, budget %.2f, vol_ratio %.2f)",
-            shares,
-            symbol,
-            signal_type,
-            price,
-            notional,
-            vol_ratio,
-        )
+        if log_info:
+            logger.info(
+                "Allocating %s shares of %s (type=%s, price %.2f, budget %.2f, vol_ratio %.2f)",
+                shares,
+                symbol,
+                signal_types[idx],
+                price,
+                notional,
+                vol_ratios[idx],
+            )
 
         if budget_remaining <= 0:
             logger.info("Budget exhausted; stopping allocations")
             break
+        if cheapest_after is not None and idx + 1 < len(symbols) and budget_remaining < cheapest_after[idx + 1]:
+            logger.info("Remaining budget %.2f below every remaining price; stopping allocations", budget_remaining)
+            break
     return allocations
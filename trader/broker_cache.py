@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+from typing import NamedTuple
+
+from core.cache import TTLCache
+
+# Account and positions snapshots are shared by execution, P&L and exit checks
+# for a few seconds, and dropped whenever an order or close changes them.
+BROKER_CACHE_TTL_SECONDS = int(float(os.getenv("BROKER_CACHE_TTL_SEC", "3")))
+_cache = TTLCache(default_ttl=BROKER_CACHE_TTL_SECONDS, max_size=8)
+
+
+class PositionLite(NamedTuple):
+    """Read-only position snapshot; numeric fields are floats, or None when absent."""
+
+    symbol: str
+    qty: float | None
+    avg_entry_price: float | None
+    current_price: float | None
+    held_for_orders: float | None
+    unrealized_pl: float | None
+
+    @classmethod
+    def from_fields(cls, get) -> "PositionLite":
+        """Build from ``get(field)`` over a raw payload dict or an SDK Position model."""
+
+        return cls(str(get("symbol") or ""), *(_as_float(get(field)) for field in cls._fields[1:]))
+
+
+def _as_float(value) -> float | None:
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def cached_call(key: str, fetch):
+    value = _cache.get(key)
+    if value is None:
+        value = fetch()
+        _cache.set(key, value)
+    return value
+
+
+def invalidate() -> None:
+    _cache.clear()
+
+
+def get_positions_raw(client) -> list[PositionLite]:
+    """Open positions as PositionLite, read from the raw /positions payload.
+
+    The raw read skips pydantic validation. Falls back to get_all_positions()
+    when the client has no raw GET; either way the result is PositionLite.
+    """
+
+    getter = getattr(client, "get", None)
+    raw = getter("/positions") if callable(getter) else None
+    if not isinstance(raw, list):
+        return [PositionLite.from_fields(lambda field, pos=pos: getattr(pos, field, None)) for pos in client.get_all_positions()]
+    return [PositionLite.from_fields(item.get) for item in raw]
+
+
+def get_account_cached(client):
+    return cached_call("account", client.get_account)
+
+
+def get_positions_cached(client) -> list[PositionLite]:
+    return cached_call("positions", lambda: get_positions_raw(client))
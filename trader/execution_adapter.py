@@ -2,36 +2,98 @@ from __future__ import annotations
 
 import logging
 import math
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Literal, TypedDict
 
-from alpaca.trading.enums import OrderClass, OrderSide, TimeInForce
-from alpaca.trading.requests import MarketOrderRequest, StopLossRequest, TakeProfitRequest
+from alpaca.common.exceptions import APIError
+from alpaca.trading.enums import OrderClass, OrderSide, QueryOrderStatus, TimeInForce
+from alpaca.trading.requests import GetOrdersRequest, MarketOrderRequest, StopLossRequest, TakeProfitRequest
 
 from core.config import get_settings
 from data.portfolio_state import (
     clear_entry_metadata,
     clear_entry_timestamp,
+    deferred_state_writes,
     set_entry_metadata,
     set_entry_timestamp,
 )
 from data.price_router import PriceRouter
+from trader.broker_cache import (
+    PositionLite,
+    get_account_cached,
+    get_positions_cached,
+    invalidate as _invalidate_broker_snapshot,
+)
+from trader.fill_stream import drain_order_updates, is_streaming
 from trader.order_executor import trading_client
 from trader.position_sizer import size_position
-from trader.risk_model import MAX_POSITIONS, max_position_notional, stop_loss_price, take_profit_price
+from trader.risk_model import RiskLimits, compute_brackets, risk_limits
 from trader.trade_logger import log_trade
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
-price_router = PriceRouter()
 
 _halt_new_entries = False
 _halt_reason = ""
 _halt_until = 0.0
-_pending_entries: dict[str, dict[str, object]] = {}
 _pending_entry_ttl_seconds = 3600
 _fill_slippage_warn_pct = 0.003
+# Pending-entry polling: start at the base interval and double while the order
+# status is unchanged, up to the cap.
+_PENDING_POLL_BASE_SECONDS = 5.0
+_PENDING_POLL_MAX_SECONDS = 60.0
+# While the trade-update stream is live, REST polling is only a fallback.
+_STREAM_FALLBACK_POLL_SECONDS = 30.0
+_BULK_ORDER_LIMIT = 500
+# Concurrent order submissions per group, and the pause between groups.
+_SUBMIT_BATCH_SIZE = 10
+_SUBMIT_BATCH_GAP_SECONDS = 1.0
+
+
+@lru_cache(maxsize=1)
+def _get_price_router() -> PriceRouter:
+    return PriceRouter()
+
+
+class _PendingEntries:
+    """Pending entry orders by order id; each operation holds the lock only briefly."""
+
+    def __init__(self, entries: dict | None = None) -> None:
+        self._entries: dict = dict(entries or {})
+        self._lock = threading.Lock()
+
+    def add(self, order_id, payload: dict[str, object]) -> None:
+        with self._lock:
+            self._entries[order_id] = payload
+
+    def pop(self, order_id) -> dict[str, object] | None:
+        with self._lock:
+            return self._entries.pop(order_id, None)
+
+    def get(self, order_id) -> dict[str, object] | None:
+        with self._lock:
+            return self._entries.get(order_id)
+
+    def snapshot(self) -> tuple:
+        """(order_id, payload) pairs copied under the lock, safe to iterate while mutating."""
+
+        with self._lock:
+            return tuple(self._entries.items())
+
+    def keys(self) -> tuple:
+        with self._lock:
+            return tuple(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_pending_entries = _PendingEntries()
 
 
 class TradeSignal(TypedDict, total=False):
@@ -62,7 +124,7 @@ def _set_halt(reason: str) -> None:
     _halt_new_entries = True
     _halt_reason = reason
     cooldown = max(int(settings.execution_halt_cooldown_seconds or 0), 0)
-    _halt_until = time.time() + cooldown if cooldown else 0.0
+    _halt_until = time.monotonic() + cooldown if cooldown else 0.0
     if cooldown:
         logger.error("Execution halted: %s (cooldown=%ss)", reason, cooldown)
     else:
@@ -73,7 +135,7 @@ def _reset_halt_if_ready() -> None:
     global _halt_new_entries, _halt_reason, _halt_until
     if not _halt_new_entries:
         return
-    if _halt_until and time.time() >= _halt_until:
+    if _halt_until and time.monotonic() >= _halt_until:
         _halt_new_entries = False
         _halt_reason = ""
         _halt_until = 0.0
@@ -90,18 +152,33 @@ def _coerce_timestamp(value) -> float | None:
     if isinstance(value, (int, float)):
         return float(value)
     if isinstance(value, str):
-        raw = value.strip()
-        if not raw:
-            return None
-        if raw.endswith("Z"):
-            raw = raw.replace("Z", "+00:00")
-        try:
-            return datetime.fromisoformat(raw).timestamp()
-        except ValueError:
-            return None
+        return _parse_iso_timestamp(value)
     return None
 
 
+@lru_cache(maxsize=1024)
+def _parse_iso_timestamp(value: str) -> float | None:
+    # Pending orders are re-checked every reconcile, so the same strings recur.
+    raw = value.strip()
+    if not raw:
+        return None
+    if raw.endswith("Z"):
+        raw = raw.replace("Z", "+00:00")
+    try:
+        parsed = datetime.fromisoformat(raw)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _order_status(order) -> str:
+    # alpaca-py returns OrderStatus enums, whose str() is "OrderStatus.FILLED".
+    status = getattr(order, "status", None)
+    return str(getattr(status, "value", status) or "").lower()
+
+
 def _coerce_float(value) -> float | None:
     try:
         parsed = float(value)
@@ -126,12 +203,17 @@ def _track_pending_entry(
         if entry_metadata:
             set_entry_metadata(symbol, entry_metadata)
         return
-    _pending_entries[order_id] = {
-        "symbol": symbol,
-        "submitted_at": time.time(),
-        "expected_price": expected_price,
-        "entry_metadata": entry_metadata or {},
-    }
+    _pending_entries.add(
+        order_id,
+        {
+            "symbol": symbol,
+            # Wall time bounds the broker order query; monotonic time drives the TTL.
+            "submitted_at": time.time(),
+            "submitted_mono": time.monotonic(),
+            "expected_price": expected_price,
+            "entry_metadata": entry_metadata or {},
+        },
+    )
 
 
 def _can_fetch_orders() -> bool:
@@ -160,56 +242,147 @@ def _fetch_order(order_id: str):
     return None
 
 
+def _fetch_orders_bulk(due: dict) -> dict | None:
+    """Look up all due orders with one get_orders call; None when that is unavailable."""
+
+    getter = getattr(trading_client, "get_orders", None)
+    if not callable(getter):
+        return None
+    submitted = [_coerce_float(payload.get("submitted_at")) for payload in due.values()]
+    submitted = [ts for ts in submitted if ts]
+    # A minute of slack covers clock skew between us and the broker.
+    after = datetime.fromtimestamp(min(submitted) - 60, tz=timezone.utc) if submitted else None
+    symbols = sorted({str(payload.get("symbol") or "") for payload in due.values()} - {""})
+    request = GetOrdersRequest(
+        status=QueryOrderStatus.ALL,
+        after=after,
+        symbols=symbols or None,
+        limit=_BULK_ORDER_LIMIT,
+        nested=False,
+    )
+    try:
+        orders = getter(request)
+    except Exception as exc:  # pragma: no cover - network guard
+        logger.warning("Bulk order lookup failed; falling back to per-order fetch: %s", exc)
+        return None
+    # Submitted order ids may be UUID objects; match on their string form.
+    wanted = {str(order_id): order_id for order_id in due}
+    found: dict[str, object] = {}
+    for order in orders or []:
+        key = wanted.get(str(getattr(order, "id", "")))
+        if key is not None:
+            found[key] = order
+    return found
+
+
+def _schedule_next_poll(payload: dict[str, object], mono_now: float, status: str | None) -> None:
+    """Back off polling while an order's status stays the same; times are monotonic."""
+
+    base = _STREAM_FALLBACK_POLL_SECONDS if is_streaming() else _PENDING_POLL_BASE_SECONDS
+    interval = max(_coerce_float(payload.get("poll_interval")) or base, base)
+    if status is not None and status == payload.get("last_status"):
+        interval = min(interval * 2, max(_PENDING_POLL_MAX_SECONDS, base))
+    else:
+        interval = base
+    payload["last_status"] = status
+    payload["poll_interval"] = interval
+    payload["next_poll_at"] = mono_now + interval
+
+
+def _apply_order_update(order_id: str, payload: dict[str, object], order, now: float) -> bool:
+    """Record a fill or terminal status; True when the entry is no longer pending."""
+
+    status = _order_status(order)
+    filled_at = _coerce_timestamp(getattr(order, "filled_at", None))
+    if filled_at is None and status in ("filled", "partially_filled"):
+        filled_at = now
+    if filled_at is not None:
+        symbol = str(payload.get("symbol") or "")
+        if symbol:
+            set_entry_timestamp(symbol, filled_at)
+            entry_metadata = payload.get("entry_metadata")
+            if isinstance(entry_metadata, dict) and entry_metadata:
+                set_entry_metadata(symbol, entry_metadata)
+            fill_price = _coerce_float(getattr(order, "filled_avg_price", None))
+            if fill_price is not None:
+                expected_price = _coerce_float(payload.get("expected_price"))
+                if expected_price and expected_price > 0:
+                    slippage_pct = abs(fill_price - expected_price) / expected_price
+                    if slippage_pct >= _fill_slippage_warn_pct:
+                        logger.warning(
+                            "Fill slippage for %s: expected %.4f got %.4f (%.2f%%)",
+                            symbol,
+                            expected_price,
+                            fill_price,
+                            slippage_pct * 100.0,
+                        )
+                log_trade(
+                    {
+                        "symbol": symbol,
+                        "event": "fill",
+                        "status": "filled",
+                        "price": fill_price,
+                        "order_id": order_id,
+                    }
+                )
+        _pending_entries.pop(order_id)
+        return True
+    if status in ("canceled", "rejected", "expired"):
+        _pending_entries.pop(order_id)
+        return True
+    return False
+
+
+def _apply_streamed_updates(now: float) -> None:
+    """Resolve pending entries from orders pushed by the trade-update stream."""
+
+    updates = drain_order_updates()
+    if not updates or not _pending_entries:
+        return
+    # Submitted order ids may be UUID objects; match on their string form.
+    pending_keys = {str(order_id): order_id for order_id in _pending_entries.keys()}
+    for order in updates:
+        order_id = pending_keys.get(str(getattr(order, "id", "")))
+        payload = _pending_entries.get(order_id) if order_id is not None else None
+        if payload is not None:
+            _apply_order_update(order_id, payload, order, now)
+
+
 def reconcile_pending_entries() -> None:
-    if trading_client is None or not _pending_entries:
+    if trading_client is None:
         return
     now = time.time()
-    for order_id, payload in list(_pending_entries.items()):
-        submitted_at = _coerce_float(payload.get("submitted_at")) or 0.0
-        if submitted_at and (now - submitted_at) > _pending_entry_ttl_seconds:
-            logger.warning("Pending entry %s expired after %.1f minutes", order_id, (now - submitted_at) / 60.0)
-            _pending_entries.pop(order_id, None)
+    mono_now = time.monotonic()
+    _apply_streamed_updates(now)
+    if not _pending_entries:
+        return
+    due: dict[str, dict[str, object]] = {}
+    for order_id, payload in _pending_entries.snapshot():
+        submitted_mono = _coerce_float(payload.get("submitted_mono"))
+        if submitted_mono is not None:
+            age = mono_now - submitted_mono
+        else:
+            submitted_at = _coerce_float(payload.get("submitted_at")) or 0.0
+            age = now - submitted_at if submitted_at else 0.0
+        if age > _pending_entry_ttl_seconds:
+            logger.warning("Pending entry %s expired after %.1f minutes", order_id, age / 60.0)
+            _pending_entries.pop(order_id)
             continue
-        order = _fetch_order(order_id)
-        if order is None:
+        if (_coerce_float(payload.get("next_poll_at")) or 0.0) > mono_now:
             continue
-        status = str(getattr(order, "status", "") or "").lower()
-        filled_at = _coerce_timestamp(getattr(order, "filled_at", None))
-        if filled_at is None and status in ("filled", "partially_filled"):
-            filled_at = now
-        if filled_at is not None:
-            symbol = str(payload.get("symbol") or "").upper()
-            if symbol:
-                set_entry_timestamp(symbol, filled_at)
-                entry_metadata = payload.get("entry_metadata")
-                if isinstance(entry_metadata, dict) and entry_metadata:
-                    set_entry_metadata(symbol, entry_metadata)
-                fill_price = _coerce_float(getattr(order, "filled_avg_price", None))
-                if fill_price is not None:
-                    expected_price = _coerce_float(payload.get("expected_price"))
-                    if expected_price and expected_price > 0:
-                        slippage_pct = abs(fill_price - expected_price) / expected_price
-                        if slippage_pct >= _fill_slippage_warn_pct:
-                            logger.warning(
-                                "Fill slippage for %s: expected %.4f got %.4f (%.2f%%)",
-                                symbol,
-                                expected_price,
-                                fill_price,
-                                slippage_pct * 100.0,
-                            )
-                    log_trade(
-                        {
-                            "symbol": symbol,
-                            "event": "fill",
-                            "status": "filled",
-                            "price": fill_price,
-                            "order_id": order_id,
-                        }
-                    )
-            _pending_entries.pop(order_id, None)
+        due[order_id] = payload
+    if not due:
+        return
+    orders = _fetch_orders_bulk(due) or {}
+    for order_id, payload in due.items():
+        order = orders.get(order_id)
+        if order is None:
+            order = _fetch_order(order_id)
+        if order is None:
+            _schedule_next_poll(payload, mono_now, None)
             continue
-        if status in ("canceled", "rejected", "expired"):
-            _pending_entries.pop(order_id, None)
+        if not _apply_order_update(order_id, payload, order, now):
+            _schedule_next_poll(payload, mono_now, _order_status(order))
 
 
 def _log_skip(symbol: str, action: str, reason: str | None) -> ExecutionResult:
@@ -222,10 +395,11 @@ def _log_skip(symbol: str, action: str, reason: str | None) -> ExecutionResult:
             "reason": payload_reason,
         }
     )
-    if reason:
-        logger.info("Skipping %s %s: %s", action, symbol, reason)
-    else:
-        logger.info("Skipping %s %s", action, symbol)
+    if logger.isEnabledFor(logging.INFO):
+        if reason:
+            logger.info("Skipping %s %s: %s", action, symbol, reason)
+        else:
+            logger.info("Skipping %s %s", action, symbol)
     return {
         "symbol": symbol,
         "action": action,
@@ -236,11 +410,28 @@ def _log_skip(symbol: str, action: str, reason: str | None) -> ExecutionResult:
     }
 
 
-def _safe_list_positions() -> dict[str, object] | None:
+def _safe_get_position(symbol: str) -> tuple[object | None, bool]:
+    """(position or None, failed) for one symbol via the single-position endpoint."""
+
     if trading_client is None:
-        return {}
+        return None, False
     try:
-        return {pos.symbol: pos for pos in trading_client.get_all_positions()}
+        return trading_client.get_open_position(symbol), False
+    except APIError as exc:
+        if exc.status_code == 404:
+            return None, False
+        _set_halt(f"alpaca_get_position_failed: {exc}")
+        return None, True
+    except Exception as exc:  # pragma: no cover - network guard
+        _set_halt(f"alpaca_get_position_failed: {exc}")
+        return None, True
+
+
+def _safe_list_position_symbols() -> set[str] | None:
+    if trading_client is None:
+        return set()
+    try:
+        return {pos.symbol for pos in get_positions_cached(trading_client)}
     except Exception as exc:  # pragma: no cover - network guard
         _set_halt(f"alpaca_list_positions_failed: {exc}")
         return None
@@ -250,27 +441,207 @@ def _safe_get_account():
     if trading_client is None:
         return None
     try:
-        return trading_client.get_account()
+        return get_account_cached(trading_client)
     except Exception as exc:  # pragma: no cover - network guard
         _set_halt(f"alpaca_get_account_failed: {exc}")
         return None
 
 
+@dataclass
+class MarketContext:
+    """Broker snapshot shared by the entries of one execution batch."""
+
+    open_positions: set[str]
+    equity: float | None
+    buying_power: float | None
+    limits: RiskLimits | None = None
+
+    def risk_limits(self, crash_mode: bool) -> RiskLimits:
+        """Risk limits for this snapshot, resolved on first use per mode."""
+
+        if self.limits is None or self.limits.crash_mode != bool(crash_mode):
+            self.limits = risk_limits(self.equity, crash_mode)
+        return self.limits
+
+
+@dataclass
+class _PreparedEntry:
+    symbol: str
+    reason: str | None
+    qty: int
+    entry_price: float
+    stop_loss: float
+    take_profit: float
+    entry_metadata: dict[str, object]
+    order: MarketOrderRequest
+
+
+def _load_market_context() -> MarketContext | None:
+    open_positions = _safe_list_position_symbols()
+    if open_positions is None:
+        return None
+    account = _safe_get_account()
+    if account is None:
+        return None
+    equity = _coerce_float(account.equity)
+    if equity is None:
+        logger.warning("Failed to parse account equity: %r", account.equity)
+    buying_power = _coerce_float(account.buying_power)
+    if buying_power is None:
+        logger.warning("Failed to parse buying power: %r", account.buying_power)
+    return MarketContext(open_positions=open_positions, equity=equity, buying_power=buying_power)
+
+
+def _normalize_signal(signal: TradeSignal) -> tuple[str, str]:
+    """(symbol, action) upper-cased once; internal helpers take these as-is."""
+
+    return (signal.get("symbol") or "").upper(), str(signal.get("action") or "BUY").upper()
+
+
 def execute_signals(signals: list[TradeSignal], *, crash_mode: bool = False) -> list[ExecutionResult]:
     if not signals:
         logger.info("No signals to execute")
         return []
     _reset_halt_if_ready()
-    results: list[ExecutionResult] = []
-    for signal in signals:
-        results.append(execute_signal(signal, crash_mode=crash_mode))
+    # Symbols and actions are normalized once here and passed through as-is.
+    keys = [_normalize_signal(signal) for signal in signals]
+    results: list[ExecutionResult | None] = []
+    pending: list[tuple[int, _PreparedEntry]] = []
+    # One broker snapshot serves the whole batch; validated entries reserve their
+    # symbol and buying power in it, then all orders are submitted together.
+    context: MarketContext | None = None
+    # Entry prices and default brackets for every BUY, resolved in one pass.
+    quotes: dict[int, tuple[float, float, float] | str] = {}
+    if trading_client is not None and not _halt_new_entries:
+        buy_indices = [idx for idx, (_, action) in enumerate(keys) if action == "BUY"]
+        quotes = dict(
+            zip(
+                buy_indices,
+                _quote_entries(
+                    [signals[idx] for idx in buy_indices], crash_mode, symbols=[keys[idx][0] for idx in buy_indices]
+                ),
+            )
+        )
+    # Entry timestamp/metadata updates are written to disk once, after the batch.
+    with deferred_state_writes():
+        for idx, signal in enumerate(signals):
+            symbol, action = keys[idx]
+            if action == "BUY" and context is None and trading_client is not None and not _halt_new_entries:
+                context = _load_market_context()
+            if action == "BUY" and symbol and context is not None and not _halt_new_entries:
+                # Batch-level checks already hold, so go straight to the BUY path.
+                prepared = _prepare_buy(signal, symbol, crash_mode=crash_mode, context=context, quote=quotes.get(idx))
+            else:
+                prepared = _prepare_signal(
+                    signal, crash_mode=crash_mode, context=context, quote=quotes.get(idx), key=keys[idx]
+                )
+            if isinstance(prepared, _PreparedEntry):
+                pending.append((len(results), prepared))
+                results.append(None)
+                continue
+            results.append(prepared)
+            if context is not None and prepared["submitted"] and prepared["action"] == "CLOSE":
+                context.open_positions.discard(prepared["symbol"])
+        submitted = _submit_entries([entry for _, entry in pending])
+        for (idx, _), result in zip(pending, submitted):
+            results[idx] = result
     return results
 
 
-def execute_signal(signal: TradeSignal, *, crash_mode: bool = False) -> ExecutionResult:
-    symbol = (signal.get("symbol") or "").upper()
-    action_raw = signal.get("action") or "BUY"
-    action = str(action_raw).upper()
+def execute_signal(
+    signal: TradeSignal,
+    *,
+    crash_mode: bool = False,
+    context: MarketContext | None = None,
+) -> ExecutionResult:
+    prepared = _prepare_signal(signal, crash_mode=crash_mode, context=context)
+    if isinstance(prepared, _PreparedEntry):
+        return _submit_entries([prepared])[0]
+    return prepared
+
+
+def _quote_entries(
+    signals: list[TradeSignal],
+    crash_mode: bool,
+    *,
+    symbols: list[str] | None = None,
+) -> list[tuple[float, float, float] | str]:
+    """(entry price, default stop-loss, default take-profit) per BUY signal, or a skip reason.
+
+    Missing entry prices are fetched in one batch when there are several, and
+    brackets from stop_loss_pct/take_profit_pct (or the mode defaults) are
+    computed for the whole batch at once.
+    """
+
+    if symbols is None:
+        symbols = [_normalize_signal(signal)[0] for signal in signals]
+    missing = [sym for sym, signal in zip(symbols, signals) if sym and signal.get("entry_price") is None]
+    fetched: dict[str, float] = {}
+    errors: dict[str, str] = {}
+    batched = False
+    if len(missing) > 1:
+        try:
+            fetched = _get_price_router().get_prices(missing)
+            batched = True
+        except Exception as exc:  # pragma: no cover - network guard
+            logger.warning("Batch entry price lookup failed; falling back to per-symbol: %s", exc)
+    for sym in missing:
+        if sym in fetched:
+            continue
+        if batched:
+            errors[sym] = "price_unavailable:no provider price"
+            continue
+        try:
+            fetched[sym] = _get_price_router().get_price(sym)
+        except Exception as exc:  # pragma: no cover - network guard
+            errors[sym] = f"price_unavailable:{exc}"
+
+    quotes: list[tuple[float, float, float] | str] = []
+    valid: list[int] = []
+    entries: list[float] = []
+    for idx, (sym, signal) in enumerate(zip(symbols, signals)):
+        raw_price = signal.get("entry_price")
+        if raw_price is None:
+            if sym in errors:
+                quotes.append(errors[sym])
+                continue
+            raw_price = fetched.get(sym)
+        entry_price = _coerce_float(raw_price)
+        if entry_price is None or entry_price <= 0:
+            quotes.append("invalid_entry_price")
+            continue
+        quotes.append("")
+        valid.append(idx)
+        entries.append(entry_price)
+    if not valid:
+        return quotes
+
+    def _pct(signal: TradeSignal, key: str) -> float:
+        value = _coerce_float(signal.get(key))
+        return math.nan if value is None else value
+
+    stops, targets = compute_brackets(
+        entries,
+        [_pct(signals[idx], "stop_loss_pct") for idx in valid],
+        [_pct(signals[idx], "take_profit_pct") for idx in valid],
+        crash_mode=crash_mode,
+    )
+    for pos, idx in enumerate(valid):
+        quotes[idx] = (entries[pos], float(stops[pos]), float(targets[pos]))
+    return quotes
+
+
+def _prepare_signal(
+    signal: TradeSignal,
+    *,
+    crash_mode: bool,
+    context: MarketContext | None,
+    quote: tuple[float, float, float] | str | None = None,
+    key: tuple[str, str] | None = None,
+) -> ExecutionResult | _PreparedEntry:
+    """Validate and size one signal; BUYs that pass come back ready to submit."""
+
+    symbol, action = key if key is not None else _normalize_signal(signal)
     reason = signal.get("reason")
 
     if not symbol:
@@ -279,7 +650,7 @@ def execute_signal(signal: TradeSignal, *, crash_mode: bool = False) -> Executio
     _reset_halt_if_ready()
     if action in ("SELL", "CLOSE"):
         close_reason = reason or ("sell_signal_close_only" if action == "SELL" else None)
-        return close_position(symbol, reason=close_reason)
+        return _close_position(symbol, reason=close_reason)
 
     if action != "BUY":
         return _log_skip(symbol, action, "unsupported_action")
@@ -290,56 +661,47 @@ def execute_signal(signal: TradeSignal, *, crash_mode: bool = False) -> Executio
     if _halt_new_entries:
         return _log_skip(symbol, action, _halt_reason or "alpaca_api_error")
 
-    open_positions = _safe_list_positions()
-    if open_positions is None:
+    if context is None:
+        context = _load_market_context()
+    if context is None:
         return _log_skip(symbol, action, _halt_reason or "alpaca_api_error")
-    max_positions = settings.crash_max_positions if crash_mode else MAX_POSITIONS
-    if len(open_positions) >= max_positions:
+    return _prepare_buy(signal, symbol, crash_mode=crash_mode, context=context, quote=quote)
+
+
+def _prepare_buy(
+    signal: TradeSignal,
+    symbol: str,
+    *,
+    crash_mode: bool,
+    context: MarketContext,
+    quote: tuple[float, float, float] | str | None = None,
+) -> ExecutionResult | _PreparedEntry:
+    """Size a BUY whose symbol, client, halt flag and market context are already checked."""
+
+    action = "BUY"
+    reason = signal.get("reason")
+    limits = context.risk_limits(crash_mode)
+    if len(context.open_positions) >= limits.max_positions:
         return _log_skip(symbol, action, "max_positions_reached")
-    if symbol in open_positions:
+    if symbol in context.open_positions:
         return _log_skip(symbol, action, "position_exists")
 
-    entry_price = signal.get("entry_price")
-    if entry_price is None:
-        try:
-            entry_price = price_router.get_price(symbol)
-        except Exception as exc:  # pragma: no cover - network guard
-            return _log_skip(symbol, action, f"price_unavailable:{exc}")
-    try:
-        entry_price = float(entry_price)
-    except (TypeError, ValueError):
-        return _log_skip(symbol, action, "invalid_entry_price")
-    if entry_price <= 0:
-        return _log_skip(symbol, action, "invalid_entry_price")
+    if quote is None:
+        quote = _quote_entries([signal], crash_mode, symbols=[symbol])[0]
+    if isinstance(quote, str):
+        return _log_skip(symbol, action, quote)
+    entry_price, default_stop, default_take = quote
 
     stop_loss = signal.get("stop_loss_price")
     take_profit = signal.get("take_profit_price")
-    stop_loss_pct = signal.get("stop_loss_pct")
-    take_profit_pct = signal.get("take_profit_pct")
-    if stop_loss is None and stop_loss_pct is not None:
-        try:
-            pct = float(stop_loss_pct)
-            if 0 < pct < 1:
-                stop_loss = round(entry_price * (1 - pct), 2)
-        except (TypeError, ValueError):
-            stop_loss = None
-    if take_profit is None and take_profit_pct is not None:
-        try:
-            pct = float(take_profit_pct)
-            if 0 < pct < 1:
-                take_profit = round(entry_price * (1 + pct), 2)
-        except (TypeError, ValueError):
-            take_profit = None
     if stop_loss is None:
-        stop_loss = stop_loss_price(entry_price, crash_mode=crash_mode)
+        stop_loss = default_stop
     if take_profit is None:
-        take_profit = take_profit_price(entry_price, crash_mode=crash_mode)
-    try:
-        stop_loss = float(stop_loss)
-        take_profit = float(take_profit)
-    except (TypeError, ValueError):
+        take_profit = default_take
+    stop_loss = _coerce_float(stop_loss)
+    take_profit = _coerce_float(take_profit)
+    if stop_loss is None or take_profit is None:
         return _log_skip(symbol, action, "invalid_bracket")
-
     if stop_loss <= 0 or take_profit <= 0 or stop_loss >= entry_price or take_profit <= entry_price:
         return _log_skip(symbol, action, "invalid_bracket")
 
@@ -355,33 +717,16 @@ def execute_signal(signal: TradeSignal, *, crash_mode: bool = False) -> Executio
     if signal.get("data_source"):
         entry_metadata["data_source"] = signal.get("data_source")
 
-    account = _safe_get_account()
-    if account is None:
-        return _log_skip(symbol, action, _halt_reason or "alpaca_api_error")
-
-    try:
-        equity = float(account.equity)
-    except (TypeError, ValueError) as exc:
-        logger.warning("Failed to parse account equity: %s", exc)
-        equity = None
-
-    try:
-        buying_power = float(account.buying_power)
-    except (TypeError, ValueError) as exc:
-        logger.warning("Failed to parse buying power: %s", exc)
-        buying_power = None
-
-    max_notional = max_position_notional(equity, crash_mode=crash_mode)
-    max_risk_pct = float(signal.get("max_risk_pct") or settings.max_risk_pct or 0.0)
-    if crash_mode:
-        max_risk_pct *= 0.5
+    equity = context.equity
+    buying_power = context.buying_power
+    max_risk_pct = float(signal.get("max_risk_pct") or limits.max_risk_pct) * limits.risk_scale
 
     sized_qty = size_position(
         entry_price,
         stop_loss,
         equity=equity,
         max_risk_pct=max_risk_pct,
-        max_notional=max_notional,
+        max_notional=limits.max_notional,
         min_qty=1,
     )
     requested_qty = int(signal.get("requested_qty") or 0)
@@ -408,7 +753,8 @@ def execute_signal(signal: TradeSignal, *, crash_mode: bool = False) -> Executio
                 "reason": reason,
             }
         )
-        logger.info("Dry-run: would submit BUY for %s qty=%s", symbol, qty)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Dry-run: would submit BUY for %s qty=%s", symbol, qty)
         return {
             "symbol": symbol,
             "action": action,
@@ -418,6 +764,8 @@ def execute_signal(signal: TradeSignal, *, crash_mode: bool = False) -> Executio
             "reason": "dry_run",
         }
 
+    context.open_positions.add(symbol)
+    context.buying_power = buying_power - notional
     order = MarketOrderRequest(
         symbol=symbol,
         qty=qty,
@@ -427,46 +775,111 @@ def execute_signal(signal: TradeSignal, *, crash_mode: bool = False) -> Executio
         take_profit=TakeProfitRequest(limit_price=take_profit),
         stop_loss=StopLossRequest(stop_price=stop_loss),
     )
+    return _PreparedEntry(
+        symbol=symbol,
+        reason=reason,
+        qty=qty,
+        entry_price=entry_price,
+        stop_loss=stop_loss,
+        take_profit=take_profit,
+        entry_metadata=entry_metadata,
+        order=order,
+    )
+
+
+def _submit_order(order: MarketOrderRequest):
+    """(submitted order, None) or (None, error); safe to run on a worker thread."""
+
     try:
-        submitted = trading_client.submit_order(order)
-        order_id = getattr(submitted, "id", None)
-        status = str(getattr(submitted, "status", "") or "").lower()
-        filled_at = _coerce_timestamp(getattr(submitted, "filled_at", None))
-        if filled_at is not None or status == "filled":
-            set_entry_timestamp(symbol, filled_at or datetime.now(timezone.utc).timestamp())
-            if entry_metadata:
-                set_entry_metadata(symbol, entry_metadata)
-        else:
-            _track_pending_entry(order_id, symbol, entry_price, entry_metadata)
-        log_trade(
-            {
-                "symbol": symbol,
-                "action": action,
-                "status": "submitted",
-                "qty": qty,
-                "price": entry_price,
-                "stop_loss": stop_loss,
-                "take_profit": take_profit,
-                "order_id": order_id,
-                "reason": reason,
-            }
-        )
-        logger.info("Submitted bracket order for %s qty=%s tp=%.2f sl=%.2f", symbol, qty, take_profit, stop_loss)
-        return {
+        return trading_client.submit_order(order), None
+    except Exception as exc:  # pragma: no cover - network guard
+        return None, exc
+
+
+@lru_cache(maxsize=1)
+def _get_submit_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=_SUBMIT_BATCH_SIZE, thread_name_prefix="order-submit")
+
+
+def _submit_orders_bulk(orders: list[MarketOrderRequest]) -> list[tuple[object, Exception | None]]:
+    """Submit a group of orders in one round-trip window; outcomes in request order.
+
+    Alpaca has no multi-order endpoint, so the requests are pipelined on a
+    shared worker pool; a batch endpoint would slot in here.
+    """
+
+    if len(orders) == 1:
+        return [_submit_order(orders[0])]
+    return list(_get_submit_pool().map(_submit_order, orders))
+
+
+def _submit_entries(entries: list[_PreparedEntry]) -> list[ExecutionResult]:
+    """Submit prepared entries concurrently in rate-limited groups, in order."""
+
+    results: list[ExecutionResult] = []
+    for start in range(0, len(entries), _SUBMIT_BATCH_SIZE):
+        if start:
+            time.sleep(_SUBMIT_BATCH_GAP_SECONDS)
+        chunk = entries[start : start + _SUBMIT_BATCH_SIZE]
+        if _halt_new_entries:
+            results.extend(_log_skip(entry.symbol, "BUY", _halt_reason or "alpaca_api_error") for entry in chunk)
+            continue
+        outcomes = _submit_orders_bulk([entry.order for entry in chunk])
+        # Bookkeeping (state file, trade log, halt flag) stays on this thread.
+        for entry, (submitted, exc) in zip(chunk, outcomes):
+            results.append(_record_submission(entry, submitted, exc))
+    return results
+
+
+def _record_submission(entry: _PreparedEntry, submitted, exc: Exception | None) -> ExecutionResult:
+    symbol = entry.symbol
+    _invalidate_broker_snapshot()
+    if exc is not None:
+        _set_halt(f"alpaca_submit_failed: {exc}")
+        return _log_skip(symbol, "BUY", _halt_reason or "alpaca_submit_failed")
+    order_id = getattr(submitted, "id", None)
+    status = _order_status(submitted)
+    filled_at = _coerce_timestamp(getattr(submitted, "filled_at", None))
+    if filled_at is not None or status == "filled":
+        set_entry_timestamp(symbol, filled_at or datetime.now(timezone.utc).timestamp())
+        if entry.entry_metadata:
+            set_entry_metadata(symbol, entry.entry_metadata)
+    else:
+        _track_pending_entry(order_id, symbol, entry.entry_price, entry.entry_metadata)
+    log_trade(
+        {
             "symbol": symbol,
-            "action": action,
-            "submitted": True,
-            "skipped": False,
+            "action": "BUY",
+            "status": "submitted",
+            "qty": entry.qty,
+            "price": entry.entry_price,
+            "stop_loss": entry.stop_loss,
+            "take_profit": entry.take_profit,
             "order_id": order_id,
-            "reason": None,
+            "reason": entry.reason,
         }
-    except Exception as exc:  # pragma: no cover - network guard
-        _set_halt(f"alpaca_submit_failed: {exc}")
-        return _log_skip(symbol, action, _halt_reason or "alpaca_submit_failed")
+    )
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Submitted bracket order for %s qty=%s tp=%.2f sl=%.2f", symbol, entry.qty, entry.take_profit, entry.stop_loss
+        )
+    return {
+        "symbol": symbol,
+        "action": "BUY",
+        "submitted": True,
+        "skipped": False,
+        "order_id": order_id,
+        "reason": None,
+    }
 
 
 def close_position(symbol: str, *, reason: str | None = None) -> ExecutionResult:
-    symbol = symbol.upper()
+    return _close_position(symbol.upper(), reason=reason)
+
+
+def _close_position(symbol: str, *, reason: str | None) -> ExecutionResult:
+    """close_position for a symbol that is already upper-cased."""
+
     if not symbol:
         return _log_skip("", "CLOSE", "missing_symbol")
     if trading_client is None:
@@ -480,7 +893,8 @@ def close_position(symbol: str, *, reason: str | None = None) -> ExecutionResult
                 "reason": reason,
             }
         )
-        logger.info("Dry-run: would close %s", symbol)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Dry-run: would close %s", symbol)
         return {
             "symbol": symbol,
             "action": "CLOSE",
@@ -490,11 +904,9 @@ def close_position(symbol: str, *, reason: str | None = None) -> ExecutionResult
             "reason": "dry_run",
         }
 
-    positions = _safe_list_positions()
-    if positions is None:
+    pos, failed = _safe_get_position(symbol)
+    if failed:
         return _log_skip(symbol, "CLOSE", _halt_reason or "alpaca_api_error")
-
-    pos = positions.get(symbol)
     if not pos:
         return _log_skip(symbol, "CLOSE", "no_position")
     try:
@@ -522,7 +934,7 @@ def close_position(symbol: str, *, reason: str | None = None) -> ExecutionResult
 
     if current_price is None:
         try:
-            current_price = float(price_router.get_price(symbol))
+            current_price = float(_get_price_router().get_price(symbol))
         except Exception as exc:
             logger.warning("Price lookup failed for %s during close: %s", symbol, exc)
             current_price = None
@@ -536,6 +948,7 @@ def close_position(symbol: str, *, reason: str | None = None) -> ExecutionResult
 
     try:
         trading_client.close_position(symbol)
+        _invalidate_broker_snapshot()
         clear_entry_timestamp(symbol)
         clear_entry_metadata(symbol)
         log_trade(
@@ -551,7 +964,8 @@ def close_position(symbol: str, *, reason: str | None = None) -> ExecutionResult
                 "reason": reason,
             }
         )
-        logger.info("Closed position for %s", symbol)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Closed position for %s", symbol)
         return {
             "symbol": symbol,
             "action": "CLOSE",
@@ -561,6 +975,7 @@ def close_position(symbol: str, *, reason: str | None = None) -> ExecutionResult
             "reason": None,
         }
     except Exception as exc:  # pragma: no cover - network guard
+        _invalidate_broker_snapshot()
         msg = str(exc).lower()
         benign_markers = ("insufficient qty", "insufficient quantity", "no position", "position does not exist")
         if any(marker in msg for marker in benign_markers):
@@ -569,12 +984,18 @@ def close_position(symbol: str, *, reason: str | None = None) -> ExecutionResult
         return _log_skip(symbol, "CLOSE", _halt_reason or "alpaca_close_failed")
 
 
-def list_positions():
+def list_positions() -> list[PositionLite]:
+    """Open positions as PositionLite tuples with float fields.
+
+    The list is the shared broker snapshot (reused for a few seconds), so
+    callers must not mutate it.
+    """
+
     if trading_client is None:
         logger.warning("Trading client unavailable; cannot list positions.")
         return []
     try:
-        return trading_client.get_all_positions()
+        return get_positions_cached(trading_client)
     except Exception as exc:  # pragma: no cover - network guard
         logger.warning("Unable to list positions: %s", exc)
         return []
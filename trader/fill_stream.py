@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+
+from alpaca.trading.stream import TradingStream
+
+from core.config import get_settings
+from trader.order_executor import _is_live, trading_client
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Trade-update events that can resolve a pending entry.
+_ORDER_EVENTS = frozenset({"fill", "partial_fill", "canceled", "rejected", "expired"})
+
+# Orders from the websocket thread, drained by reconcile_pending_entries on the
+# main thread so state-file and trade-log writes never race.
+_order_updates: queue.Queue = queue.Queue()
+_stream_thread: threading.Thread | None = None
+
+
+async def _on_trade_update(data) -> None:
+    event = str(getattr(data, "event", "") or "").lower()
+    order = getattr(data, "order", None)
+    if order is None or event not in _ORDER_EVENTS:
+        return
+    _order_updates.put(order)
+
+
+def _run_stream(stream: TradingStream) -> None:
+    try:
+        stream.run()
+    except Exception as exc:  # pragma: no cover - network guard
+        logger.warning("Trade update stream stopped: %s", exc)
+
+
+def start_fill_stream() -> bool:
+    """Start the trade-update websocket in a daemon thread; True when it is running."""
+
+    global _stream_thread
+    if is_streaming():
+        return True
+    if trading_client is None or not (settings.alpaca_api_key and settings.alpaca_api_secret):
+        return False
+    try:
+        stream = TradingStream(settings.alpaca_api_key, settings.alpaca_api_secret, paper=not _is_live)
+        stream.subscribe_trade_updates(_on_trade_update)
+    except Exception as exc:  # pragma: no cover - network guard
+        logger.warning("Unable to start trade update stream: %s", exc)
+        return False
+    _stream_thread = threading.Thread(target=_run_stream, args=(stream,), name="alpaca-trade-updates", daemon=True)
+    _stream_thread.start()
+    logger.info("Trade update stream started")
+    return True
+
+
+def is_streaming() -> bool:
+    return _stream_thread is not None and _stream_thread.is_alive()
+
+
+def drain_order_updates() -> list:
+    """Orders received from the stream since the last drain, oldest first."""
+
+    updates = []
+    while True:
+        try:
+            updates.append(_order_updates.get_nowait())
+        except queue.Empty:
+            return updates
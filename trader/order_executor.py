@@ -1,9 +1,14 @@
 import logging
+import threading
 from datetime import datetime, timezone
+from functools import lru_cache
 
+from alpaca.common.exceptions import APIError
 from alpaca.trading.client import TradingClient
 from alpaca.trading.enums import OrderClass, OrderSide, TimeInForce
 from alpaca.trading.requests import MarketOrderRequest, StopLossRequest, TakeProfitRequest
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from core.config import get_settings
 from data.price_router import PriceRouter
@@ -12,7 +17,13 @@ from trader.risk_model import stop_loss_price, take_profit_price
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
-price_router = PriceRouter()
+
+# Connection pool sized for concurrent order submission plus background calls.
+_HTTP_POOL_MAXSIZE = 16
+# Alpaca drops idle connections; a light request this often keeps one warm.
+_KEEPALIVE_INTERVAL_SECONDS = 25.0
+_keepalive_thread: threading.Thread | None = None
+_keepalive_stop = threading.Event()
 
 _base_url = (settings.alpaca_base_url or "").lower()
 _mode = settings.trading_mode or "paper"
@@ -36,6 +47,54 @@ else:
     logger.warning("Alpaca credentials missing; trading operations will be skipped.")
 
 
+def _configure_session(client) -> None:
+    session = getattr(client, "_session", None)
+    if session is None:
+        return
+    # Connect-only retries: nothing has reached the server yet, so they are safe
+    # for order POSTs too. Rate-limit retries are handled by alpaca-py itself.
+    retry = Retry(total=2, connect=2, read=0, status=0, other=0, backoff_factor=0.2)
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=_HTTP_POOL_MAXSIZE, max_retries=retry))
+    session.headers["Connection"] = "keep-alive"
+
+
+if trading_client is not None:
+    _configure_session(trading_client)
+
+
+def _keepalive_loop(interval: float) -> None:
+    while not _keepalive_stop.wait(interval):
+        try:
+            trading_client.get_clock()
+        except Exception as exc:  # pragma: no cover - network guard
+            logger.debug("Keep-alive request failed: %s", exc)
+
+
+def start_keepalive(interval: float = _KEEPALIVE_INTERVAL_SECONDS) -> bool:
+    """Ping the trading API periodically so order submits reuse a warm connection."""
+
+    global _keepalive_thread
+    if trading_client is None:
+        return False
+    if _keepalive_thread is not None and _keepalive_thread.is_alive():
+        return True
+    _keepalive_stop.clear()
+    _keepalive_thread = threading.Thread(
+        target=_keepalive_loop, args=(interval,), name="alpaca-keepalive", daemon=True
+    )
+    _keepalive_thread.start()
+    return True
+
+
+def stop_keepalive() -> None:
+    _keepalive_stop.set()
+
+
+@lru_cache(maxsize=1)
+def _get_price_router() -> PriceRouter:
+    return PriceRouter()
+
+
 def execute_trades(allocations, crash_mode: bool = False):
     if not allocations:
         logger.info("No allocations to trade")
@@ -63,7 +122,7 @@ def execute_trades(allocations, crash_mode: bool = False):
             logger.info("Skipping %s; already in open positions", symbol)
             continue
         try:
-            price = price_router.get_price(symbol)
+            price = _get_price_router().get_price(symbol)
         except Exception as exc:  # pragma: no cover - network guard
             logger.warning("Price fetch failed for %s: %s", symbol, exc)
             continue
@@ -106,12 +165,16 @@ def close_position(symbol: str) -> None:
         logger.warning("Trading client unavailable; cannot close position for %s", symbol)
         return
     try:
-        positions = {pos.symbol: pos for pos in trading_client.get_all_positions()}
+        pos = trading_client.get_open_position(symbol)
+    except APIError as exc:
+        if exc.status_code != 404:
+            logger.warning("Unable to fetch position before exit: %s", exc)
+            return
+        pos = None
     except Exception as exc:  # pragma: no cover - network guard
-        logger.warning("Unable to fetch positions before exit: %s", exc)
+        logger.warning("Unable to fetch position before exit: %s", exc)
         return
 
-    pos = positions.get(symbol)
     if not pos:
         logger.info("No open position for %s; skipping close", symbol)
         return
@@ -1,31 +1,54 @@
 import logging
+import time
 from datetime import datetime, timezone
 
+import numpy as np
+
 from data.portfolio_state import load_state, save_state
+from trader.broker_cache import get_account_cached, get_positions_cached
 
 logger = logging.getLogger(__name__)
+# The state file is rewritten only when a P&L field moves by a cent or more,
+# the day rolls over, or the last write is stale.
+_SAVE_MAX_INTERVAL_SECONDS = 30.0
+_last_saved_at = 0.0
+_last_saved_key: tuple | None = None
+
+
+def _account_float(account, name: str) -> float | None:
+    raw = getattr(account, name, None)
+    if raw is None:
+        return None
+    try:
+        return float(raw)
+    except (TypeError, ValueError) as exc:
+        logger.warning("Failed to parse account %s (%r): %s", name, raw, exc)
+        return None
 
 
 def update_daily_pnl(alpaca_client):
+    """Refresh equity and P&L in the portfolio state.
+
+    Unrealized P&L is the sum of open positions' unrealized_pl, read from the
+    shared positions snapshot so it costs no extra call within the cache TTL.
+    """
+
     state = load_state()
 
     if alpaca_client is None:
         return
     try:
-        account = alpaca_client.get_account()
-        positions = alpaca_client.get_all_positions()
+        account = get_account_cached(alpaca_client)
+        positions = get_positions_cached(alpaca_client)
     except Exception as exc:
         logger.warning("Failed to fetch account/positions for P&L update: %s", exc)
         return
 
     equity = float(account.equity)
-    unrealized = sum(float(p.unrealized_pl) for p in positions)
-    realized_raw = getattr(account, "realized_pl", 0.0)
-    try:
-        realized = float(realized_raw)
-    except (TypeError, ValueError) as exc:
-        logger.warning("Failed to parse realized P&L (%r): %s", realized_raw, exc)
-        realized = 0.0
+    realized = _account_float(account, "realized_pl") or 0.0
+    unrealized = float(
+        np.fromiter((float(p.unrealized_pl or 0.0) for p in positions), dtype=np.float64, count=len(positions)).sum()
+    )
 
     today = datetime.now(timezone.utc).date().isoformat()
     if state.day_start_date != today or state.day_start_equity <= 0:
@@ -50,5 +73,26 @@ def update_daily_pnl(alpaca_client):
 
     state.prior_equity = equity
 
-    save_state(state)
+    _save_if_changed(state)
     return state
+
+
+def _pnl_key(state) -> tuple:
+    return (
+        state.day_start_date,
+        round(state.day_start_equity, 2),
+        round(state.equity, 2),
+        round(state.realized_pnl, 2),
+        round(state.unrealized_pnl, 2),
+    )
+
+
+def _save_if_changed(state) -> None:
+    global _last_saved_at, _last_saved_key
+    now = time.monotonic()
+    key = _pnl_key(state)
+    if key == _last_saved_key and now - _last_saved_at <= _SAVE_MAX_INTERVAL_SECONDS:
+        return
+    save_state(state)
+    _last_saved_at = now
+    _last_saved_key = key
@@ -3,11 +3,17 @@ from __future__ import annotations
 import logging
 import os
 import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Iterable, NamedTuple
+
+import numpy as np
+import pandas as pd
 
 from core.config import get_settings
 from data.price_router import PriceRouter
-from strategy.technicals import passes_exit_filter, compute_atr
+from strategy.technicals import passes_exit_filter, compute_atr_np
 
 STOP_LOSS_PCT = 0.006
 TAKE_PROFIT_PCT = 0.018
@@ -15,24 +21,56 @@ DAILY_BUDGET = float(os.getenv("DAILY_BUDGET_USD", 10000))
 MAX_POSITIONS = int(os.getenv("MAX_POSITIONS", "5"))
 # Allow explicit override; otherwise default to one-third of daily budget
 MAX_POSITION_SIZE = float(os.getenv("MAX_POSITION_SIZE", DAILY_BUDGET / 3))
-price_router = PriceRouter()
 logger = logging.getLogger(__name__)
 settings = get_settings()
-_exit_error_counts: dict[str, tuple[int, float]] = {}
+# symbol -> [consecutive data errors, monotonic time of the last one]
+_exit_error_counts: dict[str, list] = {}
 _EXIT_ERROR_LIMIT = 2
 _EXIT_ERROR_RESET_SECONDS = 600
+# Minutes of intraday bars used by the trailing-stop and technical exit checks.
+EXIT_BARS_WINDOW = 120
+# symbol -> (bars stamp, high water, ATR); an unchanged bar set skips the recompute.
+# Entries are dropped when a position closes and pruned to the open symbols each scan.
+_trail_inputs_cache: dict[str, tuple[tuple, float, float | None]] = {}
+
+
+def reload_settings() -> None:
+    """Re-read the settings hoisted into module globals for the exit and sizing paths.
+
+    Tuples are indexed by crash_mode: (normal, crash).
+    """
+
+    global _SL_MULT, _TP_MULT, _EXIT_TP_PCT, _EXIT_SL_PCT, _EXIT_MAX_MINUTES
+    global _MAX_POSITIONS, _MAX_POSITION_PCT, _TRAIL_ATR_MULT
+    _SL_MULT = (1 - STOP_LOSS_PCT, 1 - settings.crash_stop_loss_pct)
+    _TP_MULT = (1 + TAKE_PROFIT_PCT, 1 + settings.crash_take_profit_pct)
+    _EXIT_TP_PCT = (TAKE_PROFIT_PCT, settings.crash_take_profit_pct)
+    _EXIT_SL_PCT = (STOP_LOSS_PCT, settings.crash_stop_loss_pct)
+    _EXIT_MAX_MINUTES = (settings.default_max_hold_minutes, settings.crash_max_hold_minutes)
+    _MAX_POSITIONS = (MAX_POSITIONS, settings.crash_max_positions)
+    _MAX_POSITION_PCT = float(settings.max_position_pct or 0.0)
+    _TRAIL_ATR_MULT = settings.atr_multiplier * 0.6
+    stop_loss_price.cache_clear()
+    take_profit_price.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def _get_price_router() -> PriceRouter:
+    return PriceRouter()
 
 
 def _should_force_exit_on_error(symbol: str | None) -> bool:
     if not symbol:
         return True
-    now = time.time()
-    count, last_ts = _exit_error_counts.get(symbol, (0, 0.0))
-    if now - last_ts > _EXIT_ERROR_RESET_SECONDS:
-        count = 0
-    count += 1
-    _exit_error_counts[symbol] = (count, now)
-    if count >= _EXIT_ERROR_LIMIT:
+    now = time.monotonic()
+    entry = _exit_error_counts.get(symbol)
+    if entry is None:
+        entry = _exit_error_counts[symbol] = [0, now]
+    elif now - entry[1] > _EXIT_ERROR_RESET_SECONDS:
+        entry[0] = 0
+    entry[0] += 1
+    entry[1] = now
+    if entry[0] >= _EXIT_ERROR_LIMIT:
         _exit_error_counts.pop(symbol, None)
         return True
     return False
@@ -58,14 +96,126 @@ def _coerce_minutes(value: object, fallback: int) -> int:
     return minutes
 
 
+def _parse_alpaca_iso(text: str) -> float:
+    """Epoch seconds for a fixed-width 'YYYY-MM-DDTHH:MM:SSZ' timestamp."""
+
+    return datetime(
+        int(text[0:4]),
+        int(text[5:7]),
+        int(text[8:10]),
+        int(text[11:13]),
+        int(text[14:16]),
+        int(text[17:19]),
+        tzinfo=timezone.utc,
+    ).timestamp()
+
+
+def _coerce_entry_ts(position) -> float | None:
+    """Entry time in epoch seconds, or None when unknown; raises on unparseable values.
+
+    Dict positions may carry an ISO ``open_date``/``entered_at`` instead. The
+    position is only read, never updated.
+    """
+
+    if not isinstance(position, dict):
+        raw = getattr(position, "entry_timestamp", None)
+        return None if raw is None else float(raw)
+    raw = position.get("entry_timestamp")
+    if isinstance(raw, float):
+        return raw
+    if raw is None:
+        raw = position.get("open_date") or position.get("entered_at")
+        if raw is None:
+            return None
+    if isinstance(raw, datetime):
+        parsed = raw
+    else:
+        try:
+            return float(raw)
+        except ValueError:
+            text = str(raw)
+            if len(text) == 20 and text[-1] == "Z" and text[10] == "T":
+                return _parse_alpaca_iso(text)
+            parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class _PositionView(NamedTuple):
+    """Fields should_exit reads, pulled from a dict or attribute-style position once."""
+
+    price: object
+    entry: object
+    symbol: str | None
+    data_source: str | None
+    take_profit_pct: object = None
+    stop_loss_pct: object = None
+    max_hold_minutes: object = None
+
+
+def _position_view(position) -> _PositionView:
+    if isinstance(position, dict):
+        get = position.get
+        return _PositionView(
+            get("current_price", 0.0),
+            get("entry_price", 0.0),
+            get("symbol"),
+            get("data_source"),
+            get("take_profit_pct"),
+            get("stop_loss_pct"),
+            get("max_hold_minutes"),
+        )
+    return _PositionView(
+        getattr(position, "current_price", 0.0),
+        getattr(position, "entry_price", 0.0),
+        getattr(position, "symbol", None),
+        getattr(position, "data_source", None),
+    )
+
+
+def bracket_multipliers(crash_mode: bool = False) -> tuple[float, float]:
+    """(stop-loss, take-profit) price multipliers for the given mode."""
+
+    return _SL_MULT[bool(crash_mode)], _TP_MULT[bool(crash_mode)]
+
+
+def compute_brackets(
+    entry_prices: np.ndarray,
+    stop_loss_pcts: np.ndarray,
+    take_profit_pcts: np.ndarray,
+    crash_mode: bool = False,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Stop-loss and take-profit prices for a batch of entries, rounded to cents.
+
+    Percentages outside (0, 1), or NaN, fall back to the mode defaults. The
+    products are vectorized but rounded with round() per element: np.round
+    works on a scaled float and can land a cent away from stop_loss_price.
+    """
+
+    entry = np.asarray(entry_prices, dtype=np.float64)
+    sl_pct = np.asarray(stop_loss_pcts, dtype=np.float64)
+    tp_pct = np.asarray(take_profit_pcts, dtype=np.float64)
+    sl_default, tp_default = bracket_multipliers(crash_mode)
+    sl_mult = np.where((sl_pct > 0) & (sl_pct < 1), 1 - sl_pct, sl_default)
+    tp_mult = np.where((tp_pct > 0) & (tp_pct < 1), 1 + tp_pct, tp_default)
+    stops = np.array([round(value, 2) for value in (entry * sl_mult).tolist()], dtype=np.float64)
+    targets = np.array([round(value, 2) for value in (entry * tp_mult).tolist()], dtype=np.float64)
+    return stops, targets
+
+
+# Pure functions of module constants; recurring entry prices hit the cache.
+@lru_cache(maxsize=4096)
 def stop_loss_price(entry_price: float, crash_mode: bool = False) -> float:
-    pct = settings.crash_stop_loss_pct if crash_mode else STOP_LOSS_PCT
-    return round(entry_price * (1 - pct), 2)
+    return round(entry_price * _SL_MULT[bool(crash_mode)], 2)
 
 
+@lru_cache(maxsize=4096)
 def take_profit_price(entry_price: float, crash_mode: bool = False) -> float:
-    pct = settings.crash_take_profit_pct if crash_mode else TAKE_PROFIT_PCT
-    return round(entry_price * (1 + pct), 2)
+    return round(entry_price * _TP_MULT[bool(crash_mode)], 2)
+
+
+reload_settings()
 
 
 def daily_loss_exceeded(equity_return_pct: float | None) -> bool:
@@ -78,11 +228,10 @@ def daily_loss_exceeded(equity_return_pct: float | None) -> bool:
 
 
 def _max_position_notional(equity: float | None, crash_mode: bool) -> float:
-    max_positions = settings.crash_max_positions if crash_mode else MAX_POSITIONS
-    max_pos_size = (DAILY_BUDGET * 0.80 / max_positions) if crash_mode else MAX_POSITION_SIZE
+    max_pos_size = (DAILY_BUDGET * 0.80 / _MAX_POSITIONS[1]) if crash_mode else MAX_POSITION_SIZE
     if equity is None or equity <= 0:
         return max_pos_size
-    pct_cap = float(settings.max_position_pct or 0.0)
+    pct_cap = _MAX_POSITION_PCT
     if pct_cap <= 0:
         return max_pos_size
     equity_cap = equity * pct_cap
@@ -93,6 +242,29 @@ def max_position_notional(equity: float | None, crash_mode: bool = False) -> flo
     return _max_position_notional(equity, crash_mode)
 
 
+@dataclass(frozen=True)
+class RiskLimits:
+    """Per-batch entry limits for one equity snapshot and mode."""
+
+    crash_mode: bool
+    max_positions: int
+    max_notional: float
+    max_risk_pct: float
+    risk_scale: float
+
+
+def risk_limits(equity: float | None, crash_mode: bool = False) -> RiskLimits:
+    """Resolve position, notional and risk limits once instead of per signal."""
+
+    return RiskLimits(
+        crash_mode=bool(crash_mode),
+        max_positions=_MAX_POSITIONS[bool(crash_mode)],
+        max_notional=_max_position_notional(equity, crash_mode),
+        max_risk_pct=float(settings.max_risk_pct or 0.0),
+        risk_scale=0.5 if crash_mode else 1.0,
+    )
+
+
 def can_open_position(
     current_positions: int,
     allocation_amount: float,
@@ -103,63 +275,67 @@ def can_open_position(
 ) -> bool:
     if daily_loss_exceeded(equity_return_pct):
         return False
-    max_positions = settings.crash_max_positions if crash_mode else MAX_POSITIONS
+    max_positions = _MAX_POSITIONS[bool(crash_mode)]
     max_pos_size = _max_position_notional(equity, crash_mode)
     return current_positions < max_positions and allocation_amount <= max_pos_size
 
 
-def should_exit(position: dict, crash_mode: bool = False) -> bool:
-    """Determine if an open position should be closed."""
-    price_raw = position.get("current_price", 0.0) if isinstance(position, dict) else getattr(position, "current_price", 0.0)
-    entry_raw = position.get("entry_price", 0.0) if isinstance(position, dict) else getattr(position, "entry_price", 0.0)
-    symbol = position.get("symbol") if isinstance(position, dict) else getattr(position, "symbol", None)
-    data_source = position.get("data_source") if isinstance(position, dict) else getattr(position, "data_source", None)
+def should_exit(
+    position: dict,
+    crash_mode: bool = False,
+    *,
+    bars: list | None = None,
+    now_ts: float | None = None,
+) -> bool:
+    """Determine if an open position should be closed.
 
-    price = float(price_raw)
-    entry = float(entry_raw)
+    ``bars`` are prefetched intraday bars for the symbol; when omitted they are
+    fetched here. ``now_ts`` lets a scan read the clock once for all positions.
+    """
+    view = _position_view(position)
+    symbol = view.symbol
+    price = float(view.price)
+    entry = float(view.entry)
 
     if not price or not entry:
         return True
 
-    default_tp = settings.crash_take_profit_pct if crash_mode else TAKE_PROFIT_PCT
-    default_sl = settings.crash_stop_loss_pct if crash_mode else STOP_LOSS_PCT
-    tp_pct = _coerce_pct(position.get("take_profit_pct") if isinstance(position, dict) else None, default_tp)
-    sl_pct = _coerce_pct(position.get("stop_loss_pct") if isinstance(position, dict) else None, default_sl)
-    max_minutes = _coerce_minutes(
-        position.get("max_hold_minutes") if isinstance(position, dict) else None,
-        settings.crash_max_hold_minutes if crash_mode else settings.default_max_hold_minutes,
-    )
+    mode = bool(crash_mode)
+    tp_pct = _coerce_pct(view.take_profit_pct, _EXIT_TP_PCT[mode])
+    sl_pct = _coerce_pct(view.stop_loss_pct, _EXIT_SL_PCT[mode])
+    max_minutes = _coerce_minutes(view.max_hold_minutes, _EXIT_MAX_MINUTES[mode])
 
     gain = (price / entry) - 1
     if gain >= tp_pct or gain <= -sl_pct:
         return True
 
     # NEW time-based exit logic
-    entry_timestamp = position.entry_timestamp if hasattr(position, "entry_timestamp") else position.get("entry_timestamp")
-    if entry_timestamp is None:
-        return False  # don't exit if we don't know when trade opened
-
     try:
-        entry_ts = float(entry_timestamp)
+        entry_ts = _coerce_entry_ts(position)
     except (TypeError, ValueError):
         logger.warning("Invalid entry_timestamp for %s; skipping time-stop", symbol)
         return False
+    if entry_ts is None:
+        return False  # don't exit if we don't know when trade opened
 
-    elapsed_minutes = (datetime.now(timezone.utc).timestamp() - entry_ts) / 60
+    if now_ts is None:
+        now_ts = datetime.now(timezone.utc).timestamp()
+    elapsed_minutes = (now_ts - entry_ts) / 60
 
     if elapsed_minutes >= max_minutes:
         logger.info("Time-stop exit triggered for %s after %.1f minutes", symbol, elapsed_minutes)
         return True
 
-    if data_source == "daily":
+    if view.data_source == "daily":
         return False
 
     if symbol:
         try:
-            bars = price_router.get_aggregates(symbol, window=120)
+            if bars is None:
+                bars = _get_price_router().get_aggregates(symbol, window=EXIT_BARS_WINDOW)
             df = PriceRouter.aggregates_to_dataframe(bars)
             if df is not None and not df.empty:
-                trailing_stop = _trailing_stop_from_bars(df, entry, entry_ts, crash_mode)
+                trailing_stop = _trailing_stop_from_bars(df, entry, entry_ts, crash_mode, symbol=symbol)
                 if trailing_stop is not None and price <= trailing_stop:
                     logger.info("Trailing stop exit for %s at %.2f (trail %.2f)", symbol, price, trailing_stop)
                     return True
@@ -171,28 +347,71 @@ def should_exit(position: dict, crash_mode: bool = False) -> bool:
     return False
 
 
+def _epoch_seconds(column) -> np.ndarray:
+    """Bar timestamps as epoch seconds, whether stored as numbers or datetimes."""
+
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column.to_numpy(dtype="datetime64[ns]").astype(np.int64) / 1e9
+    return column.to_numpy(dtype=np.float64)
+
+
+def _bars_stamp(frame, entry_price: float, entry_timestamp: float | None) -> tuple:
+    # Earlier bars are final; the last one may still be filling in, so its values count.
+    # The entry is part of the stamp so a re-entered symbol never reuses the last trade's high water.
+    last = frame.iloc[-1]
+    return (last["timestamp"], last["high"], last["low"], last["close"], len(frame), entry_price, entry_timestamp)
+
+
+def discard_trailing_state(symbol: str) -> None:
+    """Forget the cached trailing-stop inputs for a closed position."""
+
+    _trail_inputs_cache.pop(symbol, None)
+
+
+def prune_trailing_state(open_symbols: Iterable[str]) -> None:
+    """Keep cached trailing-stop inputs only for currently open symbols."""
+
+    keep = set(open_symbols)
+    for symbol in [symbol for symbol in _trail_inputs_cache if symbol not in keep]:
+        del _trail_inputs_cache[symbol]
+
+
 def _trailing_stop_from_bars(
     frame,
     entry_price: float,
     entry_timestamp: float | None,
     crash_mode: bool,
+    *,
+    symbol: str | None = None,
 ) -> float | None:
     if frame is None or frame.empty:
         return None
-    if entry_timestamp is not None:
-        frame = frame[frame["timestamp"] >= entry_timestamp]
-    if frame.empty:
-        return None
-    high_water = float(frame["high"].astype(float).max())
+    stamp = _bars_stamp(frame, entry_price, entry_timestamp) if symbol else None
+    cached = _trail_inputs_cache.get(symbol) if symbol else None
+    if cached is not None and cached[0] == stamp and (cached[2] is not None or cached[1] <= entry_price):
+        _, high_water, atr_value = cached
+    else:
+        high = frame["high"].to_numpy(dtype=np.float64)
+        low = frame["low"].to_numpy(dtype=np.float64)
+        close = frame["close"].to_numpy(dtype=np.float64)
+        if entry_timestamp is not None:
+            mask = _epoch_seconds(frame["timestamp"]) >= entry_timestamp
+            high, low, close = high[mask], low[mask], close[mask]
+        if not len(high):
+            return None
+        high_water = float(np.nanmax(high))
+        atr_value = None
+        if high_water > entry_price:
+            atr_value = float(compute_atr_np(high, low, close, window=14)[-1])
+        if symbol:
+            _trail_inputs_cache[symbol] = (stamp, high_water, atr_value)
     if high_water <= entry_price:
         return None
-    atr_series = compute_atr(frame, window=14)
-    atr_value = float(atr_series.iloc[-1]) if len(atr_series) else 0.0
     if atr_value <= 0:
         return None
     base_trail_pct = 0.005 if crash_mode else 0.007
     max_trail_pct = 0.05 if crash_mode else 0.08
-    trail_distance = atr_value * settings.atr_multiplier * 0.6
+    trail_distance = atr_value * _TRAIL_ATR_MULT
     min_distance = entry_price * base_trail_pct
     max_distance = entry_price * max_trail_pct
     distance = min(max(trail_distance, min_distance), max_distance)
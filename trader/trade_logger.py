@@ -1,24 +1,144 @@
 from __future__ import annotations
 
+import atexit
 import json
 import logging
+import os
+import queue
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 from core.config import get_settings
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - installs predating the orjson requirement
+    orjson = None
+
 logger = logging.getLogger(__name__)
 settings = get_settings()
 LOG_PATH = settings.portfolio_state_path.parent / "trade_log.jsonl"
 
+# Trade events are appended by a background writer, one file write per batch.
+_BATCH_MAX_ITEMS = 100
+_BATCH_MAX_WAIT_SECONDS = 0.1
+_queue: queue.Queue = queue.Queue()
+_writer_thread: threading.Thread | None = None
+_writer_lock = threading.Lock()
+# The log file stays open between batches; each batch is one buffered write.
+_WRITE_BUFFER_BYTES = 1 << 16
+_handle = None
+_handle_path: Path | None = None
+_handle_lock = threading.Lock()
+
 
 def log_trade(event: dict[str, Any]) -> None:
+    """Queue a trade event for the trade log; the file write happens off this thread."""
+
     payload = dict(event)
     payload.setdefault("timestamp", datetime.now(timezone.utc).isoformat())
+    _queue.put(payload)
+    _ensure_writer()
+
+
+def flush_trade_log() -> None:
+    """Block until every queued trade event has been written."""
+
+    if _writer_thread is not None and _writer_thread.is_alive():
+        _queue.join()
+
+
+def close_trade_log() -> None:
+    """Write out queued events, fsync and close the log file; runs at exit."""
+
+    global _handle, _handle_path
+    flush_trade_log()
+    with _handle_lock:
+        if _handle is None:
+            return
+        try:
+            _handle.flush()
+            os.fsync(_handle.fileno())
+            _handle.close()
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.warning("Trade log close failed: %s", exc)
+        _handle = None
+        _handle_path = None
+
+
+def _ensure_writer() -> None:
+    global _writer_thread
+    if _writer_thread is not None and _writer_thread.is_alive():
+        return
+    with _writer_lock:
+        if _writer_thread is not None and _writer_thread.is_alive():
+            return
+        _writer_thread = threading.Thread(target=_writer_loop, name="trade-log-writer", daemon=True)
+        _writer_thread.start()
+
+
+def _drain() -> list[dict[str, Any]]:
+    batch = [_queue.get()]
+    deadline = time.monotonic() + _BATCH_MAX_WAIT_SECONDS
+    while len(batch) < _BATCH_MAX_ITEMS:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(_queue.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+
+def _writer_loop() -> None:
+    while True:
+        batch = _drain()
+        try:
+            _write_batch(batch, LOG_PATH)
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def _write_batch(batch: list[dict[str, Any]], path: Path) -> None:
+    lines = []
+    for payload in batch:
+        try:
+            lines.append(_dumps_line(payload))
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.warning("Trade log write failed: %s", exc)
+    if not lines:
+        return
     try:
-        LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with open(LOG_PATH, "a") as handle:
-            handle.write(json.dumps(payload, ensure_ascii=True) + "\n")
+        with _handle_lock:
+            handle = _open_handle(path)
+            handle.write(b"".join(lines))
+            handle.flush()
     except Exception as exc:  # pragma: no cover - defensive
         logger.warning("Trade log write failed: %s", exc)
+
+
+def _dumps_line(payload: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY)
+    return (json.dumps(payload, ensure_ascii=True) + "\n").encode("ascii")
+
+
+def _open_handle(path: Path):
+    """Long-lived append handle for ``path``; reopened if the log path changes. Lock held."""
+
+    global _handle, _handle_path
+    if _handle is None or _handle_path != path:
+        if _handle is not None:
+            _handle.close()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _handle = open(path, "ab", buffering=_WRITE_BUFFER_BYTES)
+        _handle_path = path
+    return _handle
+
+
+atexit.register(close_trade_log)
@@ -15,7 +15,13 @@ def load_universe_from_csv(path: Path) -> pd.DataFrame:
         logger.warning("Universe CSV missing: %s", path)
         return pd.DataFrame(columns=["symbol"])
     try:
-        df = pd.read_csv(path)
+        # Only the symbol column is parsed, upper-cased as it is read.
+        df = pd.read_csv(
+            path,
+            usecols=lambda column: column == "symbol",
+            converters={"symbol": str.upper},
+            na_filter=False,
+        )
     except Exception as exc:
         logger.warning("Unable to read universe CSV %s: %s", path, exc)
         return pd.DataFrame(columns=["symbol"])
@@ -23,5 +29,4 @@ def load_universe_from_csv(path: Path) -> pd.DataFrame:
     if "symbol" not in df.columns:
         logger.warning("Universe CSV %s missing 'symbol' column", path)
         return pd.DataFrame(columns=["symbol"])
-    df["symbol"] = df["symbol"].astype(str).str.upper()
-    return df[["symbol"]].dropna()
+    return df[df["symbol"] != ""].reset_index(drop=True)
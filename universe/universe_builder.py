@@ -1,28 +1,33 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
 import re
-from collections import defaultdict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 
-import pandas as pd
+import numpy as np
 
 from core.config import get_settings
 from core.logger import get_logger
 from data.price_router import PriceRouter
 from data.alphavantage_provider import AlphaVantageProvider
 from data.twelvedata_provider import TwelveDataProvider
-from strategy.technicals import compute_atr
 from universe.csv_loader import load_universe_from_csv
 
 logger = get_logger(__name__)
 settings = get_settings()
-price_router = PriceRouter()
-
-_alpha = AlphaVantageProvider() if settings.alphavantage_api_key else None
-_twelve = TwelveDataProvider() if settings.twelvedata_api_key else None
 
 SKIP_LOG_SAMPLE_LIMIT = 5
+ATR_WINDOW = 14
+# Accepted daily ATR as a fraction of price.
+ATR_PCT_RANGE = (0.02, 0.12)
 CANDIDATE_LIMIT_MULTIPLIER = 10
 
 CANDIDATE_FILES = [
@@ -30,13 +35,63 @@ CANDIDATE_FILES = [
     settings.universe_fallback_csv,
 ]
 
-_skip_counts: dict[str, int] = defaultdict(int)
-_skip_sample_counts: dict[str, int] = defaultdict(int)
+# The filtered universe only moves with daily bars, so it is kept on disk and
+# reused until it expires or the candidate list / filter settings change.
+UNIVERSE_CACHE_PATH = settings.portfolio_state_path.parent / ".cache" / "universe.json"
+UNIVERSE_CACHE_TTL_SECONDS = int(float(os.getenv("UNIVERSE_CACHE_TTL_SEC", "86400")))
+# (UTC date, symbols) of today's filtered universe; later calls that day skip the rebuild.
+_universe_today: Optional[tuple[str, list[str]]] = None
+# Market caps change slowly; provider lookups are reused across rebuilds and restarts.
+MARKET_CAP_CACHE_PATH = UNIVERSE_CACHE_PATH.with_name("market_caps.json")
+MARKET_CAP_CACHE_TTL_SECONDS = int(float(os.getenv("MARKET_CAP_CACHE_TTL_SEC", "43200")))
+# symbol -> (market cap, epoch seconds fetched); loaded from disk on first use.
+_market_caps: Optional[dict[str, tuple[float, float]]] = None
+_market_caps_dirty = False
+_market_caps_lock = threading.Lock()
+
+_SYMBOL_PATTERN = re.compile(r"[A-Z0-9.\-]+")
+
+# Fixed skip reasons, in summary order; counters are indexed by position.
+_SKIP_REASONS = (
+    "skip_atr",
+    "skip_market_cap",
+    "skip_missing_fundamentals",
+    "skip_price_range",
+    "skip_volume_history",
+)
+_SKIP_REASON_INDEX = {reason: idx for idx, reason in enumerate(_SKIP_REASONS)}
+_skip_counts = np.zeros(len(_SKIP_REASONS), dtype=np.int64)
+_skip_sample_counts = np.zeros(len(_SKIP_REASONS), dtype=np.int64)
+# Candidates are filtered on worker threads; skip bookkeeping is shared.
+_skip_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _get_price_router() -> PriceRouter:
+    return PriceRouter()
+
+
+@lru_cache(maxsize=1)
+def _market_cap_providers() -> tuple:
+    """Configured market-cap providers in lookup order, built on first use."""
+
+    providers = []
+    if settings.alphavantage_api_key:
+        providers.append(AlphaVantageProvider())
+    if settings.twelvedata_api_key:
+        providers.append(TwelveDataProvider())
+    return tuple(providers)
 
 
 def _filter_symbols(symbols: list[str]) -> list[str]:
-    pattern = re.compile(r"^[A-Z0-9\.\-]+$")
-    return [sym for sym in symbols if isinstance(sym, str) and pattern.match(sym.upper())]
+    return list(_valid_symbols(tuple(symbols)))
+
+
+# Candidate lists repeat every cycle; a repeat costs one tuple hash instead of a regex per ticker.
+@lru_cache(maxsize=8)
+def _valid_symbols(symbols: tuple) -> tuple:
+    fullmatch = _SYMBOL_PATTERN.fullmatch
+    return tuple(sym for sym in symbols if isinstance(sym, str) and fullmatch(sym.upper()))
 
 
 def _has_external_daily_provider() -> bool:
@@ -45,29 +100,23 @@ def _has_external_daily_provider() -> bool:
 
 def _csv_universe(path) -> list[str]:
     csv_path = path if isinstance(path, Path) else Path(path)
-    df = load_universe_from_csv(csv_path)
-    return _filter_symbols(df["symbol"].dropna().astype(str).str.upper().tolist())
+    try:
+        mtime_ns = csv_path.stat().st_mtime_ns
+    except OSError:
+        # Missing files are not cached; the loader logs them on every call.
+        return list(_parse_csv_universe(csv_path))
+    return list(_csv_universe_cached(csv_path, mtime_ns))
 
 
-def _avg_dollar_volume(bars: Optional[List[Dict[str, float]]], lookback: int) -> Optional[float]:
-    if not bars:
-        return None
-    try:
-        sorted_bars = sorted(bars, key=lambda row: float(row.get("timestamp", 0.0)))
-    except Exception:
-        sorted_bars = list(bars)
-    values: List[float] = []
-    for row in sorted_bars:
-        try:
-            close = float(row.get("close", 0.0))
-            volume = float(row.get("volume", 0.0))
-        except (TypeError, ValueError):
-            continue
-        if close > 0 and volume > 0:
-            values.append(close * volume)
-    if len(values) < lookback:
-        return None
-    return float(sum(values[-lookback:]) / float(lookback))
+# Candidate CSVs are re-read every cycle and on fallbacks; an unchanged file is parsed once.
+@lru_cache(maxsize=8)
+def _csv_universe_cached(csv_path: Path, mtime_ns: int) -> tuple:
+    return _parse_csv_universe(csv_path)
+
+
+def _parse_csv_universe(csv_path: Path) -> tuple:
+    df = load_universe_from_csv(csv_path)
+    return tuple(_filter_symbols(df["symbol"].dropna().astype(str).str.upper().tolist()))
 
 
 def _load_candidates() -> list[str]:
@@ -89,98 +138,274 @@ def _load_candidates() -> list[str]:
     return []
 
 
-def _get_market_cap(symbol: str) -> Optional[float]:
-    for provider in (_alpha, _twelve):
-        if provider is None:
+def _load_market_caps() -> dict[str, tuple[float, float]]:
+    try:
+        payload = json.loads(MARKET_CAP_CACHE_PATH.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except Exception as exc:
+        logger.warning("Ignoring unreadable market cap cache %s: %s", MARKET_CAP_CACHE_PATH, exc)
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+    caps: dict[str, tuple[float, float]] = {}
+    for symbol, row in payload.items():
+        try:
+            caps[symbol] = (float(row[0]), float(row[1]))
+        except (TypeError, ValueError, IndexError):
             continue
+    return caps
+
+
+def _cached_market_cap(symbol: str) -> Optional[float]:
+    global _market_caps
+    with _market_caps_lock:
+        if _market_caps is None:
+            _market_caps = _load_market_caps()
+        row = _market_caps.get(symbol)
+    if row is None or time.time() - row[1] >= MARKET_CAP_CACHE_TTL_SECONDS:
+        return None
+    return row[0]
+
+
+def _store_market_cap(symbol: str, value: float) -> None:
+    global _market_caps_dirty
+    with _market_caps_lock:
+        if _market_caps is not None:
+            _market_caps[symbol] = (value, time.time())
+            _market_caps_dirty = True
+
+
+def _save_market_caps() -> None:
+    global _market_caps_dirty
+    with _market_caps_lock:
+        if not _market_caps_dirty or _market_caps is None:
+            return
+        now = time.time()
+        payload = {
+            symbol: list(row) for symbol, row in _market_caps.items() if now - row[1] < MARKET_CAP_CACHE_TTL_SECONDS
+        }
+        _market_caps_dirty = False
+    _write_json_atomic(MARKET_CAP_CACHE_PATH, payload)
+
+
+def _get_market_cap(symbol: str) -> Optional[float]:
+    cached = _cached_market_cap(symbol)
+    if cached is not None:
+        return cached
+    for provider in _market_cap_providers():
         try:
             value = provider.get_market_cap(symbol)  # type: ignore[attr-defined]
         except Exception as exc:  # pragma: no cover - network guard
             logger.warning("Market cap lookup failed for %s via %s: %s", symbol, provider.__class__.__name__, exc)
             continue
         if value:
+            _store_market_cap(symbol, float(value))
             return float(value)
     logger.warning("Market cap unavailable for %s; using partial fundamentals", symbol)
     return None
 
 
-def _load_daily_frame(symbol: str, limit: int = 60, preloaded: Optional[List[Dict[str, float]]] = None) -> Optional[pd.DataFrame]:
+def _load_daily_bars(
+    symbol: str, limit: int = 60, preloaded: Optional[Dict[str, np.ndarray]] = None
+) -> Optional[Dict[str, np.ndarray]]:
+    """Daily bar columns for ``symbol``, or None (with a skip logged) when unavailable."""
+
     try:
-        bars = preloaded if preloaded is not None else price_router.get_daily_aggregates(symbol, limit=limit)
-        frame = PriceRouter.aggregates_to_dataframe(bars)
-        if frame.empty:
-            _log_skip(symbol, "skip_volume_history", "no daily bars")
-            return None
-        return frame
+        if preloaded is None:
+            preloaded = PriceRouter.bars_to_columns(_get_price_router().get_daily_aggregates(symbol, limit=limit))
     except Exception as exc:  # pragma: no cover - network guard
         _log_skip(symbol, "skip_volume_history", f"price data unavailable ({exc})")
         return None
+    if not len(preloaded["close"]):
+        _log_skip(symbol, "skip_volume_history", "no daily bars")
+        return None
+    return preloaded
 
 
 def _log_skip(symbol: str, reason: str, detail: str = "") -> None:
     message = f"Universe skip {symbol}: {reason}"
-    _skip_counts[reason] += 1
-    if _skip_sample_counts[reason] < SKIP_LOG_SAMPLE_LIMIT:
-        _skip_sample_counts[reason] += 1
+    idx = _SKIP_REASON_INDEX[reason]
+    with _skip_lock:
+        _skip_counts[idx] += 1
+        sampled = _skip_sample_counts[idx] < SKIP_LOG_SAMPLE_LIMIT
+        if sampled:
+            _skip_sample_counts[idx] += 1
+    if sampled:
         if detail:
             message = f"{message} ({detail})"
         logger.info(message)
 
 
-def _passes_filters(symbol: str, frame: pd.DataFrame) -> Optional[dict]:
+def _trailing_valid_mean(values: np.ndarray, valid: np.ndarray, count: int) -> np.ndarray:
+    """Per-row mean of the last ``count`` values where ``valid``; NaN for rows with fewer.
+
+    Picked values are packed oldest first before summing, so each row adds in
+    the same order as a sum over that symbol's tail slice.
+    """
+
+    rows = values.shape[0]
+    if count <= 0:
+        return np.full(rows, np.nan)
+    from_right = np.cumsum(valid[:, ::-1], axis=1)[:, ::-1]
+    row_idx, col_idx = np.nonzero(valid & (from_right <= count))
+    packed = np.zeros((rows, count))
+    packed[row_idx, count - from_right[row_idx, col_idx]] = values[row_idx, col_idx]
+    means = packed.sum(axis=1) / count
+    means[np.count_nonzero(valid, axis=1) < count] = np.nan
+    return means
+
+
+def _liquidity_prefilter(
+    candidates: list[str], daily_bars_map: Dict[str, Dict[str, np.ndarray]], top_n: int
+) -> list[str]:
+    """Keep the ``top_n`` candidates by recent dollar volume, in candidate order.
+
+    Scores come from one stacked pass over the preloaded bars: the mean of the
+    last ``max(min_volume_history_days, 3)`` sessions with a positive close and
+    volume. Candidates without enough such sessions are dropped; if none have
+    them the prefilter is skipped.
+    """
+
     lookback = max(settings.min_volume_history_days, 3)
-    recent = frame.tail(max(lookback, 15)).copy()
-    if recent.empty or len(recent.dropna(subset=["volume"])) < settings.min_volume_history_days:
-        _log_skip(symbol, "skip_volume_history", f"found {len(recent.dropna(subset=['volume']))} valid days")
-        return None
-    recent["dollar_volume"] = recent["close"].astype(float) * recent["volume"].astype(float)
-    recent_valid = recent.dropna(subset=["dollar_volume"])
-    recent_valid = recent_valid[recent_valid["volume"].astype(float) > 0]
-    if len(recent_valid) < settings.min_volume_history_days:
-        _log_skip(symbol, "skip_volume_history", f"found {len(recent_valid)} valid days")
-        return None
-    avg_dollar_vol = float(recent_valid.tail(settings.min_volume_history_days)["dollar_volume"].mean())
-    if avg_dollar_vol < settings.min_dollar_volume:
+    scored = [symbol for symbol in candidates if daily_bars_map.get(symbol)]
+    scores = np.empty(0)
+    if scored:
+        bars = [daily_bars_map[symbol] for symbol in scored]
+        prices, volume = _bars_matrix(bars, max(len(columns["close"]) for columns in bars))
+        close = prices[:, :, 0]
+        with np.errstate(invalid="ignore"):
+            scores = _trailing_valid_mean(close * volume, (close > 0) & (volume > 0), lookback)
+    has_score = ~np.isnan(scores)
+    if not has_score.any():
+        logger.info("Universe: liquidity prefilter found no valid bars; skipping prefilter")
+        return candidates
+    ranked = np.flatnonzero(has_score)
+    # Stable on the negated score so ties keep candidate order.
+    top = ranked[np.argsort(-scores[ranked], kind="stable")[:top_n]]
+    top_symbols = {scored[idx] for idx in top.tolist()}
+    retained = [symbol for symbol in candidates if symbol in top_symbols]
+    logger.info("Universe: preselected top %s liquidity symbols (%s retained)", len(top), len(retained))
+    return retained
+
+
+def _bars_matrix(
+    bars_by_symbol: list[Dict[str, np.ndarray]], width: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Right-aligned (symbols, width, 3) float32 close/high/low and (symbols, width) float64 volume.
+
+    Short histories pad with NaN. Prices only need single precision for the
+    screens; volume stays wide so dollar volume does not lose magnitude.
+    """
+
+    prices = np.full((len(bars_by_symbol), width, 3), np.nan, dtype=np.float32)
+    volume = np.full((len(bars_by_symbol), width), np.nan)
+    for idx, bars in enumerate(bars_by_symbol):
+        for col, field in enumerate(("close", "high", "low")):
+            tail = bars[field][-width:]
+            prices[idx, width - len(tail) :, col] = tail
+        tail = bars["volume"][-width:]
+        volume[idx, width - len(tail) :] = tail
+    return prices, volume
+
+
+def _screen_daily_bars(symbols: list[str], bars_by_symbol: list[Dict[str, np.ndarray]]) -> list[tuple[str, float]]:
+    """Volume, price and ATR% screens for all candidates at once.
+
+    Returns ``(symbol, avg dollar volume)`` for the symbols that pass, in input
+    order. Every check runs on one stacked array of the trailing bars; only the
+    skip bookkeeping loops per symbol.
+    """
+
+    if not symbols:
+        return []
+    min_days = settings.min_volume_history_days
+    width = max(min_days, 3, ATR_WINDOW + 1)
+    prices, volume = _bars_matrix(bars_by_symbol, width)
+    close, high, low = prices[:, :, 0], prices[:, :, 1], prices[:, :, 2]
+    lengths = np.fromiter((len(bars["close"]) for bars in bars_by_symbol), dtype=np.int64, count=len(bars_by_symbol))
+
+    volume_days = np.count_nonzero(~np.isnan(volume), axis=1)
+    dollar_volume = close * volume
+    with np.errstate(invalid="ignore"):
+        valid = ~np.isnan(dollar_volume) & (volume > 0)
+    valid_days = np.count_nonzero(valid, axis=1)
+    avg_dollar_vol = _trailing_valid_mean(dollar_volume, valid, min_days)
+
+    price = close[:, -1]
+    prev_close = close[:, -ATR_WINDOW - 1 : -1]
+    recent_high = high[:, -ATR_WINDOW:]
+    recent_low = low[:, -ATR_WINDOW:]
+    # fmax skips NaN like compute_atr's row-wise max; the mean stays NaN if any range is missing.
+    true_range = np.fmax(
+        np.fmax(recent_high - recent_low, np.abs(recent_high - prev_close)), np.abs(recent_low - prev_close)
+    )
+    atr = true_range.mean(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        has_atr = (lengths >= ATR_WINDOW + 1) & (atr > 0) & (price > 0)
+        atr_pct = np.where(has_atr, atr / price, np.nan)
+
+        volume_ok = (volume_days >= min_days) & (valid_days >= min_days) & ~(avg_dollar_vol < settings.min_dollar_volume)
+        price_ok = (price >= settings.min_price) & (price <= settings.max_price)
+        atr_ok = np.where(has_atr, (atr_pct >= ATR_PCT_RANGE[0]) & (atr_pct <= ATR_PCT_RANGE[1]), settings.allow_partial_atr)
+    passed = volume_ok & price_ok & atr_ok
+
+    for idx in np.flatnonzero(~passed | ~has_atr).tolist():
+        _log_screen_skip(
+            symbols[idx],
+            volume_days=int(volume_days[idx]),
+            valid_days=int(valid_days[idx]),
+            avg_dollar_vol=float(avg_dollar_vol[idx]),
+            price=float(price[idx]),
+            atr_pct=float(atr_pct[idx]) if has_atr[idx] else None,
+        )
+    return [(symbols[idx], float(avg_dollar_vol[idx])) for idx in np.flatnonzero(passed).tolist()]
+
+
+def _log_screen_skip(
+    symbol: str,
+    *,
+    volume_days: int,
+    valid_days: int,
+    avg_dollar_vol: float,
+    price: float,
+    atr_pct: Optional[float],
+) -> None:
+    """Log the first screen a symbol failed, or its missing ATR when that is tolerated."""
+
+    min_days = settings.min_volume_history_days
+    if volume_days < min_days:
+        _log_skip(symbol, "skip_volume_history", f"found {volume_days} valid days")
+    elif valid_days < min_days:
+        _log_skip(symbol, "skip_volume_history", f"found {valid_days} valid days")
+    elif avg_dollar_vol < settings.min_dollar_volume:
         _log_skip(
             symbol,
             "skip_volume_history",
             f"avg dollar vol {avg_dollar_vol:.2f} < threshold {settings.min_dollar_volume:.2f}",
         )
-        return None
-
-    price = float(frame["close"].astype(float).iloc[-1])
-    if not (settings.min_price <= price <= settings.max_price):
+    elif not (settings.min_price <= price <= settings.max_price):
         _log_skip(
             symbol,
             "skip_price_range",
             f"price {price:.2f} outside [{settings.min_price:.2f}, {settings.max_price:.2f}]",
         )
-        return None
-
-    atr_pct = None
-    atr_ready = len(frame) >= 15
-    if atr_ready:
-        atr_series = compute_atr(frame, window=14)
-        atr_val = float(atr_series.iloc[-1]) if len(atr_series) else 0.0
-        if atr_val > 0 and price > 0:
-            atr_pct = atr_val / price
-    if atr_pct is None:
+    elif atr_pct is None:
         if settings.allow_partial_atr:
             _log_skip(symbol, "skip_atr", "missing ATR data")
         else:
             _log_skip(symbol, "skip_atr", "insufficient ATR data")
-            return None
     else:
-        if not (0.02 <= atr_pct <= 0.12):
-            _log_skip(symbol, "skip_atr", f"ATR% {atr_pct:.4f} outside range [0.02, 0.12]")
-            return None
+        _log_skip(symbol, "skip_atr", f"ATR% {atr_pct:.4f} outside range [{ATR_PCT_RANGE[0]}, {ATR_PCT_RANGE[1]}]")
+
 
+def _passes_fundamentals(symbol: str) -> bool:
     market_cap = _get_market_cap(symbol)
     if market_cap is None or market_cap <= 0:
         if settings.allow_partial_fundamentals:
             _log_skip(symbol, "skip_missing_fundamentals", "market cap unavailable")
         else:
-            return None
+            return False
     else:
         if not (settings.min_mkt_cap <= market_cap <= settings.max_mkt_cap):
             _log_skip(
@@ -188,16 +413,15 @@ def _passes_filters(symbol: str, frame: pd.DataFrame) -> Optional[dict]:
                 "skip_market_cap",
                 f"market cap {market_cap:.0f} outside [{settings.min_mkt_cap:.0f}, {settings.max_mkt_cap:.0f}]",
             )
-            return None
-
-    return {"symbol": symbol, "liquidity": avg_dollar_vol}
+            return False
+    return True
 
 
 def _build_universe_from_candidates(candidates: list[str], *, label: str | None = None) -> list[str]:
     """Build universe from a provided candidate list."""
 
-    _skip_counts.clear()
-    _skip_sample_counts.clear()
+    _skip_counts.fill(0)
+    _skip_sample_counts.fill(0)
     label_suffix = f" ({label})" if label else ""
     logger.info("Universe: fetched %s candidates%s", len(candidates), label_suffix)
     candidate_limit = max(int(settings.universe_candidate_limit or 0), 0)
@@ -210,36 +434,33 @@ def _build_universe_from_candidates(candidates: list[str], *, label: str | None
             len(candidates),
         )
         candidates = candidates[:candidate_limit]
-    passed: List[dict] = []
 
-    daily_bars_map = price_router.get_daily_bars_batch(candidates, limit=60) if candidates else {}
+    daily_bars_map = _get_price_router().get_daily_bars_batch_columns(candidates, limit=60) if candidates else {}
     top_n = max(int(settings.universe_liquidity_top_n or 0), 0)
     if top_n > 0 and candidates:
-        lookback = max(settings.min_volume_history_days, 3)
-        liquidity_scores: List[tuple[str, float]] = []
-        for symbol in candidates:
-            avg = _avg_dollar_volume(daily_bars_map.get(symbol), lookback)
-            if avg is not None:
-                liquidity_scores.append((symbol, avg))
-        if liquidity_scores:
-            liquidity_scores.sort(key=lambda row: row[1], reverse=True)
-            top_count = min(top_n, len(liquidity_scores))
-            top_symbols = {sym for sym, _ in liquidity_scores[:top_count]}
-            candidates = [sym for sym in candidates if sym in top_symbols]
-            logger.info("Universe: preselected top %s liquidity symbols (%s retained)", top_count, len(candidates))
-        else:
-            logger.info("Universe: liquidity prefilter found no valid bars; skipping prefilter")
-    for symbol in candidates:
+        candidates = _liquidity_prefilter(candidates, daily_bars_map, top_n)
+
+    def _bars_for(symbol: str) -> Optional[Dict[str, np.ndarray]]:
         preloaded = daily_bars_map.get(symbol) if daily_bars_map else None
-        frame = _load_daily_frame(symbol, preloaded=preloaded)
-        if frame is None:
-            continue
-        result = _passes_filters(symbol, frame)
-        if result:
-            passed.append(result)
+        return _load_daily_bars(symbol, preloaded=preloaded)
+
+    # Bar loads are network-bound; map() keeps candidate order so ties in the
+    # liquidity sort resolve as a serial scan would.
+    workers = max(min(int(settings.universe_filter_workers or 1), len(candidates)), 1)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="universe-filter") as executor:
+        loaded = [
+            (symbol, bars) for symbol, bars in zip(candidates, executor.map(_bars_for, candidates)) if bars is not None
+        ]
+    screened = _screen_daily_bars([symbol for symbol, _ in loaded], [bars for _, bars in loaded])
+    # Market-cap providers have strict per-minute free-tier limits, so lookups stay serial.
+    keep = [_passes_fundamentals(symbol) for symbol, _ in screened]
+    _save_market_caps()
 
-    passed = sorted(passed, key=lambda x: x["liquidity"], reverse=True)
-    final_symbols = [entry["symbol"] for entry in passed[: settings.max_universe_size]]
+    passed = [row for row, ok in zip(screened, keep) if ok]
+    liquidity = np.fromiter((liq for _, liq in passed), dtype=np.float64, count=len(passed))
+    # Stable sort on the negated key, so equal liquidity keeps candidate order.
+    order = np.argsort(-liquidity, kind="stable")[: settings.max_universe_size]
+    final_symbols = [passed[idx][0] for idx in order.tolist()]
 
     logger.info(
         "%s passed initial data validation",
@@ -247,15 +468,83 @@ def _build_universe_from_candidates(candidates: list[str], *, label: str | None
     )
     logger.info("%s final universe symbols", len(final_symbols))
 
-    if _skip_counts:
-        summary = ", ".join(f"{reason}={count}" for reason, count in sorted(_skip_counts.items()))
+    if _skip_counts.any():
+        summary = ", ".join(f"{reason}={count}" for reason, count in zip(_SKIP_REASONS, _skip_counts.tolist()) if count)
         logger.info("Universe skip summary: %s", summary)
-        if any(count > SKIP_LOG_SAMPLE_LIMIT for count in _skip_counts.values()):
+        if (_skip_counts > SKIP_LOG_SAMPLE_LIMIT).any():
             logger.info("Skip logs sampled (first %s per reason shown)", SKIP_LOG_SAMPLE_LIMIT)
 
     return final_symbols
 
 
+def _universe_cache_key(candidates: list[str]) -> str:
+    inputs = [
+        candidates,
+        settings.max_universe_size,
+        settings.universe_candidate_limit,
+        settings.universe_liquidity_top_n,
+        settings.min_volume_history_days,
+        settings.min_price,
+        settings.max_price,
+        settings.min_dollar_volume,
+        settings.min_mkt_cap,
+        settings.max_mkt_cap,
+        settings.allow_partial_atr,
+        settings.allow_partial_fundamentals,
+    ]
+    return hashlib.sha1(json.dumps(inputs).encode()).hexdigest()
+
+
+def _read_universe_cache(key: str, trading_date: str) -> Optional[list[str]]:
+    """Cached symbols for ``key`` built on ``trading_date``; None if missing, stale or from another day."""
+
+    try:
+        age = time.time() - UNIVERSE_CACHE_PATH.stat().st_mtime
+        if age >= UNIVERSE_CACHE_TTL_SECONDS:
+            return None
+        payload = json.loads(UNIVERSE_CACHE_PATH.read_bytes())
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.warning("Ignoring unreadable universe cache %s: %s", UNIVERSE_CACHE_PATH, exc)
+        return None
+    if not isinstance(payload, dict) or payload.get("key") != key:
+        return None
+    # Filters run on daily bars, so a universe built on an earlier day is stale
+    # even inside the TTL.
+    if payload.get("date") != trading_date:
+        return None
+    symbols = payload.get("symbols")
+    if not isinstance(symbols, list) or not symbols:
+        return None
+    return [str(sym) for sym in symbols]
+
+
+def _write_universe_cache(key: str, symbols: list[str], trading_date: str) -> None:
+    _write_json_atomic(UNIVERSE_CACHE_PATH, {"key": key, "date": trading_date, "symbols": symbols})
+
+
+def _write_json_atomic(path: Path, payload) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(payload))
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        logger.warning("Unable to write cache %s: %s", path, exc)
+
+
+def invalidate_universe_cache() -> None:
+    """Drop today's universe from memory and disk so the next call rebuilds it."""
+
+    global _universe_today
+    _universe_today = None
+    try:
+        UNIVERSE_CACHE_PATH.unlink()
+    except FileNotFoundError:
+        pass
+
+
 def get_universe() -> list[str]:
     """Build universe via liquidity/volatility/market-cap filters."""
 
@@ -270,10 +559,23 @@ def get_universe() -> list[str]:
         logger.warning("Universe fallback-only enabled; returning %s fallback symbols", len(fallback))
         return fallback
 
+    global _universe_today
+    today = datetime.now(timezone.utc).date().isoformat()
+    if _universe_today is not None and _universe_today[0] == today:
+        return list(_universe_today[1])
+
     candidates = _filter_symbols(_load_candidates())
+    cache_key = _universe_cache_key(candidates)
+    cached = _read_universe_cache(cache_key, today)
+    if cached:
+        logger.info("Universe: using cached universe (%s symbols)", len(cached))
+        _universe_today = (today, cached)
+        return list(cached)
     final_symbols = _build_universe_from_candidates(candidates)
     if final_symbols:
-        return final_symbols
+        _write_universe_cache(cache_key, final_symbols, today)
+        _universe_today = (today, final_symbols)
+        return list(final_symbols)
 
     fallback = _filter_symbols(_csv_universe(settings.universe_fallback_csv))
     if not fallback: